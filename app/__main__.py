@@ -1,4 +1,5 @@
 import os
+import signal
 
 # --- CRITICAL FIX FOR RASPBERRY PI AUDIO HANG ---
 # This must be set BEFORE any kivy modules are imported.
@@ -17,12 +18,22 @@ Config.set('graphics', 'borderless', 1)       # Hides the window bar for a kiosk
 
 from kivy.app import App
 from kivy.lang import Builder
-from kivy.uix.screenmanager import ScreenManager, FadeTransition
+from kivy.uix.screenmanager import FadeTransition
 from kivy.core.window import Window # <-- NEW IMPORT
+from kivy.clock import Clock
 
 from app.ui.screens import (WelcomeScreen, InstructionsScreen, AgilityGameScreen,
-                            QuizGameScreen, ScoreScreen, LeaderboardScreen)
+                            VersusGameScreen, QuizGameScreen, ScoreScreen, LeaderboardScreen)
+from app.ui.screen_registry import LazyScreenManager
 from app.game_manager import GameManager
+from app.perf_monitor import PerfMonitor
+from app.ui.perf_overlay import PerfOverlay
+from app.watchdog import MainLoopWatchdog, notify
+from app.sampling_profiler import SamplingProfiler
+from config import (SCREEN_TRANSITION_DURATION, WATCHDOG_ENABLED, WATCHDOG_STALL_SECONDS,
+                    WATCHDOG_RESTART_SECONDS, WATCHDOG_STALL_LOG, PROFILER_OUTPUT_DIR,
+                    PROFILER_INTERVAL_MS, PROFILER_DURATION_SECONDS,
+                    SCREEN_CACHE_WIDGET_BUDGET, SCREEN_PINNED)
 
 class GameApp(App):
     """The main Kivy application class."""
@@ -30,23 +41,58 @@ class GameApp(App):
         # Load the KV file that defines our screen layouts
         Builder.load_file('app/ui/screens.kv')
 
-        # Create the screen manager
-        sm = ScreenManager()
+        # Create the screen manager; screens are built on first use and cold ones released while idle
+        sm = LazyScreenManager(widget_budget=SCREEN_CACHE_WIDGET_BUDGET, pinned=SCREEN_PINNED)
         # Set the transition to FadeTransition for smooth screen changes
-        sm.transition = FadeTransition(duration=0.4)
-        sm.add_widget(WelcomeScreen(name='welcome'))
-        sm.add_widget(InstructionsScreen(name='instructions'))
-        sm.add_widget(AgilityGameScreen(name='agility_game'))
-        sm.add_widget(QuizGameScreen(name='quiz_game'))
-        sm.add_widget(ScoreScreen(name='score'))
-        sm.add_widget(LeaderboardScreen(name='leaderboard'))
+        sm.transition = FadeTransition(duration=SCREEN_TRANSITION_DURATION)
+        sm.register('welcome', WelcomeScreen)
+        sm.register('instructions', InstructionsScreen)
+        sm.register('agility_game', AgilityGameScreen)
+        sm.register('versus_game', VersusGameScreen)
+        sm.register('quiz_game', QuizGameScreen)
+        sm.register('score', ScoreScreen)
+        sm.register('leaderboard', LeaderboardScreen)
+        sm.current = 'welcome'
         
         Window.bind(on_keyboard=self.on_key_press) # <-- BIND KEYBOARD
         # Instantiate the GameManager and pass it the screen manager
         self.game_manager = GameManager(sm)
+        sm.prepare(SCREEN_PINNED)
+        # Any touch wakes the stand from the idle power mode
+        Window.bind(on_touch_down=self.game_manager.power.on_touch)
+
+        # Performance overlay, hidden (and not collecting anything) until toggled with 'p'
+        monitor = PerfMonitor(sm, gpio_event_count=lambda: self.game_manager.hw_events.enqueued)
+        self.perf_overlay = PerfOverlay(monitor)
+
+        # Main-loop stall watchdog (systemd heartbeat, stack dumps, restart on long stalls)
+        self.watchdog = None
+        if WATCHDOG_ENABLED:
+            self.watchdog = MainLoopWatchdog(stall_threshold=WATCHDOG_STALL_SECONDS,
+                                             restart_after=WATCHDOG_RESTART_SECONDS,
+                                             stall_log=WATCHDOG_STALL_LOG)
+            Clock.schedule_interval(self.watchdog.beat, 0.25)
+
+        # On-demand sampling profiler: `kill -USR1 <pid>` or the 'f' key (idle until triggered)
+        self.profiler = SamplingProfiler(output_dir=PROFILER_OUTPUT_DIR,
+                                         interval=PROFILER_INTERVAL_MS / 1000,
+                                         duration=PROFILER_DURATION_SECONDS)
+        if hasattr(signal, 'SIGUSR1'):
+            signal.signal(signal.SIGUSR1, self.profiler.on_signal)
         
         return sm
 
+    def on_start(self):
+        """Starts the watchdog once the main loop is running (or tells systemd the app is up)."""
+        if self.watchdog:
+            self.watchdog.start()
+            return
+        # Type=notify waits for READY=1 whether or not the watchdog runs
+        notify('READY=1')
+        if os.environ.get('WATCHDOG_USEC'):
+            print("Warning: systemd expects watchdog pings (WatchdogSec) but WATCHDOG_ENABLED is False; "
+                  "the service will be restarted. Remove WatchdogSec from the unit.")
+
     def on_key_press(self, window, key, scancode, codepoint, modifiers):
         """Global keyboard listener."""
         # 27 is the keycode for ESC - useful for exiting fullscreen during dev
@@ -57,10 +103,23 @@ class GameApp(App):
         if codepoint == 'q':
             self.game_manager.skip_agility_game()
             return True
+        # Check if 'p' is pressed - toggles the performance overlay
+        if codepoint == 'p':
+            self.perf_overlay.toggle()
+            return True
+        # Check if 'f' is pressed - records a flamegraph profile under data/profiles/
+        if codepoint == 'f':
+            self.profiler.start()
+            return True
     
     def on_stop(self):
         """This method is called when the application is closed."""
         print("Application is closing. Cleaning up resources.")
+        if self.watchdog:
+            self.watchdog.stop()
+            print(f"Watchdog stats: {self.watchdog.stats()}")
+        else:
+            notify('STOPPING=1')
         self.game_manager.cleanup()
 
 if __name__ == '__main__':
@@ -0,0 +1,84 @@
+from app.agility_sequence import generate_sequence
+
+def lane_button_sets(total, mode='single'):
+    """
+    The buttons of each lane of a round and whether the lanes are circular:
+    one lane over the whole ring, or one per half of the ring in versus mode
+    (each half is a row of buttons, not a ring).
+    """
+    if mode == 'versus':
+        half = total // 2
+        return [range(0, half), range(half, total)], False
+    return [range(total)], True
+
+
+class AgilityLane:
+    """
+    One player's agility round on a set of buttons of the ring.
+
+    A single-player round uses one lane over all buttons; the two-player mode
+    uses one lane per half of the ring. Each lane has its own target sequence,
+    chronometer, debounce state and score, so presses in one half can never
+    affect the other player.
+    """
+    def __init__(self, buttons, count, seed, min_distance, debounce=0.3, circular=True):
+        self.buttons = list(buttons)    # Global button/LED indices owned by this lane
+        self.count = count
+        self.seed = seed
+        sequence = generate_sequence(seed, count, len(self.buttons), min_distance, circular=circular)
+        self.targets = [self.buttons[i] for i in sequence]
+        self.debounce = debounce
+
+        self.step = 0
+        self.remaining = count
+        self.target = -1
+        self.start_time = 0.0
+        self.finish_time = None
+        self.score = 0
+        self.last_press_time = 0.0
+        self.last_pressed = -1
+
+    @property
+    def finished(self):
+        return self.finish_time is not None
+
+    @property
+    def agility_ms(self):
+        """Finishing time in milliseconds, None if unfinished (unrounded: the score is recomputed from it)."""
+        return (self.finish_time - self.start_time) * 1000 if self.finished else None
+
+    def start(self, start_time):
+        """Starts the lane's chronometer and returns the first target."""
+        self.start_time = start_time
+        return self.next_target()
+
+    def next_target(self):
+        self.target = self.targets[self.step]
+        self.step += 1
+        return self.target
+
+    def elapsed(self, now):
+        """Seconds on this lane's chronometer (frozen once the lane is finished)."""
+        end = self.finish_time if self.finished else now
+        return end - self.start_time
+
+    def press(self, index, pressed_at):
+        """
+        Applies a press of one of this lane's buttons.
+        Returns 'debounced', 'wrong', 'hit' or 'finished'.
+        """
+        if self.finished:
+            return 'wrong'
+        # Check if this is a debounce (same button pressed too quickly)
+        if pressed_at - self.last_press_time < self.debounce and self.last_pressed == index:
+            return 'debounced'
+        self.last_press_time = pressed_at
+        self.last_pressed = index
+
+        if index != self.target:
+            return 'wrong'
+        self.remaining -= 1
+        if self.remaining <= 0:
+            self.finish_time = pressed_at
+            return 'finished'
+        return 'hit'
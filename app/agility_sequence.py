@@ -0,0 +1,68 @@
+import random
+
+def ring_distance(a, b, ring_size):
+    """Distance between two positions on the button ring, going the short way round."""
+    d = abs(a - b) % ring_size
+    return min(d, ring_size - d)
+
+
+def generate_sequence(seed, count, ring_size, min_distance=2, start=None, circular=True):
+    """
+    Generates the agility target sequence for a round from a seed.
+
+    Consecutive targets are never the same button and are at least
+    min_distance positions apart on the ring (or along the row of buttons
+    when circular is False, e.g. one half of the ring). The same seed and
+    settings always give the same sequence, so any session can be replayed exactly.
+    """
+    if ring_size < 2:
+        raise ValueError("An agility sequence needs at least 2 buttons.")
+    # Clamp the distance so every button always has at least one valid successor
+    min_distance = max(1, min(min_distance, ring_size // 2))
+    distance = (lambda a, b: ring_distance(a, b, ring_size)) if circular else (lambda a, b: abs(a - b))
+
+    rng = random.Random(seed)
+    sequence = []
+    previous = start
+    for _ in range(count):
+        if previous is None:
+            candidates = range(ring_size)
+        else:
+            candidates = [i for i in range(ring_size) if distance(i, previous) >= min_distance]
+        previous = rng.choice(candidates)
+        sequence.append(previous)
+    return sequence
+
+
+def new_seed():
+    """Returns a fresh random seed to record with the session."""
+    return random.SystemRandom().randrange(2 ** 32)
+
+
+if __name__ == '__main__':
+    # Prints the target sequence of a recorded seed, e.g. to settle a dispute:
+    # python -m app.agility_sequence 123456789 --preset quick
+    # --preset is the score's 'preset' (default: 'default'). A versus score's
+    # seed belongs to its player's lane (Jogador 1 = lane 1):
+    # python -m app.agility_sequence 123456789 --versus 2
+    import sys
+    from app.agility_lane import AgilityLane, lane_button_sets
+    from app.settings import GameSettings, SettingsStore
+    from config import RELAY_PINS, SETTINGS_FILE
+    args = sys.argv[1:]
+    mode, lane_number = 'single', 1
+    if '--versus' in args:
+        mode, lane_number = 'versus', int(args[args.index('--versus') + 1])
+    preset = args[args.index('--preset') + 1] if '--preset' in args else 'default'
+    presets = SettingsStore(SETTINGS_FILE).presets
+    if preset not in presets:
+        sys.exit(f"Unknown preset '{preset}'. Available: {', '.join(sorted(presets))}.")
+    settings = GameSettings.from_dict(presets[preset], preset=preset)
+    seed = int(args[0])
+    # Built the way the game builds the lane, so the printed buttons are the lit ones
+    button_sets, circular = lane_button_sets(len(RELAY_PINS), mode)
+    if not 1 <= lane_number <= len(button_sets):
+        sys.exit(f"Lane {lane_number} does not exist in {mode} mode (1..{len(button_sets)}).")
+    lane = AgilityLane(button_sets[lane_number - 1], settings.agility_buttons_count, seed,
+                       settings.agility_min_ring_distance, circular=circular)
+    print(lane.targets)
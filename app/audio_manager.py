@@ -1,32 +1,127 @@
 # app/audio_manager.py
+import os
+from collections import OrderedDict
 from kivy.core.audio import SoundLoader
+from config import AUDIO_MEMORY_BUDGET_MB, AUDIO_PINNED_SOUNDS, AUDIO_SOUND_PACK
+
+AUDIO_EXTENSIONS = ('.wav', '.ogg', '.mp3')
 
 class AudioManager:
-    """Handles loading and playing all sound effects."""
-    def __init__(self, sounds_path="assets/sounds/"):
-        self.sounds = {}
+    """
+    Handles loading and playing all sound effects.
+    Sounds live in an LRU cache with a memory budget: pinned cues stay loaded,
+    other sounds are loaded on first use and evicted when the budget is exceeded.
+    """
+    def __init__(self, sounds_path="assets/sounds/", memory_budget_mb=AUDIO_MEMORY_BUDGET_MB,
+                 pinned=AUDIO_PINNED_SOUNDS, sound_pack=AUDIO_SOUND_PACK):
         self.sound_files = {
             'start': 'start.wav',
             'correct': 'correct.wav',
             'wrong': 'wrong.wav',
             'submit': 'submit.wav'
         }
-        
-        for key, filename in self.sound_files.items():
-            try:
-                sound = SoundLoader.load(f"{sounds_path}{filename}")
-                if sound:
-                    self.sounds[key] = sound
-                else:
-                    print(f"Warning: Could not load sound '{filename}'.")
-            except Exception as e:
-                print(f"Error loading sound '{filename}': {e}")
-        
-        print(f"AudioManager initialized. Loaded {len(self.sounds)} sounds.")
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.pinned = set(pinned)
+
+        # key -> file path. Any extra sound in the folder is playable by its file name,
+        # and the active sound pack (assets/sounds/packs/<name>/) overrides matching keys.
+        self.sound_paths = {key: os.path.join(sounds_path, filename) for key, filename in self.sound_files.items()}
+        self._register_folder(sounds_path)
+        if sound_pack:
+            pack_path = os.path.join(sounds_path, "packs", sound_pack)
+            if not self._register_folder(pack_path):
+                print(f"Warning: Sound pack '{sound_pack}' not found in {pack_path}.")
+
+        # LRU cache: key -> (sound, estimated resident bytes), least recently used first
+        self.sounds = OrderedDict()
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.unavailable = set()   # Keys that are missing or failed to load (warned about once)
+
+        for key in self.pinned:
+            self._load(key)
+
+        print(f"AudioManager initialized. {len(self.sound_paths)} sounds available, "
+              f"{len(self.sounds)} pinned ({self.resident_bytes / 1024:.0f} KB).")
+
+    def _register_folder(self, folder):
+        """Registers every sound file in a folder under its file name. Returns False if missing."""
+        if not os.path.isdir(folder):
+            return False
+        for filename in sorted(os.listdir(folder)):
+            key, extension = os.path.splitext(filename)
+            if extension.lower() in AUDIO_EXTENSIONS:
+                self.sound_paths[key] = os.path.join(folder, filename)
+        return True
+
+    def _estimate_bytes(self, path, sound):
+        """Estimates the decoded size: SDL mixer keeps sounds as 16-bit stereo PCM at 44.1 kHz."""
+        file_size = os.path.getsize(path)
+        length = getattr(sound, 'length', 0) or 0
+        return max(file_size, int(length * 44100 * 2 * 2))
+
+    def _load(self, sound_key):
+        path = self.sound_paths.get(sound_key)
+        if path is None:
+            print(f"Warning: Sound key '{sound_key}' not found.")
+            self.unavailable.add(sound_key)
+            return None
+        try:
+            sound = SoundLoader.load(path)
+        except Exception as e:
+            print(f"Error loading sound '{path}': {e}")
+            sound = None
+        if not sound:
+            if sound_key not in self.unavailable:
+                print(f"Warning: Could not load sound '{path}'.")
+            self.unavailable.add(sound_key)
+            return None
+
+        size = self._estimate_bytes(path, sound)
+        self.sounds[sound_key] = (sound, size)
+        self.resident_bytes += size
+        self._evict(keep=sound_key)
+        return sound
+
+    def _evict(self, keep=None):
+        """Unloads least recently used, unpinned and idle sounds until within budget."""
+        if self.resident_bytes <= self.memory_budget:
+            return
+        for key in list(self.sounds):
+            if self.resident_bytes <= self.memory_budget:
+                break
+            sound, size = self.sounds[key]
+            if key == keep or key in self.pinned or sound.state == 'play':
+                continue
+            sound.unload()
+            del self.sounds[key]
+            self.resident_bytes -= size
+            self.evictions += 1
 
     def play(self, sound_key):
-        """Plays a pre-loaded sound by its key."""
-        if sound_key in self.sounds:
-            self.sounds[sound_key].play()
+        """Plays a sound by its key, loading it on demand if it is not cached."""
+        cached = self.sounds.get(sound_key)
+        if cached:
+            self.hits += 1
+            self.sounds.move_to_end(sound_key)
+            sound = cached[0]
+        elif sound_key in self.unavailable:
+            return  # Not retried on every play; already warned about
         else:
-            print(f"Warning: Sound key '{sound_key}' not found.")
\ No newline at end of file
+            self.misses += 1
+            sound = self._load(sound_key)
+        if sound:
+            sound.play()
+
+    def stats(self):
+        """Returns cache statistics."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'resident_sounds': len(self.sounds),
+            'resident_kb': round(self.resident_bytes / 1024),
+            'budget_kb': round(self.memory_budget / 1024),
+        }
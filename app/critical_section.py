@@ -0,0 +1,142 @@
+import gc
+import os
+import time
+from kivy.clock import Clock
+
+class CriticalSection:
+    """
+    Latency-critical mode for the agility round.
+
+    On enter it runs a warm-up collection, freezes the surviving objects and
+    disables the cyclic GC, and optionally raises the process priority. Work
+    passed to defer() and lines passed to log() are held until exit, so no
+    persistence or console flush lands between two button presses.
+    Frame intervals and GC pauses are measured inside every section (also when
+    the mode is disabled) so rounds with and without it can be compared.
+    """
+    def __init__(self, enabled=True, nice_boost=0):
+        self.enabled = enabled
+        self.nice_boost = nice_boost
+        self.active = False
+        self._deferred = []
+        self._log_lines = []
+        self._frame_event = None
+        self._original_nice = None
+        self._gc_start = None
+
+        # Statistics of the last section
+        self.frame_times = []
+        self.gc_pauses = []
+        self.started_at = 0.0
+        self.duration = 0.0
+
+    def enter(self):
+        if self.active:
+            return
+        self.active = True
+        self.frame_times = []
+        self.gc_pauses = []
+        gc.callbacks.append(self._on_gc)
+
+        if self.enabled:
+            gc.collect()   # Warm-up collection before the clock starts
+            gc.freeze()    # Existing objects are no longer scanned
+            gc.disable()
+            self._raise_priority()
+
+        self.started_at = time.perf_counter()
+        self._frame_event = Clock.schedule_interval(self._on_frame, 0)
+
+    def exit(self):
+        """Leaves the critical section, restores GC and priority and runs deferred work."""
+        if not self.active:
+            return
+        self.active = False
+        self.duration = time.perf_counter() - self.started_at
+        if self._frame_event:
+            self._frame_event.cancel()
+            self._frame_event = None
+
+        if self.enabled:
+            gc.enable()
+            gc.unfreeze()
+            self._restore_priority()
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+
+        log_lines, self._log_lines = self._log_lines, []
+        for line in log_lines:
+            print(line)
+        print(f"Critical section stats: {self.stats()}")
+
+        deferred, self._deferred = self._deferred, []
+        for func, args in deferred:
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"Error running deferred work {func.__name__}: {e}")
+
+    def defer(self, func, *args):
+        """Runs func now, or at the end of the critical section if one is active."""
+        if self.active:
+            self._deferred.append((func, args))
+        else:
+            func(*args)
+
+    def log(self, message):
+        """Prints now, or buffers the line until the critical section ends."""
+        if self.active:
+            self._log_lines.append(message)
+        else:
+            print(message)
+
+    def _raise_priority(self):
+        if not self.nice_boost:
+            return
+        try:
+            self._original_nice = os.getpriority(os.PRIO_PROCESS, 0)
+            os.setpriority(os.PRIO_PROCESS, 0, self._original_nice - self.nice_boost)
+        except (OSError, AttributeError) as e:
+            print(f"Warning: Could not raise process priority: {e}")
+            self._original_nice = None
+
+    def _restore_priority(self):
+        if self._original_nice is None:
+            return
+        try:
+            os.setpriority(os.PRIO_PROCESS, 0, self._original_nice)
+        except OSError as e:
+            print(f"Warning: Could not restore process priority: {e}")
+        self._original_nice = None
+
+    def _on_frame(self, dt):
+        self.frame_times.append(dt)
+
+    def _on_gc(self, phase, info):
+        if phase == 'start':
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            self.gc_pauses.append(time.perf_counter() - self._gc_start)
+            self._gc_start = None
+
+    def stats(self):
+        """Returns frame-jitter and GC pause statistics of the last section."""
+        frames = sorted(self.frame_times)
+        if frames:
+            mean = sum(frames) / len(frames)
+            jitter = (sum((f - mean) ** 2 for f in frames) / len(frames)) ** 0.5
+            p99 = frames[min(len(frames) - 1, int(len(frames) * 0.99))]
+            worst = frames[-1]
+        else:
+            mean = jitter = p99 = worst = 0.0
+        return {
+            'enabled': self.enabled,
+            'duration_s': round(self.duration, 3),
+            'frames': len(frames),
+            'frame_mean_ms': round(mean * 1000, 2),
+            'frame_jitter_ms': round(jitter * 1000, 2),
+            'frame_p99_ms': round(p99 * 1000, 2),
+            'frame_max_ms': round(worst * 1000, 2),
+            'gc_pauses': len(self.gc_pauses),
+            'gc_pause_max_ms': round(max(self.gc_pauses) * 1000, 3) if self.gc_pauses else 0.0,
+        }
@@ -1,10 +1,21 @@
 import json
 import os
-from config import LEADERBOARD_FILE, QUESTIONS_FILE
+import datetime
+from app.leaderboard_archive import LeaderboardArchive
+from config import (LEADERBOARD_FILE, QUESTIONS_FILE, LEADERBOARD_ARCHIVE_DIR,
+                    LEADERBOARD_COMPRESS_AFTER_DAYS, LEADERBOARD_TOP_N)
 
 class DataManager:
     """Handles all data persistence for the application (reading/writing JSON)."""
 
+    def __init__(self):
+        self.leaderboard_file = LEADERBOARD_FILE
+        self.archive = LeaderboardArchive(
+            LEADERBOARD_ARCHIVE_DIR,
+            compress_after_days=LEADERBOARD_COMPRESS_AFTER_DAYS,
+            top_n=LEADERBOARD_TOP_N
+        )
+
     def load_questions(self):
         """Loads the quiz questions from the JSON file."""
         try:
@@ -16,13 +27,64 @@ class DataManager:
             return []
 
     def load_leaderboard(self):
-        """Loads the leaderboard data from the JSON file."""
+        """
+        Loads today's leaderboard data from the JSON file.
+        Scores from earlier days still in the file are moved to the archive first.
+        """
+        scores = self._read_leaderboard_file()
+        todays_scores = self.archive_finished_days(scores)
+        if len(todays_scores) != len(scores):
+            self.save_leaderboard(todays_scores)
+        return todays_scores
+
+    def archive_finished_days(self, scores, today=None):
+        """
+        Moves the scores of every day before today into the archive.
+        Returns the scores that stay hot (today's and undated ones).
+        """
+        today = (today or datetime.date.today()).isoformat()
+        finished_days = {}
+        hot_scores = []
+        for score in scores:
+            score_date = score.get('timestamp', '').split('T')[0]
+            if score_date and score_date < today:
+                finished_days.setdefault(score_date, []).append(score)
+            else:
+                hot_scores.append(score)
+
+        # The manifest is saved once for all the days
+        days = sorted(finished_days)
+        attempted = []
+        def pending_days():
+            for day in days:
+                attempted.append(day)
+                yield day, finished_days[day]
+        try:
+            self.archive.archive_days(pending_days())
+        except Exception as e:
+            print(f"Error archiving leaderboard day {attempted[-1]}: {e}")
+            for day in days[len(attempted) - 1:]:
+                hot_scores.extend(finished_days[day])  # Keep them (and later days) hot and retry next time
+        if finished_days:
+            self.archive.compress_old_segments()
+        return hot_scores
+
+    def load_archived_totals(self):
+        """Returns the rolled-up aggregates (per game mode) of the archived leaderboard days."""
+        return self.archive.totals()
+
+    def iter_archived_scores(self, start_day=None, end_day=None):
+        """Streams archived scores day by day without loading the whole history."""
+        return self.archive.iter_entries(start_day, end_day)
+
+    def _read_leaderboard_file(self):
+        """Reads the hot leaderboard JSON file."""
         try:
-            with open(LEADERBOARD_FILE, 'r', encoding='utf-8') as f:
+            with open(self.leaderboard_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 return data.get("scores", [])
         except (FileNotFoundError, json.JSONDecodeError):
-            print(f"Warning: Could not load or parse {LEADERBOARD_FILE}. Returning empty list.")
+            print(f"Warning: Could not load or parse {self.leaderboard_file}. Returning empty list.")
             return []
 
     def save_leaderboard(self, scores_data):
@@ -30,13 +92,13 @@ class DataManager:
         Saves the leaderboard data to its JSON file using an atomic write operation
         to prevent data corruption.
         """
-        temp_file = LEADERBOARD_FILE + ".tmp"
+        temp_file = self.leaderboard_file + ".tmp"
         try:
             with open(temp_file, 'w', encoding='utf-8') as f:
                 json.dump({"scores": scores_data}, f, indent=4)
             
             # Atomically rename the temp file to the final file
-            os.replace(temp_file, LEADERBOARD_FILE)
+            os.replace(temp_file, self.leaderboard_file)
         except Exception as e:
             print(f"Error saving leaderboard: {e}")
             # If a temp file was created but rename failed, clean it up
@@ -0,0 +1,88 @@
+import time
+from collections import deque
+
+class HardwareEventQueue:
+    """
+    Single-producer/single-consumer queue that carries button presses from the
+    gpiozero callback thread to the Kivy main loop.
+
+    deque.append() and deque.popleft() are atomic in CPython, so neither side
+    takes a lock. Each counter is written by one side only: the producer owns
+    'enqueued' and 'dropped', the main loop owns everything else.
+    """
+    def __init__(self, max_size=64, drain_budget=0.004, latency_budget=0.050):
+        self._events = deque()
+        self.max_size = max_size
+        self.drain_budget = drain_budget       # Max seconds of handler work per frame
+        self.latency_budget = latency_budget   # Press-to-handling time considered "late"
+
+        # Producer-side counters (GPIO thread)
+        self.enqueued = 0
+        self.dropped = 0
+
+        # Consumer-side counters (Kivy main thread)
+        self.processed = 0
+        self.max_depth = 0
+        self.late_events = 0
+        self.budget_overruns = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def put(self, index):
+        """Called from the GPIO thread. Never blocks; drops the press if the queue is full."""
+        if len(self._events) >= self.max_size:
+            self.dropped += 1
+            return False
+        self._events.append((time.perf_counter(), index))
+        self.enqueued += 1
+        return True
+
+    def depth(self):
+        return len(self._events)
+
+    def drain(self, handler):
+        """
+        Called once per frame on the main thread. Hands every queued press to
+        handler(index, pressed_at) until the queue is empty or the per-frame
+        budget is used up; anything left over is handled on the next frame.
+        """
+        events = self._events
+        depth = len(events)
+        if not depth:
+            return 0
+        self.max_depth = max(self.max_depth, depth)
+
+        start = time.perf_counter()
+        handled = 0
+        while events:
+            pressed_at, index = events.popleft()
+            latency = time.perf_counter() - pressed_at
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            if latency > self.latency_budget:
+                self.late_events += 1
+
+            handler(index, pressed_at)
+            handled += 1
+
+            if events and time.perf_counter() - start > self.drain_budget:
+                self.budget_overruns += 1
+                break
+
+        self.processed += handled
+        return handled
+
+    def stats(self):
+        """Returns a snapshot of the queue statistics."""
+        processed = self.processed
+        return {
+            'depth': len(self._events),
+            'max_depth': self.max_depth,
+            'enqueued': self.enqueued,
+            'processed': processed,
+            'dropped': self.dropped,
+            'late_events': self.late_events,
+            'budget_overruns': self.budget_overruns,
+            'mean_latency_ms': (self.total_latency / processed * 1000) if processed else 0.0,
+            'max_latency_ms': self.max_latency * 1000,
+        }
@@ -1,3 +1,4 @@
+import math
 import random
 import time
 from kivy.clock import Clock
@@ -6,32 +7,110 @@ from kivy.uix.screenmanager import ScreenManager
 from app.hardware_io import HardwareController
 from app.data_manager import DataManager
 from app.audio_manager import AudioManager
-from config import (AGILITY_BUTTONS_COUNT, AGILITY_MAX_SCORE, AGILITY_SCORE_PENALTY_PER_MS,
-                   QUIZ_ROUNDS_COUNT, QUIZ_POINTS_PER_CORRECT)
+from app.event_queue import HardwareEventQueue
+from app.leaderboard_index import LeaderboardIndex, score_mode
+from app.critical_section import CriticalSection
+from app.agility_lane import AgilityLane, lane_button_sets
+from app.session_analyzer import SessionRecorder
+from app.session_tape import SessionTape
+from app.power_mode import IdlePowerMode, IdleLedAnimation
+from app.name_trie import NameTrie
+from app.ui.screen_warmer import ScreenWarmer
+from app.ui.text_cache import text_cache
+from app.settings import SettingsStore
+from config import (HW_EVENT_QUEUE_SIZE, HW_EVENT_DRAIN_BUDGET_MS, HW_EVENT_LATENCY_BUDGET_MS, EVENT_NAME,
+                   LEADERBOARD_TOP_N, LEADERBOARD_VIEWS, LEADERBOARD_VIEW_ROTATION_SECONDS, LEADERBOARD_BEST_PER_PLAYER,
+                   CRITICAL_SECTION_ENABLED, CRITICAL_SECTION_NICE_BOOST,
+                   SESSION_LOG_FILE, SCREEN_WARMING_ENABLED, SETTINGS_FILE, SETTINGS_POLL_SECONDS,
+                   SESSION_TAPE_ENABLED, SESSION_TAPE_DIR, SESSION_TAPE_MAX_FILES, SESSION_TAPE_MAX_AGE_DAYS,
+                   POWER_IDLE_ENABLED, POWER_IDLE_FPS, POWER_IDLE_AFTER_WAKE_SECONDS,
+                   SCREEN_RELEASE_IDLE_SECONDS)
 import datetime
 
 class GameManager:
     def __init__(self, screen_manager: ScreenManager):
         self.sm = screen_manager
+        # Time source and RNG of the game; a tape replay swaps in a virtual clock and recorded seeds
+        self.now = time.perf_counter
+        self.rng = random.Random()
         self.hw = HardwareController()
         self.dm = DataManager()
         self.am = AudioManager()
-        self.hw.set_button_callback(self.on_button_press)
+
+        # Button presses arrive on the GPIO thread. They are only queued there
+        # and handled on the Kivy main thread, so game state stays single-threaded.
+        self.hw_events = HardwareEventQueue(
+            max_size=HW_EVENT_QUEUE_SIZE,
+            drain_budget=HW_EVENT_DRAIN_BUDGET_MS / 1000,
+            latency_budget=HW_EVENT_LATENCY_BUDGET_MS / 1000
+        )
+        self.hw.set_button_callback(self.on_gpio_press)
+        self.hw_event_drain = Clock.schedule_interval(self.process_hardware_events, 0)  # Every frame
+        self.hw.start()
+
+        # Latency-critical mode used during agility rounds (GC off, deferred background work)
+        self.critical = CriticalSection(enabled=CRITICAL_SECTION_ENABLED, nice_boost=CRITICAL_SECTION_NICE_BOOST)
+        # Every external input is recorded so a session can be replayed (helper/replay_session.py).
+        # Tape lines are written through the critical section, never between two agility presses.
+        self.tape = SessionTape(SESSION_TAPE_DIR, enabled=SESSION_TAPE_ENABLED, defer=self.critical.defer,
+                                max_files=SESSION_TAPE_MAX_FILES, max_age_days=SESSION_TAPE_MAX_AGE_DAYS)
+
+        # Game settings: a read-only snapshot that only changes between sessions.
+        # The settings file is polled for preset changes (never during an agility round).
+        self.settings_store = SettingsStore(SETTINGS_FILE)
+        self.settings = self.settings_store.current
+        self.settings_poll_event = Clock.schedule_interval(self.poll_settings_file, SETTINGS_POLL_SECONDS)
+
+        # Low-power idle mode on the welcome screen (lower frame rate, settings poll paused)
+        self.power = IdlePowerMode(idle_fps=POWER_IDLE_FPS, idle_after=POWER_IDLE_AFTER_WAKE_SECONDS,
+                                   can_idle=lambda: self.is_idle_mode, enabled=POWER_IDLE_ENABLED)
+        self.power.pause_while_idle(lambda: self.settings_poll_event, on_resume=self.poll_settings_file)
+
+        # Per-session phase timings for the throughput analyzer
+        self.sessions = SessionRecorder(SESSION_LOG_FILE, self.settings.session_timings())
+
+        # Screens are pre-rendered while idle after startup and prepared before each transition
+        self.screen_warmer = ScreenWarmer(self.sm, enabled=SCREEN_WARMING_ENABLED)
+        self.screen_warmer.warm_all()
 
         self.all_questions = self.dm.load_questions()
         self.questions_for_round = []
 
+        # Leaderboard index: scores partitioned by day with precomputed top lists per view
+        self.leaderboard = LeaderboardIndex(top_n=LEADERBOARD_TOP_N, event_name=EVENT_NAME,
+                                            best_per_player=LEADERBOARD_BEST_PER_PLAYER)
+        self.leaderboard.load(self.dm.load_leaderboard(), self.dm.load_archived_totals())
+        self.leaderboard.roll_over()
+        self.leaderboard_player_entries = ()  # The scores just submitted (highlighted)
+        self.leaderboard_mode = 'single'      # Game mode whose lists are shown
+        self.leaderboard_view_index = 0
+        self.leaderboard_rotation_event = None
+        self.leaderboard_rollover_event = None
+        self.schedule_leaderboard_rollover()
+
+        # Today's player names for one-tap completion on the score screen
+        today = datetime.date.today().isoformat()
+        self.name_trie = NameTrie(entry.get('name', '') for entry in self.leaderboard.entries_for_day(today))
+
+        # Screens are built on first use and released after a while in idle mode
+        self.sm.bind(on_screen_built=self.on_screen_built, on_screen_released=self.on_screen_released)
+        self.screen_release_event = None
+
         self.score = 0
-        # CONFIGURABLE Agility State - now uses config values
-        self.agility_buttons_to_press = AGILITY_BUTTONS_COUNT
-        self.agility_buttons_remaining = self.agility_buttons_to_press
+        self.quiz_correct = 0   # Correct quiz answers this session (stored with the score)
+        # Game mode: 'single' (agility + quiz) or 'versus' (two players on the split ring)
+        self.mode = 'single'
+        # CONFIGURABLE Agility State - uses the settings snapshot
         self.agility_start_time = 0
         self.chronometer_event = None
         self.agility_in_progress = False
-        self.target_led_index = -1
+        # One lane per player, each with its own precomputed target sequence
+        self.lanes = []
+        self.lane_by_button = {}
+        self.versus_timeout_event = None
+        self.pending_versus_names = []  # Names entered so far in versus mode
         
-        # CONFIGURABLE Quiz State - now uses config values
-        self.total_quiz_rounds = QUIZ_ROUNDS_COUNT
+        # CONFIGURABLE Quiz State - uses the settings snapshot
         self.current_quiz_round = 0
         self.current_question_data = None
         self.quiz_in_progress = False
@@ -39,28 +118,43 @@ class GameManager:
         self.countdown_active = False  # Guard flag to prevent multiple countdowns
         
         # Virtual keyboard state management
-        self.virtual_keyboard_text = ""  # Internal text state
         self.last_key_press_time = 0
         self.key_press_cooldown = 0.15  # 150ms between key presses
         
-        # Physical button debounce for agility game
-        self.last_button_press_time = 0
+        # Physical button debounce for agility game (tracked per lane)
         self.button_press_cooldown = 0.3  # 300ms between physical button presses
-        self.last_button_pressed = -1  # Track which button was last pressed
         
         # Idle animation and timeout system
-        self.idle_animation_event = None
+        self.idle_leds = IdleLedAnimation(self.hw, interval=0.5, off_count=3)  # 500ms per LED
         self.idle_timeout_event = None
-        self.idle_led_index = 0  # Current LED in idle animation
         self.is_idle_mode = False
 
         print("GameManager initialized with HardwareController and DataManager.")
 
+    def on_screen_built(self, sm, screen):
+        """Connects a newly built screen to the game (and queues it for warming)."""
+        if screen.name == 'score':
+            name_entry = screen.ids.name_entry
+            name_entry.trie = self.name_trie
+            # Personal best of the typed name, looked up in the player index on every key
+            name_entry.bind(text=self.show_personal_best)
+        self.screen_warmer.warm_all()
+
+    def on_screen_released(self, sm, screen_name):
+        self.screen_warmer.forget(screen_name)
+
+    def release_cold_screens(self, dt):
+        """Releases the screens not needed on the welcome screen (the stand has been idle a while)."""
+        self.screen_release_event = None
+        released = self.sm.release_cold()
+        if released:
+            print(f"Idle: released screens {released} ({self.sm.stats()['widgets']} widgets kept)")
+
     def start_game(self):
         """Resets game state and starts the countdown for the agility game."""
         self.score = 0
+        self.quiz_correct = 0
         self.current_quiz_round = 0
-        self.agility_buttons_remaining = AGILITY_BUTTONS_COUNT # Reset using config value
         self.go_to_screen('instructions') # START AT INSTRUCTIONS
         # self.start_countdown() # This is now called from proceed_from_instructions
 
@@ -71,9 +165,10 @@ class GameManager:
             return  # Prevent multiple countdowns from starting
         self.countdown_active = True
         print("DEBUG: Starting countdown sequence...")
+        self.sessions.mark('countdown')
         
-        self.go_to_screen('agility_game')
-        screen = self.sm.get_screen('agility_game')
+        screen_name = 'versus_game' if self.mode == 'versus' else 'agility_game'
+        screen = self.sm.get_screen(screen_name)
         
         # CRITICAL FIX: Reset overlay state completely before starting
         overlay = screen.ids.countdown_overlay
@@ -89,6 +184,9 @@ class GameManager:
         
         # Ensure the main game UI is hidden and ready
         screen.ids.game_layout.opacity = 0
+
+        # Generate the whole target sequences now, while the countdown runs
+        self.prepare_agility_lanes()
         
         # --- CORRECTED LOGIC WITH PROPER STATE MANAGEMENT ---
         def update_text(number_or_go, dt):
@@ -120,99 +218,177 @@ class GameManager:
         # --- SEQUENCE OF EVENTS ---
         # 1. Show '3' and play the single countdown sound immediately.
         overlay.text = '3'
+        self.go_to_screen(screen_name)
         self.am.play('start')
         print("DEBUG: Countdown '3' displayed, sound played")
 
-        # 2. Schedule the visual updates for '2' and '1'.
-        Clock.schedule_once(lambda dt: update_text('2', dt), 1.0)
-        Clock.schedule_once(lambda dt: update_text('1', dt), 2.0)
+        # 2. Schedule the visual updates for '2' and '1', paced like the default
+        #    2.3 s countdown (one second per number) scaled to the configured duration.
+        duration = self.settings.countdown_duration
+        pace = duration / 2.3
+        Clock.schedule_once(lambda dt: update_text('2', dt), 1.0 * pace)
+        Clock.schedule_once(lambda dt: update_text('1', dt), 2.0 * pace)
         
         # 3. Schedule the final transition to start the game.
-        Clock.schedule_once(finish_countdown, 2.3) # A brief moment after "1"
+        Clock.schedule_once(finish_countdown, duration) # A brief moment after "1"
+
+    def prepare_agility_lanes(self, seeds=None):
+        """
+        Creates the round's lanes: one over the whole ring, or one per half of
+        the ring in versus mode. Each lane gets its own seed (new or given).
+        """
+        button_sets, circular = lane_button_sets(len(self.hw.leds), self.mode)
+        seeds = seeds or [self.rng.randrange(2 ** 32) for _ in button_sets]
+        self.lanes = [
+            AgilityLane(buttons, self.settings.agility_buttons_count, seed, self.settings.agility_min_ring_distance,
+                        debounce=self.button_press_cooldown, circular=circular)
+            for buttons, seed in zip(button_sets, seeds)
+        ]
+        self.lane_by_button = {index: lane for lane in self.lanes for index in lane.buttons}
+        for number, lane in enumerate(self.lanes, start=1):
+            print(f"DEBUG: Agility lane {number} prepared (seed {lane.seed}): {lane.targets}")
 
     def start_agility_game(self, dt=None): # This method is now simpler
         """This method now ONLY starts the actual agility gameplay."""
-        self.agility_buttons_remaining = AGILITY_BUTTONS_COUNT # Use config value
+        if not self.lanes:
+            self.prepare_agility_lanes()
         
         # Update UI for the start of the round
-        screen = self.sm.get_screen('agility_game')
-        screen.ids.remaining_label.text = f'Restantes: {self.agility_buttons_remaining}'
-        screen.ids.chronometer_label.text = '00:00'
-
-        self.agility_start_time = time.perf_counter()
+        for number, lane in enumerate(self.lanes, start=1):
+            chronometer_label, remaining_label = self._lane_labels(number)
+            remaining_label.text = f'Restantes: {lane.remaining}'
+            chronometer_label.text = '00:00'
+
+        # Enter the critical section (warm-up GC runs here, before the clock starts)
+        self.critical.enter()
+
+        self.agility_start_time = self.now()
+        self.sessions.mark('agility', self.agility_start_time)
+        self.tape.sync('agility', self.agility_start_time)
+        for lane in self.lanes:
+            self.hw.turn_on_led(lane.start(self.agility_start_time))
+        self.agility_in_progress = True
         self.chronometer_event = Clock.schedule_interval(self.update_chronometer, 1/60)
-        self.trigger_next_led()
+        if self.mode == 'versus':
+            self.versus_timeout_event = Clock.schedule_once(self.on_versus_timeout, self.settings.versus_time_limit)
         
-        print(f"DEBUG: Agility game started with {AGILITY_BUTTONS_COUNT} buttons to press")
+        self.critical.log(f"DEBUG: Agility game started ({self.mode}) with {self.settings.agility_buttons_count} buttons to press")
 
-    def update_chronometer(self, dt):
-        """Updates the chronometer label on screen."""
-        elapsed_time = time.perf_counter() - self.agility_start_time
+    def _lane_labels(self, lane_number):
+        """Returns the (chronometer, remaining) labels of a lane on the current game screen."""
+        if self.mode == 'versus':
+            ids = self.sm.get_screen('versus_game').ids
+            return ids[f'chronometer_label_{lane_number}'], ids[f'remaining_label_{lane_number}']
+        ids = self.sm.get_screen('agility_game').ids
+        return ids.chronometer_label, ids.remaining_label
+
+    @staticmethod
+    def _format_chronometer(elapsed_time):
         seconds = int(elapsed_time)
         milliseconds = int((elapsed_time * 100) % 100)
-        self.sm.get_screen('agility_game').ids.chronometer_label.text = f'{seconds:02}:{milliseconds:02}'
+        return f'{seconds:02}:{milliseconds:02}'
 
-    def trigger_next_led(self):
-        """Turns on a new random LED."""
-        self.target_led_index = random.randint(0, len(self.hw.leds) - 1)
-        self.hw.turn_on_led(self.target_led_index)
-        self.agility_in_progress = True
+    def agility_score(self, final_time):
+        """CONFIGURABLE Scoring: max score minus penalty per millisecond."""
+        return max(0, self.settings.agility_max_score - int(final_time * 1000 * self.settings.agility_score_penalty_per_ms))
 
-    def on_button_press(self, pressed_index):
-        """Callback for the new chronometer-based game with debounce protection."""
+    def update_chronometer(self, dt):
+        """Updates the chronometer label of every lane still playing."""
+        now = self.now()
+        for number, lane in enumerate(self.lanes, start=1):
+            if not lane.finished:
+                self._lane_labels(number)[0].text = self._format_chronometer(lane.elapsed(now))
+
+    def on_gpio_press(self, index):
+        """Runs on the GPIO thread: queues the press and wakes the main loop from idle mode."""
+        self.hw_events.put(index)
+        self.power.wake_from_thread()
+
+    def process_hardware_events(self, dt):
+        """Drains the queued button presses once per frame on the main thread."""
+        self.hw_events.drain(self.on_button_press)
+
+    def on_button_press(self, pressed_index, pressed_at=None):
+        """
+        Handles a button press for the chronometer-based game with debounce protection.
+        Runs on the main thread; pressed_at is the time the GPIO thread saw the press.
+        The press only affects the lane that owns the button.
+        """
+        current_time = pressed_at if pressed_at is not None else self.now()
+        self.tape.record_button(pressed_index, current_time)
         if not self.agility_in_progress:
             return
+        lane = self.lane_by_button.get(pressed_index)
+        if lane is None:
+            return
         
-        # Debounce protection for physical buttons
-        current_time = time.perf_counter()
-        time_since_last_press = current_time - self.last_button_press_time
+        result = lane.press(pressed_index, current_time)
         
-        # Check if this is a debounce (same button pressed too quickly)
-        if (time_since_last_press < self.button_press_cooldown and
-            self.last_button_pressed == pressed_index):
-            print(f"DEBUG: Button {pressed_index} debounced (too fast: {time_since_last_press:.3f}s)")
+        if result == 'debounced':
+            self.critical.log(f"DEBUG: Button {pressed_index} debounced (too fast)")
+            return
+        if result == 'wrong':
+            # If wrong button is pressed, we do nothing. The player must find the right one.
+            self.critical.log(f"DEBUG: Wrong button {pressed_index} pressed, target was {lane.target}")
             return
         
-        # Update debounce tracking
-        self.last_button_press_time = current_time
-        self.last_button_pressed = pressed_index
-        
-        print(f"DEBUG: Button {pressed_index} pressed (target: {self.target_led_index})")
+        self.critical.log(f"DEBUG: Button {pressed_index} pressed (target hit)")
+        self.hw.turn_off_led(pressed_index)
+        self.am.play('correct')
         
-        if pressed_index == self.target_led_index:
-            self.agility_in_progress = False # Prevent multiple presses
-            self.hw.turn_off_led(self.target_led_index)
-            self.am.play('correct')
-            
-            self.agility_buttons_remaining -= 1
-            # Schedule UI update on main thread
-            Clock.schedule_once(
-                lambda dt: setattr(
-                    self.sm.get_screen('agility_game').ids.remaining_label,
-                    'text',
-                    f'Restantes: {self.agility_buttons_remaining}'
-                ), 0
-            )
-
-            if self.agility_buttons_remaining <= 0:
-                # GAME OVER
-                self.chronometer_event.cancel()
-                final_time = time.perf_counter() - self.agility_start_time
-                # CONFIGURABLE Scoring: max score minus penalty per millisecond
-                self.score = max(0, AGILITY_MAX_SCORE - int(final_time * 1000 * AGILITY_SCORE_PENALTY_PER_MS))
-                print(f"Agility finished in {final_time:.2f}s. Score: {self.score} (Max: {AGILITY_MAX_SCORE}, Penalty: {AGILITY_SCORE_PENALTY_PER_MS}/ms)")
-                # Schedule UI transition on main thread
-                Clock.schedule_once(lambda dt: self.end_agility_section(), 0)
-            else:
-                # Trigger the next button
-                self.trigger_next_led()
+        lane_number = self.lanes.index(lane) + 1
+        chronometer_label, remaining_label = self._lane_labels(lane_number)
+        remaining_label.text = f'Restantes: {lane.remaining}'
+
+        if result == 'hit':
+            # Trigger the next button of this lane
+            self.hw.turn_on_led(lane.next_target())
+            return
+
+        # This lane is finished. Timed from the moment the press happened, not when it was handled
+        final_time = lane.elapsed(current_time)
+        lane.score = self.agility_score(final_time)
+        chronometer_label.text = self._format_chronometer(final_time)
+        self.critical.log(f"Agility lane {lane_number} finished in {final_time:.2f}s. Score: {lane.score} (Max: {self.settings.agility_max_score}, Penalty: {self.settings.agility_score_penalty_per_ms}/ms)")
+
+        if all(other.finished for other in self.lanes):
+            self.finish_agility_round()
+
+    def finish_agility_round(self):
+        """Stops the round once every lane is done (or skipped/timed out)."""
+        self.agility_in_progress = False
+        if self.chronometer_event:
+            self.chronometer_event.cancel()
+            self.chronometer_event = None
+        if self.versus_timeout_event:
+            self.versus_timeout_event.cancel()
+            self.versus_timeout_event = None
+
+        if self.mode == 'versus':
+            self.end_versus_game()
         else:
-            print(f"DEBUG: Wrong button {pressed_index} pressed, target was {self.target_led_index}")
-        # If wrong button is pressed, we do nothing. The player must find the right one.
+            self.score = self.lanes[0].score if self.lanes else 0
+            self.end_agility_section()
+
+    def on_versus_timeout(self, dt):
+        """Ends a versus round that took too long. Unfinished players score 0."""
+        self.versus_timeout_event = None
+        print(f"DEBUG: Versus round reached the {self.settings.versus_time_limit}s limit")
+        self.finish_agility_round()
+
+    def end_versus_game(self):
+        """Called after a versus round. Both players then enter their names on the score screen."""
+        self.critical.exit()
+        print(f"Versus round finished. Scores: {[lane.score for lane in self.lanes]}")
+        self.hw.turn_off_all_leds()
+        self.pending_versus_names = []
+        self.end_game()
 
     def end_agility_section(self):
         """Called after agility. Prepares and shows instructions for the QUIZ game."""
+        self.critical.exit()
         print("Agility section finished. Showing Quiz instructions.")
+        self.sessions.mark('quiz_instructions')
         self.hw.turn_off_all_leds()
         self.instruction_state = 'quiz'
         screen = self.sm.get_screen('instructions')
@@ -231,8 +407,9 @@ class GameManager:
     
     def start_quiz_section(self):
         """Prepares the quiz data and transitions to the quiz screen."""
-        if len(self.all_questions) < QUIZ_ROUNDS_COUNT:
-             print(f"Error: Not enough questions. Found {len(self.all_questions)}, need {QUIZ_ROUNDS_COUNT}.")
+        rounds = self.settings.quiz_rounds_count
+        if len(self.all_questions) < rounds:
+             print(f"Error: Not enough questions. Found {len(self.all_questions)}, need {rounds}.")
              self.end_game()
              return
 
@@ -240,10 +417,12 @@ class GameManager:
         self.current_quiz_round = 0
         self.quiz_in_progress = False
         
-        self.go_to_screen('quiz_game')
-        self.questions_for_round = random.sample(self.all_questions, QUIZ_ROUNDS_COUNT)
+        self.sessions.mark('quiz_intro')
+        self.questions_for_round = self.rng.sample(self.all_questions, rounds)
+        # Question images load in the background, well before their rounds
+        self.sm.get_screen('quiz_game').prefetch_media(self.questions_for_round)
         
-        print(f"DEBUG: Quiz section started with {QUIZ_ROUNDS_COUNT} questions")
+        print(f"DEBUG: Quiz section started with {rounds} questions")
         
         # Reset all quiz buttons to default state before starting
         screen = self.sm.get_screen('quiz_game')
@@ -253,6 +432,9 @@ class GameManager:
             button.button_bg_color = (216/255, 206/255, 205/255, 1)  # Default light gray
             button.text = ""
         
+        self.go_to_screen('quiz_game')
+        if self.questions_for_round:
+            screen.prefetch_question(self.questions_for_round[0])
         Clock.schedule_once(self.start_quiz_round, 0.5)
 
     def start_quiz_round(self, dt=None):
@@ -262,6 +444,8 @@ class GameManager:
             return
 
         self.current_question_data = self.questions_for_round[self.current_quiz_round]
+        self.sessions.mark('quiz_question')
+        self.tape.sync('quiz_question')
         screen = self.sm.get_screen('quiz_game')
         screen.display_question(self.current_question_data)
         self.quiz_in_progress = True
@@ -274,6 +458,7 @@ class GameManager:
         """
         NOVA SOLUÇÃO: Recebe o ID do botão diretamente, contornando bug do Kivy.
         """
+        self.tape.record('check_answer_by_id', button_id)
         if not self.quiz_in_progress: return
         self.quiz_in_progress = False
         
@@ -301,9 +486,10 @@ class GameManager:
 
         # --- Core Logic with CONFIGURABLE scoring ---
         if is_correct:
-            self.score += QUIZ_POINTS_PER_CORRECT
+            self.score += self.settings.quiz_points_per_correct
+            self.quiz_correct += 1
             self.am.play('correct')
-            print(f"Quiz answer: Correct! (+{QUIZ_POINTS_PER_CORRECT} points)")
+            print(f"Quiz answer: Correct! (+{self.settings.quiz_points_per_correct} points)")
         else:
             self.am.play('wrong')
             print("Quiz answer: Incorrect!")
@@ -315,8 +501,13 @@ class GameManager:
             selected_widget=selected_button
         )
 
-        # Schedule the next round, allowing the player 2.5 seconds to absorb the feedback.
-        Clock.schedule_once(self.start_quiz_round, 2.5)
+        # Render the next question's textures while the feedback is shown
+        if self.current_quiz_round < len(self.questions_for_round):
+            screen.prefetch_question(self.questions_for_round[self.current_quiz_round])
+
+        # Schedule the next round, allowing the player time to absorb the feedback.
+        self.sessions.mark('quiz_feedback')
+        Clock.schedule_once(self.start_quiz_round, self.settings.quiz_feedback_duration)
 
     # Manter método antigo para compatibilidade (caso seja chamado de outro lugar)
     def check_answer(self, selected_button_widget):
@@ -337,160 +528,299 @@ class GameManager:
     def end_game(self):
         """Called after the last quiz round. Transitions to the Score screen."""
         print(f"Game over! Final Score: {self.score}")
-        self.go_to_screen('score')
+        self.sessions.mark('name_entry')
+        self.tape.sync('name_entry')
         screen = self.sm.get_screen('score')
-        screen.ids.final_score_label.text = f'Sua Pontuação Final: {self.score}'
-        screen.ids.name_input.text = '' # Clear input field
-        screen.ids.name_input.focus = True # Focus the TextInput for the VKeyboard
-        
-        # Initialize virtual keyboard state
-        self.virtual_keyboard_text = ""
-        print("DEBUG: Virtual keyboard state initialized")
-        
-        # Bind text validation to limit input length
-        screen.ids.name_input.bind(text=self._validate_name_input)
+        if self.mode == 'versus':
+            screen.ids.final_score_label.text = '   |   '.join(
+                f'Jogador {number}: {lane.score}' for number, lane in enumerate(self.lanes, start=1))
+            screen.ids.name_prompt_label.text = 'Nome do Jogador 1:'
+        else:
+            screen.ids.final_score_label.text = f'Sua Pontuação Final: {self.score}'
+            screen.ids.name_prompt_label.text = 'Digite seu nome:'
+        screen.ids.rank_label.text = self.rank_text()
+        # Fresh name entry (its text handler is bound once, by the component itself)
+        screen.ids.name_entry.clear()
+        self.go_to_screen('score')
 
-    def _validate_name_input(self, instance, text):
-        """Validates and limits the name input to reasonable length."""
-        # Limit to 30 characters maximum (updated from 8)
-        max_length = 30
-        if len(text) > max_length:
-            instance.text = text[:max_length]
-        
-        # Convert to uppercase automatically
-        if text != text.upper():
-            instance.text = text.upper()
+    @staticmethod
+    def _format_count(number):
+        return f'{number:,}'.replace(',', '.')
+
+    def rank_text(self):
+        """Where the round's score(s) rank among today's and all scores of the same mode, from the rank index."""
+        if self.mode == 'versus':
+            # Both scores are saved together, so each one is also ranked against the other
+            scores = [lane.score for lane in self.lanes]
+            ranks = [self.leaderboard.rank(score, mode='versus')[0] + sum(other > score for other in scores)
+                     for score in scores]
+            total = self.leaderboard.rank(0, mode='versus')[1] + len(scores) - 1
+            players = ', '.join(f'Jogador {number} #{self._format_count(rank)}'
+                                for number, rank in enumerate(ranks, start=1))
+            return f'Hoje: {players} de {self._format_count(total)}'
+        rank, total = self.leaderboard.rank(self.score)
+        text = f'Você é o #{self._format_count(rank)} de {self._format_count(total)} hoje'
+        if total >= 20:
+            text += f' (top {max(1, math.ceil(100 * rank / total))}%)'
+        overall_rank, overall_total = self.leaderboard.rank(self.score, 'all')
+        return text + f'\n#{self._format_count(overall_rank)} de {self._format_count(overall_total)} no geral'
+
+    def show_personal_best(self, name_entry, name):
+        """Tells a returning player on the score screen whether this is a new personal best."""
+        label = self.sm.get_screen('score').ids.personal_best_label
+        record = self.leaderboard.player(name, self.mode) if name.strip() else None
+        if record is None:
+            label.text = ''
+            return
+        if self.mode == 'versus':
+            lane_index = min(len(self.pending_versus_names), len(self.lanes) - 1)
+            score = self.lanes[lane_index].score if self.lanes else 0
+        else:
+            score = self.score
+        if score > record.best:
+            label.text = f'Novo recorde pessoal! (anterior: {record.best})'
+        else:
+            label.text = f'Seu recorde: {record.best} em {record.plays} jogo(s)'
 
     def virtual_key_press(self, key_value):
         """Handles virtual keyboard with state comparison to prevent duplicates."""
+        self.tape.record('virtual_key_press', key_value)
         if self.sm.current != 'score':
             return
         
         # Time-based debounce protection
-        current_time = time.perf_counter()
+        current_time = self.now()
         if current_time - self.last_key_press_time < self.key_press_cooldown:
             print(f"DEBUG: Key '{key_value}' ignored due to debounce")
             return
         
         self.last_key_press_time = current_time
         
-        # Calculate what the new text should be
-        current_internal_text = self.virtual_keyboard_text
-        expected_new_text = current_internal_text
-        
-        print(f"DEBUG: Key '{key_value}' - Current internal: '{current_internal_text}'")
-        
-        if key_value == 'BACKSPACE':
-            if len(current_internal_text) > 0:
-                expected_new_text = current_internal_text[:-1]
-            print(f"DEBUG: BACKSPACE - Expected: '{expected_new_text}'")
-        elif key_value == 'SPACE':
-            expected_new_text = current_internal_text + ' '
-            print(f"DEBUG: SPACE - Expected: '{expected_new_text}'")
-        elif key_value == 'ENTER':
-            print(f"DEBUG: ENTER - Submitting: '{current_internal_text}'")
-            self.submit_score(current_internal_text)
+        name_entry = self.sm.get_screen('score').ids.name_entry
+        print(f"DEBUG: Key '{key_value}' - Current text: '{name_entry.text}'")
+        
+        if key_value == 'ENTER':
+            print(f"DEBUG: ENTER - Submitting: '{name_entry.text}'")
+            self._submit_score(name_entry.text)
+            return
+        if not name_entry.press_key(key_value):
+            print(f"DEBUG: Key '{key_value}' ignored - text too long ({name_entry.max_length} char limit)")
             return
-        else:
-            # Regular character - limit to reasonable length
-            if len(current_internal_text) < 30:  # Increased character limit to 30
-                expected_new_text = current_internal_text + key_value
-                print(f"DEBUG: Character '{key_value}' - Expected: '{expected_new_text}'")
-            else:
-                print(f"DEBUG: Character '{key_value}' ignored - text too long (30 char limit)")
-                return
-        
-        # Update internal state and UI
-        self.virtual_keyboard_text = expected_new_text
-        
-        # Update the UI
-        screen = self.sm.get_screen('score')
-        name_input = screen.ids.name_input
-        name_input.text = expected_new_text
         
-        print(f"DEBUG: Text updated to: '{expected_new_text}'")
+        print(f"DEBUG: Text updated to: '{name_entry.text}'")
+
+    def apply_name_suggestion(self, name):
+        """Fills the name entry with a suggested name (suggestion button of the score screen)."""
+        self.tape.record('apply_name_suggestion', name)
+        self.sm.get_screen('score').ids.name_entry.apply_suggestion(name)
 
     def submit_score(self, player_name):
-        """Saves the score and transitions to the leaderboard."""
+        """Submit button of the score screen."""
+        self.tape.record('submit_score', player_name)
+        self._submit_score(player_name)
+
+    def _submit_score(self, player_name):
+        """
+        Saves the score and transitions to the leaderboard.
+        In versus mode the first name is kept and both scores are saved together after the second.
+        """
         player_name = player_name.strip().upper()
         if not player_name:
             print("Player name is empty, not saving score.")
             # Optional: Add on-screen feedback here
             return
 
+        if self.mode == 'versus' and len(self.pending_versus_names) < len(self.lanes) - 1:
+            self.pending_versus_names.append(player_name)
+            screen = self.sm.get_screen('score')
+            screen.ids.name_entry.clear()
+            screen.ids.name_prompt_label.text = f'Nome do Jogador {len(self.pending_versus_names) + 1}:'
+            print(f"DEBUG: Versus player {len(self.pending_versus_names)} name: {player_name}")
+            return
+
         # Add timestamp and save
-        score_entry = {
-            'name': player_name,
-            'score': self.score,
-            'timestamp': datetime.datetime.now().isoformat()
-        }
-        
-        # Load existing scores, add new one, and save
-        all_scores = self.dm.load_leaderboard()
-        all_scores.append(score_entry)
+        timestamp = datetime.datetime.now().isoformat()
+        if self.mode == 'versus':
+            names = self.pending_versus_names + [player_name]
+            results = [(name, lane.score, lane.seed, lane.agility_ms, 0) for name, lane in zip(names, self.lanes)]
+        else:
+            seed = self.lanes[0].seed if self.lanes else None
+            agility_ms = self.lanes[0].agility_ms if self.lanes else None
+            results = [(player_name, self.score, seed, agility_ms, self.quiz_correct)]
+
+        config_version = self.settings.scoring_version()
+        score_entries = [{
+            'name': name,
+            'score': score,
+            'timestamp': timestamp,
+            'event': EVENT_NAME,
+            'mode': self.mode,
+            'preset': self.settings.preset,
+            'agility_seed': seed,  # Replays the exact target sequence
+            # Raw components, so the score can be recomputed under other scoring settings (app/rescoring.py)
+            'agility_ms': agility_ms,
+            'quiz_correct': quiz_correct,
+            'config_version': config_version
+        } for name, score, seed, agility_ms, quiz_correct in results]
+        
+        # Add to the in-memory index and persist today's scores (one write for all players)
+        for score_entry in score_entries:
+            self.leaderboard.add(score_entry)
+            self.name_trie.add(score_entry['name'])
         self.am.play('submit')
-        self.dm.save_leaderboard(all_scores)
+        self.dm.save_leaderboard(self.leaderboard.all_entries())
+        self.tape.scores_saved(score_entries)
         
-        # Go to leaderboard
+        # Build the leaderboard before switching, so the grid is not rebuilt during the fade
+        self.show_leaderboard(score_entries)
         self.go_to_screen('leaderboard')
-        self.show_leaderboard(player_name)
-
-    def show_leaderboard(self, player_name=None):
-        """Loads and displays the leaderboard filtered by current date."""
-        all_scores = self.dm.load_leaderboard()
-        
-        # Get current date in YYYY-MM-DD format
-        current_date = datetime.datetime.now().strftime('%Y-%m-%d')
-        print(f"DEBUG: Filtering leaderboard for date: {current_date}")
-        
-        # Filter scores for today only
-        today_scores = []
-        for score in all_scores:
-            timestamp_str = score.get('timestamp', '')
-            if timestamp_str:
-                # Extract date from timestamp (YYYY-MM-DDTHH:MM:SS format)
-                score_date = timestamp_str.split('T')[0]  # Get YYYY-MM-DD part
-                if score_date == current_date:
-                    today_scores.append(score)
-                    print(f"DEBUG: Including score: {score['name']} - {score['score']} from {score_date}")
-                else:
-                    print(f"DEBUG: Excluding score from {score_date}")
-        
-        print(f"DEBUG: Total scores today: {len(today_scores)} out of {len(all_scores)}")
+
+    def show_leaderboard(self, player_entries=()):
+        """Displays today's leaderboard, then rotates through the other configured views."""
+        self.leaderboard_player_entries = tuple(player_entries)
+        # Versus and single-player scores are ranked apart: show the lists of the mode just played
+        self.leaderboard_mode = score_mode(player_entries[0]) if player_entries else 'single'
+        self.leaderboard_view_index = 0
+        self.sessions.mark('leaderboard')
         
         screen = self.sm.get_screen('leaderboard')
         
-        # Show a congratulations message if the player is in today's top 15
-        top_scores_today = sorted(today_scores, key=lambda x: x['score'], reverse=True)[:15]
-        is_top_player = any(entry.get('name') == player_name for entry in top_scores_today)
+        # Show a congratulations message if the player(s) made today's top list
+        # The submitted scores themselves must be listed, not an older score under the same name
+        top_today = self.leaderboard.top('day', mode=self.leaderboard_mode)
+        top_players = [entry['name'] for entry in self.leaderboard_player_entries
+                       if any(entry is listed for listed in top_today)]
         
-        if is_top_player:
-            screen.ids.congrats_label.text = f"Parabéns {player_name}! Você está no Top de Hoje!"
+        if top_players:
+            names = ' e '.join(top_players)
+            screen.ids.congrats_label.text = f"Parabéns {names}! " + (
+                "Você está no Top de Hoje!" if len(top_players) == 1 else "Vocês estão no Top de Hoje!")
         else:
             screen.ids.congrats_label.text = ""
         
-        # Pass filtered scores to the leaderboard display
-        screen.update_leaderboard(today_scores, player_name)
+        self.display_leaderboard_view()
+        
+        if self.leaderboard_rotation_event:
+            self.leaderboard_rotation_event.cancel()
+        if len(LEADERBOARD_VIEWS) > 1:
+            self.leaderboard_rotation_event = Clock.schedule_interval(
+                self.rotate_leaderboard_view, LEADERBOARD_VIEW_ROTATION_SECONDS)
         
         # Start 1-minute timeout for automatic return to welcome
         self.start_leaderboard_timeout()
 
+    def display_leaderboard_view(self):
+        """Shows the current leaderboard view, served from the precomputed index."""
+        view = LEADERBOARD_VIEWS[self.leaderboard_view_index]
+        top_scores = self.leaderboard.top(view, mode=self.leaderboard_mode)
+        print(f"DEBUG: Showing leaderboard view '{view}' ({self.leaderboard_mode}) with {len(top_scores)} scores")
+        screen = self.sm.get_screen('leaderboard')
+        screen.update_leaderboard(top_scores, self.leaderboard_player_entries, view=view, mode=self.leaderboard_mode)
+
+    def rotate_leaderboard_view(self, dt):
+        """Moves to the next non-empty leaderboard view."""
+        if self.sm.current != 'leaderboard':
+            self.leaderboard_rotation_event = None
+            return False
+        for _ in range(len(LEADERBOARD_VIEWS)):
+            self.leaderboard_view_index = (self.leaderboard_view_index + 1) % len(LEADERBOARD_VIEWS)
+            if self.leaderboard.top(LEADERBOARD_VIEWS[self.leaderboard_view_index], mode=self.leaderboard_mode):
+                break
+        self.display_leaderboard_view()
+
+    def schedule_leaderboard_rollover(self):
+        """Schedules a leaderboard refresh on the next hour boundary (this includes midnight)."""
+        now = datetime.datetime.now()
+        next_hour = now.replace(minute=0, second=0, microsecond=0) + datetime.timedelta(hours=1)
+        delay = (next_hour - now).total_seconds() + 0.5
+        self.leaderboard_rollover_event = Clock.schedule_once(self.on_leaderboard_rollover, delay)
+
+    def on_leaderboard_rollover(self, dt):
+        """
+        Drops expired hour/day/week views and refreshes the screen if it is showing.
+        At midnight the finished day is moved to the leaderboard archive.
+        """
+        if self.leaderboard.roll_over():
+            print("DEBUG: Leaderboard day rollover")
+            self.name_trie.clear()  # Suggestions only offer names entered today
+            # Never write the archive in the middle of an agility round
+            self.critical.defer(self.archive_finished_leaderboard_days)
+        if self.sm.current == 'leaderboard':
+            self.display_leaderboard_view()
+        self.schedule_leaderboard_rollover()
+
+    def archive_finished_leaderboard_days(self):
+        """Moves yesterday's scores from the hot leaderboard into the archive."""
+        finished_scores = self.leaderboard.pop_finished_days()
+        if finished_scores:
+            kept_scores = self.dm.archive_finished_days(finished_scores)
+            self.leaderboard.restore_entries(kept_scores)
+            self.dm.save_leaderboard(self.leaderboard.all_entries())
+
     def cleanup(self):
         """Should be called when the app closes."""
+        self.critical.exit()
+        self.idle_leds.stop()
+        if self.hw_event_drain:
+            self.hw_event_drain.cancel()
+            self.hw_event_drain = None
+        if self.leaderboard_rollover_event:
+            self.leaderboard_rollover_event.cancel()
+            self.leaderboard_rollover_event = None
+        if self.screen_release_event:
+            self.screen_release_event.cancel()
+            self.screen_release_event = None
+        if self.settings_poll_event:
+            self.settings_poll_event.cancel()
+            self.settings_poll_event = None
+        self.power.stop()
+        print(f"GPIO event queue stats: {self.hw_events.stats()}")
+        print(f"Power mode stats: {self.power.stats()}")
+        print(f"Audio cache stats: {self.am.stats()}")
+        print(f"Screen transition stats: {self.screen_warmer.stats()}")
+        print(f"Text texture cache stats: {text_cache.stats()}")
+        if self.sm.is_built('quiz_game'):
+            quiz_media = self.sm.get_screen('quiz_game').media
+            print(f"Quiz media cache stats: {quiz_media.stats()}")
+            quiz_media.stop()
+        print(f"Screen cache stats: {self.sm.stats()}")
+        self.sessions.end()
+        self.tape.close({'screen': self.sm.current, 'score': self.score})
         self.hw.cleanup()
 
+    # --- Settings ---
+    def poll_settings_file(self, dt):
+        """Re-reads the settings file if it changed (deferred while an agility round runs)."""
+        self.critical.defer(self.settings_store.reload_if_changed)
+
+    def begin_session(self):
+        """Takes the settings snapshot for a new session; a preset switch happens only here."""
+        self.settings = self.settings_store.begin_session()
+        self.rng.seed(self.tape.session_seed(self.settings))
+        self.sm.transition.duration = self.settings.screen_transition_duration
+        self.sessions.settings = self.settings.session_timings()
+
     # --- Screen Transition Methods ---
     def go_to_screen(self, screen_name):
-        """A generic method to switch screens."""
+        """A generic method to switch screens. Content should be set on the screen before calling it."""
         print(f"Transitioning to {screen_name} screen.")
+        self.sessions.count_transition()
+        self.screen_warmer.before_transition(screen_name)
         self.sm.current = screen_name
 
     def show_instructions(self):
         """Prepares and shows the instructions for the AGILITY game."""
+        self.tape.record('show_instructions')
         # Stop idle animation when user starts playing
         self.stop_idle_animation()
         
+        self.mode = 'single'
         self.instruction_state = 'agility'
+        self.begin_session()
+        self.sessions.mark('instructions')
+        self.sessions.set_mode('single', 1)
+        # The session's screens are built while the instructions are read
+        self.sm.prepare(['agility_game', 'quiz_game', 'score', 'leaderboard'])
         screen = self.sm.get_screen('instructions')
         screen.update_content(
             title='Como Jogar: Agilidade',
@@ -499,17 +829,35 @@ class GameManager:
         )
         self.go_to_screen('instructions')
 
+    def show_versus_instructions(self):
+        """Prepares and shows the instructions for the two-player agility mode."""
+        self.tape.record('show_versus_instructions')
+        self.stop_idle_animation()
+        
+        self.mode = 'versus'
+        self.instruction_state = 'agility'
+        self.begin_session()
+        self.sessions.mark('instructions')
+        self.sessions.set_mode('versus', 2)
+        self.sm.prepare(['versus_game', 'score', 'leaderboard'])
+        screen = self.sm.get_screen('instructions')
+        screen.update_content(
+            title='Como Jogar: 2 Jogadores',
+            body='\n\n• Jogador 1 usa a metade esquerda do painel e Jogador 2 a metade direita.\n\n• Cada jogador tem suas próprias luzes: pressione o botão aceso da sua metade o mais rápido possível.\n\n• Vence quem fizer mais pontos!\n',
+            button_text='COMEÇAR DUELO'
+        )
+        self.go_to_screen('instructions')
+
     def skip_agility_game(self):
-        """Ends the agility game prematurely, called by 'q' key."""
-        if self.sm.current == 'agility_game':
+        """Ends the agility game prematurely, called by 'q' key. Unfinished players score 0."""
+        self.tape.record('skip_agility_game')
+        if self.sm.current in ('agility_game', 'versus_game'):
             print("Agility game skipped by user.")
-            if self.chronometer_event:
-                self.chronometer_event.cancel()
-            self.score = 0 # Set agility score to 0
-            self.end_agility_section()
+            self.finish_agility_round()
     
     def proceed_from_instructions(self):
         """Called by the instruction screen button. Acts based on the current state."""
+        self.tape.record('proceed_from_instructions')
         # Cancel any active timeout since user interacted
         if self.idle_timeout_event:
             self.idle_timeout_event.cancel()
@@ -527,10 +875,20 @@ class GameManager:
         
         # Stop any idle animation and timeout
         self.stop_idle_animation()
+
+        # Leave the agility critical section if a round was interrupted
+        self.critical.exit()
+        # Close the visitor session (appended to the session log)
+        self.sessions.end()
         
         self.score = 0
+        self.quiz_correct = 0
         self.current_agility_round = 0
         self.current_quiz_round = 0
+        self.mode = 'single'
+        self.lanes = []
+        self.lane_by_button = {}
+        self.pending_versus_names = []
         
         # Reset countdown flag to allow countdown on next play
         self.countdown_active = False
@@ -546,24 +904,34 @@ class GameManager:
         if self.chronometer_event:
             self.chronometer_event.cancel()
             self.chronometer_event = None
+        if self.versus_timeout_event:
+            self.versus_timeout_event.cancel()
+            self.versus_timeout_event = None
+
+        # Stop rotating leaderboard views
+        if self.leaderboard_rotation_event:
+            self.leaderboard_rotation_event.cancel()
+            self.leaderboard_rotation_event = None
             
-        # CRITICAL FIX: Reset countdown overlay state for next game
-        try:
-            agility_screen = self.sm.get_screen('agility_game')
-            overlay = agility_screen.ids.countdown_overlay
-            
-            # Cancel any pending animations
-            Animation.cancel_all(overlay)
-            Animation.cancel_all(agility_screen.ids.game_layout)
-            
-            # Reset overlay to initial state
-            overlay.opacity = 1.0
-            overlay.text = ''
-            agility_screen.ids.game_layout.opacity = 0
-            
-            print("DEBUG: Countdown overlay state reset for next game")
-        except Exception as e:
-            print(f"DEBUG: Error resetting overlay state: {e}")
+        # CRITICAL FIX: Reset countdown overlay state for next game (both game screens)
+        for screen_name in ('agility_game', 'versus_game'):
+            if not self.sm.is_built(screen_name):
+                continue
+            try:
+                game_screen = self.sm.get_screen(screen_name)
+                overlay = game_screen.ids.countdown_overlay
+                
+                # Cancel any pending animations
+                Animation.cancel_all(overlay)
+                Animation.cancel_all(game_screen.ids.game_layout)
+                
+                # Reset overlay to initial state
+                overlay.opacity = 1.0
+                overlay.text = ''
+                game_screen.ids.game_layout.opacity = 0
+            except Exception as e:
+                print(f"DEBUG: Error resetting overlay state of {screen_name}: {e}")
+        print("DEBUG: Countdown overlay state reset for next game")
             
         # Turn off all LEDs
         self.hw.turn_off_all_leds()
@@ -572,55 +940,23 @@ class GameManager:
         print("DEBUG: Welcome screen transition complete")
     
     def start_idle_animation(self):
-        """Starts the idle LED animation (clockwise sequence 1-12)."""
-        if self.idle_animation_event:
-            self.idle_animation_event.cancel()
-        
+        """Starts the idle LED animation (clockwise loading circle) and the low-power idle mode."""
+        self.idle_leds.stop()
         self.is_idle_mode = True
-        self.idle_led_index = 0
         print("DEBUG: Starting idle animation")
-        
-        # Start the animation loop
-        self.idle_animation_event = Clock.schedule_interval(self.update_idle_animation, 0.5)  # 500ms per LED
-    
-    def update_idle_animation(self, dt):
-        """Updates the loading circle animation - 9 LEDs on, 3 LEDs off moving clockwise."""
-        if not self.is_idle_mode:
-            return False  # Stop the animation
-        
-        # Turn off all LEDs first
-        self.hw.turn_off_all_leds()
-        
-        # Create loading circle pattern: 3 consecutive LEDs OFF, others ON
-        total_leds = len(self.hw.leds)  # Should be 12
-        off_leds_count = 3  # 3 LEDs will be off
-        
-        # Calculate which 3 LEDs should be OFF (moving window)
-        for i in range(total_leds):
-            # Check if this LED should be in the OFF window
-            led_is_in_off_window = False
-            for j in range(off_leds_count):
-                off_position = (self.idle_led_index + j) % total_leds
-                if i == off_position:
-                    led_is_in_off_window = True
-                    break
-            
-            # Turn on LED if it's NOT in the off window
-            if not led_is_in_off_window:
-                self.hw.turn_on_led(i)
-        
-        # Move the off window one position clockwise for next frame
-        self.idle_led_index = (self.idle_led_index + 1) % total_leds
-        
-        print(f"DEBUG: Loading animation - OFF window at positions: {[(self.idle_led_index + i - 1) % total_leds for i in range(off_leds_count)]}")
-        
-        return True  # Continue animation
+        self.idle_leds.start()
+        self.power.enter()
+        if self.screen_release_event:
+            self.screen_release_event.cancel()
+        self.screen_release_event = Clock.schedule_once(self.release_cold_screens, SCREEN_RELEASE_IDLE_SECONDS)
     
     def stop_idle_animation(self):
-        """Stops the idle LED animation and turns off all LEDs."""
-        if self.idle_animation_event:
-            self.idle_animation_event.cancel()
-            self.idle_animation_event = None
+        """Stops the idle LED animation, wakes from idle mode and turns off all LEDs."""
+        self.idle_leds.stop()
+        self.power.wake()
+        if self.screen_release_event:
+            self.screen_release_event.cancel()
+            self.screen_release_event = None
         
         if self.idle_timeout_event:
             self.idle_timeout_event.cancel()
@@ -631,17 +967,17 @@ class GameManager:
         print("DEBUG: Idle animation stopped")
     
     def start_leaderboard_timeout(self):
-        """Starts 1-minute timeout for automatic return to welcome screen."""
+        """Starts the leaderboard timeout for automatic return to welcome screen."""
         if self.idle_timeout_event:
             self.idle_timeout_event.cancel()
         
-        print("DEBUG: Starting 1-minute leaderboard timeout")
-        # Schedule timeout for 1 minute (60 seconds)
-        self.idle_timeout_event = Clock.schedule_once(self.on_leaderboard_timeout, 15.0)
+        print(f"DEBUG: Starting {self.settings.leaderboard_timeout}s leaderboard timeout")
+        self.idle_timeout_event = Clock.schedule_once(self.on_leaderboard_timeout, self.settings.leaderboard_timeout)
     
     def on_leaderboard_timeout(self, dt):
         """Called when leaderboard timeout expires - returns to welcome with idle animation."""
         print("DEBUG: Leaderboard timeout expired, returning to welcome")
+        self.sessions.timeout()
         self.return_to_welcome()
         # Start idle animation after returning to welcome
         Clock.schedule_once(lambda dt: self.start_idle_animation(), 0.5)
@@ -657,6 +993,7 @@ class GameManager:
     def on_quiz_instructions_timeout(self, dt):
         """Called when quiz instructions timeout expires."""
         print("DEBUG: Quiz instructions timeout expired, returning to welcome")
+        self.sessions.timeout()
         self.return_to_welcome()
         Clock.schedule_once(lambda dt: self.start_idle_animation(), 0.5)
     
@@ -671,6 +1008,7 @@ class GameManager:
     def on_quiz_question_timeout(self, dt):
         """Called when quiz question timeout expires."""
         print("DEBUG: Quiz question timeout expired, returning to welcome")
+        self.sessions.timeout()
         self.quiz_in_progress = False  # Stop quiz
         self.return_to_welcome()
         Clock.schedule_once(lambda dt: self.start_idle_animation(), 0.5)
\ No newline at end of file
@@ -0,0 +1,219 @@
+import json
+import os
+import threading
+import time
+import datetime
+
+class GpiozeroBackend:
+    """Real GPIO backend. Creates gpiozero devices on the Raspberry Pi pins."""
+    name = 'gpiozero'
+
+    def create_button(self, pin):
+        from gpiozero import Button
+        return Button(pin)
+
+    def create_led(self, pin):
+        from gpiozero import LED
+        # active_high=False handles the active-low relays:
+        # .on() sends a LOW signal, .off() sends a HIGH signal.
+        return LED(pin, active_high=False)
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+class MockButton:
+    """In-memory stand-in for gpiozero.Button."""
+    def __init__(self, pin):
+        self.pin = pin
+        self.when_pressed = None
+        self.is_pressed = False
+        self.closed = False
+
+    def press(self):
+        """Simulates a physical press. Calls when_pressed like gpiozero does."""
+        if self.closed:
+            return
+        self.is_pressed = True
+        callback = self.when_pressed
+        if callback:
+            callback(self)
+
+    def release(self):
+        self.is_pressed = False
+
+    def close(self):
+        self.when_pressed = None
+        self.closed = True
+
+
+class MockLED:
+    """In-memory stand-in for gpiozero.LED."""
+    def __init__(self, pin):
+        self.pin = pin
+        self.is_lit = False
+        self.closed = False
+
+    def on(self):
+        self.is_lit = True
+
+    def off(self):
+        self.is_lit = False
+
+    def close(self):
+        self.is_lit = False
+        self.closed = True
+
+
+class MockBackend:
+    """In-memory backend for running the game without GPIO hardware."""
+    name = 'mock'
+
+    def __init__(self):
+        self.buttons = []
+        self.leds = []
+
+    def create_button(self, pin):
+        button = MockButton(pin)
+        self.buttons.append(button)
+        return button
+
+    def create_led(self, pin):
+        led = MockLED(pin)
+        self.leds.append(led)
+        return led
+
+    def press(self, index):
+        """Presses and releases the button at the given index."""
+        if 0 <= index < len(self.buttons):
+            self.buttons[index].press()
+            self.buttons[index].release()
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+class TraceReplayBackend(MockBackend):
+    """
+    Plays a recorded button trace into the game from a background thread,
+    the same way gpiozero delivers presses on the Pi.
+    A speed of 2.0 replays the trace twice as fast as it was recorded.
+    """
+    name = 'replay'
+
+    def __init__(self, trace_path, speed=1.0, loop=False):
+        super().__init__()
+        if speed <= 0:
+            raise ValueError("Replay speed must be greater than zero.")
+        self.events = load_trace(trace_path)
+        self.speed = speed
+        self.loop = loop
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        # Replay statistics: how late each press was delivered vs. the trace
+        self.presses_delivered = 0
+        self.max_lateness = 0.0
+        self.total_lateness = 0.0
+
+        print(f"TraceReplayBackend loaded {len(self.events)} presses from {trace_path} (speed x{speed}).")
+
+    def start(self):
+        if self._thread is not None or not self.events:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='gpio-trace-replay', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            replay_start = time.perf_counter()
+            for t, index in self.events:
+                due = replay_start + t / self.speed
+                delay = due - time.perf_counter()
+                if delay > 0 and self._stop_event.wait(delay):
+                    return
+                lateness = time.perf_counter() - due
+                self.press(index)
+                self.presses_delivered += 1
+                self.total_lateness += lateness
+                self.max_lateness = max(self.max_lateness, lateness)
+            if not self.loop:
+                break
+        print(f"Trace replay finished: {self.stats()}")
+
+    def stats(self):
+        """Returns delivery statistics for the replay so far."""
+        delivered = self.presses_delivered
+        return {
+            'presses_delivered': delivered,
+            'mean_lateness_ms': (self.total_lateness / delivered * 1000) if delivered else 0.0,
+            'max_lateness_ms': self.max_lateness * 1000,
+        }
+
+
+class TraceRecorder:
+    """Records button presses (time since start, index) for later replay."""
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.recorded_at = datetime.datetime.now().isoformat()
+        self.events = []
+        self._lock = threading.Lock()
+
+    def record(self, index):
+        t = time.perf_counter() - self.start_time
+        with self._lock:
+            self.events.append((t, index))
+
+    def save(self, trace_path):
+        """Writes the trace to disk using an atomic write."""
+        with self._lock:
+            events = list(self.events)
+        save_trace(trace_path, events, recorded_at=self.recorded_at)
+        print(f"Saved {len(events)} button presses to {trace_path}.")
+
+
+def load_trace(trace_path):
+    """Loads a trace file and returns a time-sorted list of (t, index) tuples."""
+    with open(trace_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    events = [(float(e['t']), int(e['index'])) for e in data.get('events', [])]
+    events.sort(key=lambda e: e[0])
+    return events
+
+
+def save_trace(trace_path, events, recorded_at=None):
+    """Saves (t, index) tuples as a trace file."""
+    temp_file = trace_path + ".tmp"
+    data = {
+        'recorded_at': recorded_at or datetime.datetime.now().isoformat(),
+        'events': [{'t': round(t, 6), 'index': index} for t, index in events],
+    }
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=1)
+    os.replace(temp_file, trace_path)
+
+
+def create_backend(name, trace_path=None, replay_speed=1.0):
+    """Creates a GPIO backend by name ('gpiozero', 'mock' or 'replay')."""
+    if name == 'gpiozero':
+        return GpiozeroBackend()
+    if name == 'mock':
+        return MockBackend()
+    if name == 'replay':
+        if not trace_path:
+            raise ValueError("The 'replay' GPIO backend needs GPIO_TRACE_FILE in config.py.")
+        return TraceReplayBackend(trace_path, speed=replay_speed)
+    raise ValueError(f"Unknown GPIO backend '{name}'. Use 'gpiozero', 'mock' or 'replay'.")
@@ -1,24 +1,32 @@
-from gpiozero import Button, LED
-from config import BUTTON_PINS, RELAY_PINS
+from config import (BUTTON_PINS, RELAY_PINS, GPIO_BACKEND, GPIO_TRACE_FILE,
+                    GPIO_REPLAY_SPEED, GPIO_RECORD_TRACE)
+from app.gpio_backends import create_backend, TraceRecorder
 
 class HardwareController:
     """
     Hardware Abstraction Layer (HAL) for all GPIO interactions.
     This class manages the physical buttons and LEDs (via relays).
+    The devices come from a GPIO backend (real gpiozero, in-memory mock or
+    trace replay), selected with GPIO_BACKEND in config.py.
     """
-    def __init__(self):
+    def __init__(self, backend=None):
         if not BUTTON_PINS or not RELAY_PINS:
             raise ValueError("GPIO pins are not defined in config.py. Please configure them before running.")
 
-        self.buttons = [Button(pin) for pin in BUTTON_PINS]
+        if backend is None:
+            backend = create_backend(GPIO_BACKEND, trace_path=GPIO_TRACE_FILE, replay_speed=GPIO_REPLAY_SPEED)
+        self.backend = backend
+
+        self.buttons = [self.backend.create_button(pin) for pin in BUTTON_PINS]
         
-        # --- THIS IS THE CRITICAL CHANGE ---
-        # Initialize LEDs with active_high=False to handle active-low relays.
+        # LEDs are created active-low by the gpiozero backend to handle the relays.
         # Now, .on() will send a LOW signal, and .off() will send a HIGH signal.
-        self.leds = [LED(pin, active_high=False) for pin in RELAY_PINS]
-        # --- END OF CHANGE ---
+        self.leds = [self.backend.create_led(pin) for pin in RELAY_PINS]
+
+        # Optional recording of real presses for later replay on any machine
+        self.trace_recorder = TraceRecorder() if GPIO_RECORD_TRACE and self.backend.name == 'gpiozero' else None
         
-        print("HardwareController initialized for ACTIVE-LOW relays.")
+        print(f"HardwareController initialized with '{self.backend.name}' backend for ACTIVE-LOW relays.")
         print(f" - {len(self.buttons)} buttons on pins: {BUTTON_PINS}")
         print(f" - {len(self.leds)} LEDs (relays) on pins: {RELAY_PINS}")
 
@@ -27,8 +35,21 @@ class HardwareController:
         Assigns a single callback function to all button press events.
         The callback function will receive the button's index.
         """
+        if self.trace_recorder:
+            recorder = self.trace_recorder
+            def recording_callback(index):
+                recorder.record(index)
+                callback_func(index)
+            callback = recording_callback
+        else:
+            callback = callback_func
+
         for i, button in enumerate(self.buttons):
-            button.when_pressed = lambda b, index=i: callback_func(index)
+            button.when_pressed = lambda b, index=i: callback(index)
+
+    def start(self):
+        """Starts delivering presses. Only the replay backend has work to do here."""
+        self.backend.start()
             
     def turn_on_led(self, index):
         """Turns on a specific LED by its index (0-11)."""
@@ -52,6 +73,18 @@ class HardwareController:
     def cleanup(self):
         """Releases all GPIO resources safely."""
         print("Cleaning up GPIO resources...")
+
+        # Stop any background press source before closing the devices
+        try:
+            self.backend.stop()
+        except Exception as e:
+            print(f"Warning: Could not stop GPIO backend: {e}")
+
+        if self.trace_recorder:
+            try:
+                self.trace_recorder.save(GPIO_TRACE_FILE)
+            except Exception as e:
+                print(f"Warning: Could not save button trace: {e}")
         
         # Safely turn off all LEDs
         try:
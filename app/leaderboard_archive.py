@@ -0,0 +1,294 @@
+import gzip
+import json
+import os
+import datetime
+from app.leaderboard_index import player_key, score_mode
+
+class LeaderboardArchive:
+    """
+    Cold storage for finished leaderboard days.
+
+    Each finished day is written once to its own segment file
+    (leaderboard-YYYY-MM-DD.json) and never modified again. Segments older
+    than compress_after_days are gzip-compressed. A small manifest keeps the
+    score count of every archived day and one rolled-up aggregate per game
+    mode (score_mode) for the whole history: score histogram, per-player
+    bests, the top entries of all time and of each event, and those of the
+    latest archived ISO week. The aggregates are updated as days are archived,
+    so startup, the week, event and all-time views, ranks and player records
+    never open the segments, and their cost does not grow with the history.
+    """
+    SEGMENT_PREFIX = "leaderboard-"
+    COMPRESS_LEVEL = 6   # zlib's default: about 4x faster than gzip's 9, segments ~2% larger
+
+    def __init__(self, archive_dir, compress_after_days=7, top_n=15):
+        self.archive_dir = archive_dir
+        self.compress_after_days = compress_after_days
+        self.top_n = top_n
+        self.manifest_file = os.path.join(archive_dir, "manifest.json")
+        self.manifest = self._load_manifest()
+
+    # --- Manifest ---
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            if self._segment_days():
+                print(f"Warning: {self.manifest_file} is missing. Rebuilding from segments.")
+                return self._rebuild_manifest()
+            return {"days": {}, "totals": {}}
+        except json.JSONDecodeError:
+            print(f"Warning: Could not parse {self.manifest_file}. Rebuilding from segments.")
+            return self._rebuild_manifest()
+        if "totals" not in manifest:
+            # Written before the aggregates existed (a summary per day): rolled up once
+            print(f"Rolling up {len(manifest['days'])} archived leaderboard days into the manifest.")
+            return self._rebuild_manifest(sorted(manifest["days"]))
+        return manifest
+
+    def _save_manifest(self):
+        _atomic_write_json(self.manifest_file, self.manifest)
+
+    def _rebuild_manifest(self, days=None):
+        """Rebuilds the day counts and the aggregates by streaming every day's segments once."""
+        self.manifest = {"days": {}, "totals": {}}
+        for day in days if days is not None else self._segment_days():
+            entries = list(self.iter_day(day))
+            self.manifest["days"][day] = {"count": len(entries)}
+            self._roll_up(day, entries)
+        self._save_manifest()
+        return self.manifest
+
+    def _roll_up(self, day, entries):
+        """
+        Adds the entries of an archived day to the aggregates of their game
+        modes. Top lists are merged with _top_entries, so versus scores never
+        push single-player ones out. The week top only follows the latest week.
+        """
+        week = _week_key(day)
+        by_mode = {}
+        for entry in entries:
+            by_mode.setdefault(score_mode(entry), []).append(entry)
+        for mode, mode_entries in by_mode.items():
+            totals = self.manifest["totals"].setdefault(mode, {
+                "count": 0, "histogram": {}, "players": {}, "top": [], "top_by_event": {},
+                "week": week, "week_top": []})
+            totals["count"] += len(mode_entries)
+            _add_histogram(totals["histogram"], mode_entries)
+            _add_players(totals["players"], mode_entries)
+            totals["top"] = self._top_entries(totals["top"] + mode_entries)
+            by_event = {}
+            for entry in mode_entries:
+                if entry.get('event'):
+                    by_event.setdefault(entry['event'], []).append(entry)
+            for event, event_entries in by_event.items():
+                totals["top_by_event"][event] = self._top_entries(totals["top_by_event"].get(event, []) + event_entries)
+            if week > totals["week"]:
+                totals["week"], totals["week_top"] = week, []
+            if week == totals["week"]:
+                totals["week_top"] = self._top_entries(totals["week_top"] + mode_entries)
+
+    def _top_entries(self, entries):
+        """
+        The top_n scores plus the best score of each of the top_n players, so
+        both the plain and the best-per-player views can be rebuilt from them.
+        """
+        ranked = sorted(entries, key=lambda x: x.get('score', 0), reverse=True)
+        top = ranked[:self.top_n]
+        best_by_player = {}
+        for entry in ranked:
+            if len(best_by_player) >= self.top_n:
+                break
+            best_by_player.setdefault(player_key(entry.get('name', '')), entry)
+        top += [entry for entry in best_by_player.values() if not any(entry is listed for listed in top)]
+        return sorted(top, key=lambda x: x.get('score', 0), reverse=True)
+
+    # --- Segments ---
+    def _segment_path(self, day, compressed=False, part=0):
+        # Part 0 is the day's segment; later parts are supplementary segments (leaderboard-YYYY-MM-DD.1.json)
+        name = f"{self.SEGMENT_PREFIX}{day}.{part}.json" if part else f"{self.SEGMENT_PREFIX}{day}.json"
+        if compressed:
+            name += ".gz"
+        return os.path.join(self.archive_dir, name)
+
+    def _segment_days(self):
+        if not os.path.isdir(self.archive_dir):
+            return []
+        days = set()
+        for name in os.listdir(self.archive_dir):
+            if name.startswith(self.SEGMENT_PREFIX) and (name.endswith(".json") or name.endswith(".json.gz")):
+                days.add(name[len(self.SEGMENT_PREFIX):].split(".")[0])
+        return sorted(days)
+
+    def _parts(self, day):
+        """Part numbers of a day's segments: 0 plus every supplementary segment on disk."""
+        parts = [0]
+        while (os.path.exists(self._segment_path(day, part=parts[-1] + 1))
+               or os.path.exists(self._segment_path(day, compressed=True, part=parts[-1] + 1))):
+            parts.append(parts[-1] + 1)
+        return parts
+
+    def has_day(self, day):
+        return day in self.manifest["days"]
+
+    def archive_day(self, day, entries):
+        """
+        Writes a finished day to its immutable segment file. Scores of a day
+        that is already archived (e.g. dated before a clock correction) go to
+        a supplementary segment of that day.
+        """
+        self._write_day(day, entries)
+        self._save_manifest()
+
+    def archive_days(self, days):
+        """
+        Writes many finished days, given as (day, entries) pairs, saving the
+        manifest once at the end (also when a day fails to be written, so the
+        days before it stay listed). Returns the number of days written.
+        """
+        written = 0
+        try:
+            for day, entries in days:
+                self._write_day(day, entries)
+                written += 1
+        finally:
+            if written:
+                self._save_manifest()
+        return written
+
+    def _write_day(self, day, entries):
+        part = 0
+        if self.has_day(day):
+            part = self._parts(day)[-1] + 1
+            print(f"Warning: Leaderboard day {day} is already archived. "
+                  f"Adding {len(entries)} scores as supplementary segment {part}.")
+        os.makedirs(self.archive_dir, exist_ok=True)
+        # Days already past the compression age go straight to gzip
+        compressed = day < self._compress_cutoff()
+        _atomic_write_json(self._segment_path(day, compressed, part), {"day": day, "scores": entries},
+                           compresslevel=self.COMPRESS_LEVEL if compressed else None)
+        count = self.manifest["days"][day]["count"] if part else 0
+        self.manifest["days"][day] = {"count": count + len(entries)}
+        self._roll_up(day, entries)
+        print(f"Archived {len(entries)} scores from {day}.")
+
+    def _compress_cutoff(self, today=None):
+        today = today or datetime.date.today()
+        return (today - datetime.timedelta(days=self.compress_after_days)).isoformat()
+
+    def compress_old_segments(self, today=None):
+        """Gzips segments older than compress_after_days. Returns the number compressed."""
+        cutoff = self._compress_cutoff(today)
+        compressed = 0
+        for day in self.days():
+            if day >= cutoff:
+                continue
+            for part in self._parts(day):
+                plain_path = self._segment_path(day, part=part)
+                if not os.path.exists(plain_path):
+                    continue
+                gz_path = self._segment_path(day, compressed=True, part=part)
+                temp_file = gz_path + ".tmp"
+                try:
+                    with open(plain_path, 'rb') as src, gzip.open(temp_file, 'wb', compresslevel=self.COMPRESS_LEVEL) as dst:
+                        dst.write(src.read())
+                    os.replace(temp_file, gz_path)
+                    os.remove(plain_path)
+                    compressed += 1
+                except OSError as e:
+                    print(f"Warning: Could not compress leaderboard segment {day}: {e}")
+                    if os.path.exists(temp_file):
+                        os.remove(temp_file)
+        if compressed:
+            print(f"Compressed {compressed} leaderboard segments older than {cutoff}.")
+        return compressed
+
+    # --- Streaming readers ---
+    def days(self):
+        """Returns the archived days in chronological order."""
+        return sorted(self.manifest["days"])
+
+    def totals(self):
+        """
+        Returns the aggregates of the archived history per game mode:
+        {mode: {'count', 'histogram', 'players', 'top', 'top_by_event', 'week', 'week_top'}}.
+        """
+        return self.manifest["totals"]
+
+    def iter_day(self, day):
+        """Yields the entries of one archived day, reading only that day's segments."""
+        for part in self._parts(day):
+            gz_path = self._segment_path(day, compressed=True, part=part)
+            try:
+                if os.path.exists(gz_path):
+                    with gzip.open(gz_path, 'rt', encoding='utf-8') as f:
+                        data = json.load(f)
+                else:
+                    with open(self._segment_path(day, part=part), 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError, OSError) as e:
+                print(f"Warning: Could not read leaderboard segment {day}: {e}")
+                continue
+            yield from data.get("scores", [])
+
+    def iter_entries(self, start_day=None, end_day=None):
+        """
+        Yields archived entries day by day, from start_day to end_day inclusive
+        ('YYYY-MM-DD'). Only one day is held in memory at a time.
+        """
+        for day in self.days():
+            if start_day and day < start_day:
+                continue
+            if end_day and day > end_day:
+                break
+            yield from self.iter_day(day)
+
+
+def _week_key(day):
+    year, week, _ = datetime.date.fromisoformat(day).isocalendar()
+    return f'{year}-W{week:02d}'
+
+
+def _add_histogram(histogram, entries):
+    """Counts scores into a histogram: {score (as a JSON key): count}."""
+    for entry in entries:
+        key = str(int(entry.get('score', 0)))
+        histogram[key] = histogram.get(key, 0) + 1
+
+
+def _add_players(players, entries):
+    """Adds scores to the best score, play count and latest timestamp per player: {name: [best, plays, latest]}."""
+    for entry in entries:
+        name = player_key(entry.get('name', ''))
+        if not name:
+            continue
+        score = entry.get('score', 0)
+        timestamp = entry.get('timestamp', '')
+        record = players.get(name)
+        if record is None:
+            players[name] = [score, 1, timestamp]
+        else:
+            record[0] = max(record[0], score)
+            record[1] += 1
+            record[2] = max(record[2], timestamp)
+
+
+def _atomic_write_json(path, data, compresslevel=None):
+    """
+    Writes JSON via a temporary file (gzipped if a compresslevel is given).
+    Compact: json only uses its C encoder without indent.
+    """
+    temp_file = path + ".tmp"
+    text = json.dumps(data)
+    try:
+        if compresslevel is None:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                f.write(text)
+        else:
+            with gzip.open(temp_file, 'wt', encoding='utf-8', compresslevel=compresslevel) as f:
+                f.write(text)
+        os.replace(temp_file, path)
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
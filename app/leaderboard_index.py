@@ -0,0 +1,237 @@
+import bisect
+import datetime
+from dataclasses import dataclass
+from app.rank_index import ScoreRankIndex
+
+def _score_key(entry):
+    # Higher scores first; insort places ties after existing entries,
+    # so the earlier score keeps the better rank.
+    return -entry.get('score', 0)
+
+
+def player_key(name):
+    """Players are told apart by name only, ignoring case and extra spaces."""
+    return ' '.join(str(name).upper().split())
+
+
+def score_mode(entry):
+    """
+    Game mode of a score. Single-player scores (agility + quiz) and versus
+    scores (agility only) are not comparable, so they are ranked apart.
+    """
+    return entry.get('mode') or 'single'
+
+
+@dataclass
+class PlayerRecord:
+    """Best score, play count and latest play of one player (all time)."""
+    best: int = 0
+    plays: int = 0
+    latest: str = ''    # Timestamp of the latest score
+
+    def add(self, score, plays=1, latest=''):
+        self.best = max(self.best, score) if self.plays else score
+        self.plays += plays
+        self.latest = max(self.latest, latest)
+
+
+class LeaderboardIndex:
+    """
+    In-memory leaderboard index, partitioned by day.
+    Keeps a precomputed top-N list per hour, day, ISO week, event and all-time,
+    updated in O(N) per new score, so every view is served without scanning history.
+    Only today's scores are held in full; archived days contribute the
+    rolled-up aggregates of the archive manifest (top entries, histogram and
+    player bests per game mode), whose size does not grow with the history.
+    Besides the top lists, every score is counted in an order-statistics index
+    for its day and for all time, so the exact rank of any score is O(log n),
+    and each player's best, play count and latest play are kept in a dict.
+    With best_per_player, every top list holds a player at most once.
+    Top lists, ranks and player records are all kept per game mode
+    (score_mode): versus scores never compete with single-player scores.
+    """
+    VIEWS = ('hour', 'day', 'week', 'event', 'all')
+
+    def __init__(self, top_n=15, event_name=None, best_per_player=False):
+        self.top_n = top_n
+        self.event_name = event_name
+        self.best_per_player = best_per_player
+        self.days = {}            # 'YYYY-MM-DD' -> list of entries for that day
+        self.undated = []         # Entries without a usable timestamp (all-time view only)
+        self._top = {}            # (mode, view, bucket key) -> entries sorted by score, at most top_n
+        self._ranks = {}          # (mode, 'day', day) or (mode, 'all', 'all') -> ScoreRankIndex of every score
+        self.players = {}         # (mode, player_key(name)) -> PlayerRecord
+        self.current_day = None
+
+    # --- Bucket keys ---
+    @staticmethod
+    def bucket_keys(moment, event=None):
+        """Returns the bucket key of every view for a datetime."""
+        year, week, _ = moment.isocalendar()
+        return {
+            'hour': moment.strftime('%Y-%m-%dT%H'),
+            'day': moment.strftime('%Y-%m-%d'),
+            'week': f'{year}-W{week:02d}',
+            'event': event,
+            'all': 'all',
+        }
+
+    @staticmethod
+    def _parse_timestamp(entry):
+        timestamp_str = entry.get('timestamp', '')
+        if not timestamp_str:
+            return None
+        try:
+            return datetime.datetime.fromisoformat(timestamp_str)
+        except ValueError:
+            return None
+
+    # --- Updates ---
+    def load(self, entries, archived_totals=None):
+        """
+        Rebuilds the index from today's entries and the archive's aggregates
+        ({mode: {'count': n, 'histogram': {...}, 'players': {...}, 'top': [entries],
+                 'top_by_event': {event: [entries]}, 'week': key, 'week_top': [entries]}}).
+        A week top of an earlier week is dropped by the next roll_over().
+        """
+        self.days = {}
+        self.undated = []
+        self._top = {}
+        self._ranks = {}
+        self.players = {}
+        archived_totals = archived_totals or {}
+        for mode, totals in archived_totals.items():
+            for entry in totals.get('top', []):
+                self._insert_top((mode, 'all', 'all'), entry)
+            for event, top_entries in totals.get('top_by_event', {}).items():
+                for entry in top_entries:
+                    self._insert_top((mode, 'event', event), entry)
+            for entry in totals.get('week_top', []):
+                self._insert_top((mode, 'week', totals['week']), entry)
+            for score, count in totals.get('histogram', {}).items():
+                self._rank_index((mode, 'all', 'all')).add(int(score), count)
+            for name, (best, plays, latest) in totals.get('players', {}).items():
+                self.players.setdefault((mode, name), PlayerRecord()).add(best, plays, latest)
+        for entry in entries:
+            self.add(entry)
+        archived = sum(totals.get('count', 0) for totals in archived_totals.values())
+        print(f"LeaderboardIndex loaded {len(entries)} scores and the totals of {archived} archived scores.")
+
+    def add(self, entry):
+        """Adds one score entry to its day partition and to every view it belongs to."""
+        mode = score_mode(entry)
+        moment = self._parse_timestamp(entry)
+        score = entry.get('score', 0)
+        self._rank_index((mode, 'all', 'all')).add(score)
+        name = player_key(entry.get('name', ''))
+        if name:
+            self.players.setdefault((mode, name), PlayerRecord()).add(score, latest=entry.get('timestamp', ''))
+        if moment is None:
+            self.undated.append(entry)
+            self._insert_top((mode, 'all', 'all'), entry)
+            return
+
+        keys = self.bucket_keys(moment, entry.get('event'))
+        self.days.setdefault(keys['day'], []).append(entry)
+        self._rank_index((mode, 'day', keys['day'])).add(score)
+        for view, key in keys.items():
+            if key is not None:
+                self._insert_top((mode, view, key), entry)
+
+    def _insert_top(self, bucket, entry):
+        top = self._top.setdefault(bucket, [])
+        if len(top) >= self.top_n and _score_key(entry) >= _score_key(top[-1]):
+            return  # Not good enough for this view
+        if self.best_per_player:
+            # The list never shrinks this way, so it stays the exact top N players
+            name = player_key(entry.get('name', ''))
+            for position, listed in enumerate(top):
+                if player_key(listed.get('name', '')) == name:
+                    if _score_key(entry) >= _score_key(listed):
+                        return  # The player's listed score is at least as good
+                    del top[position]
+                    break
+        bisect.insort(top, entry, key=_score_key)
+        del top[self.top_n:]
+
+    def _rank_index(self, bucket):
+        index = self._ranks.get(bucket)
+        if index is None:
+            index = self._ranks[bucket] = ScoreRankIndex()
+        return index
+
+    def roll_over(self, now=None):
+        """
+        Drops hour, day and week top lists that can no longer be displayed.
+        Called on every hour boundary, so midnight is handled while the app runs.
+        Returns True if the day changed since the last call.
+        """
+        now = now or datetime.datetime.now()
+        current = self.bucket_keys(now)
+        for bucket in list(self._top):
+            _, view, key = bucket
+            if view in ('hour', 'day', 'week') and key != current[view]:
+                del self._top[bucket]
+        for bucket in list(self._ranks):
+            if bucket[1] == 'day' and bucket[2] != current['day']:
+                del self._ranks[bucket]
+        day_changed = self.current_day is not None and self.current_day != current['day']
+        self.current_day = current['day']
+        return day_changed
+
+    def pop_finished_days(self, now=None):
+        """Removes and returns the entries of every day before today, ready for archiving."""
+        today = (now or datetime.datetime.now()).strftime('%Y-%m-%d')
+        finished = []
+        for day in sorted(self.days):
+            if day < today:
+                finished.extend(self.days.pop(day))
+        return finished
+
+    def restore_entries(self, entries):
+        """Puts entries back into their day partitions (e.g. when archiving them failed)."""
+        for entry in entries:
+            moment = self._parse_timestamp(entry)
+            if moment is None:
+                self.undated.append(entry)
+            else:
+                self.days.setdefault(moment.strftime('%Y-%m-%d'), []).append(entry)
+
+    # --- Queries ---
+    def top(self, view, now=None, mode='single'):
+        """Returns the precomputed top-N entries of a view (of one game mode) for the current time."""
+        if view not in self.VIEWS:
+            raise ValueError(f"Unknown leaderboard view '{view}'.")
+        now = now or datetime.datetime.now()
+        key = self.event_name if view == 'event' else self.bucket_keys(now)[view]
+        return list(self._top.get((mode, view, key), []))
+
+    def rank(self, score, view='day', now=None, mode='single'):
+        """
+        Returns (rank, total) a new score gets among all of today's ('day') or
+        all ('all') scores of its game mode: rank is 1 + the number of higher
+        scores, total counts the new score too. Asked before the score is saved.
+        """
+        if view not in ('day', 'all'):
+            raise ValueError(f"Ranks are kept for the 'day' and 'all' views, not '{view}'.")
+        key = (now or datetime.datetime.now()).strftime('%Y-%m-%d') if view == 'day' else 'all'
+        index = self._ranks.get((mode, view, key))
+        if index is None:
+            return 1, 1
+        return index.rank(score), index.total + 1
+
+    def player(self, name, mode='single'):
+        """Returns the PlayerRecord of a name in a game mode (None for a new player)."""
+        return self.players.get((mode, player_key(name)))
+
+    def entries_for_day(self, day):
+        """Returns all entries of a day ('YYYY-MM-DD')."""
+        return self.days.get(day, [])
+
+    def all_entries(self):
+        """Returns every hot entry, grouped by day in chronological order."""
+        entries = []
+        for day in sorted(self.days):
+            entries.extend(self.days[day])
+        entries.extend(self.undated)
+        return entries
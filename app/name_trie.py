@@ -0,0 +1,84 @@
+class _Node:
+    __slots__ = ('children', 'name', 'count')
+
+    def __init__(self):
+        self.children = {}
+        self.name = None   # Full name if a name ends at this node
+        self.count = 0     # How many times that name was entered
+
+
+class NameTrie:
+    """
+    Prefix trie of player names for name-entry autocomplete.
+    Kept incrementally: add() is called for every submitted score, and the
+    trie is rebuilt from the day's leaderboard at startup and at midnight.
+    """
+    def __init__(self, names=()):
+        self.root = _Node()
+        self.size = 0
+        for name in names:
+            self.add(name)
+
+    @staticmethod
+    def normalize(name):
+        return ' '.join(str(name).upper().split())
+
+    @classmethod
+    def normalize_prefix(cls, prefix):
+        """Like normalize, but a typed trailing space is kept: 'JOHN ' does not match 'JOHNNY'."""
+        normalized = cls.normalize(prefix)
+        if normalized and str(prefix)[-1:].isspace():
+            normalized += ' '
+        return normalized
+
+    def add(self, name):
+        name = self.normalize(name)
+        if not name:
+            return
+        node = self.root
+        for char in name:
+            node = node.children.setdefault(char, _Node())
+        if node.name is None:
+            node.name = name
+            self.size += 1
+        node.count += 1
+
+    def clear(self):
+        self.root = _Node()
+        self.size = 0
+
+    def __contains__(self, name):
+        node = self._find(self.normalize(name))
+        return node is not None and node.name is not None
+
+    def __len__(self):
+        return self.size
+
+    def _find(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def suggestions(self, prefix, limit=3):
+        """
+        Returns up to limit names starting with prefix, most entered first.
+        An empty prefix or an exact full match gives no suggestions.
+        """
+        prefix = self.normalize_prefix(prefix)
+        if not prefix:
+            return []
+        node = self._find(prefix)
+        if node is None:
+            return []
+        found = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.name is not None and current.name != prefix:
+                found.append((-current.count, current.name))
+            stack.extend(current.children.values())
+        found.sort()
+        return [name for _, name in found[:limit]]
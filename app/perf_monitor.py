@@ -0,0 +1,112 @@
+import gc
+import os
+import time
+from collections import deque
+from kivy.clock import Clock
+from app.ui.text_cache import text_cache
+
+class PerfMonitor:
+    """
+    Collects live performance statistics: frame times, scheduled Clock events,
+    widgets per screen, GC collections and pauses, RSS and GPIO event rate.
+    Only collects while started; when stopped it has no Clock event and no
+    GC callback registered, so it costs nothing.
+    """
+    def __init__(self, screen_manager, gpio_event_count=None, frame_window=300):
+        self.sm = screen_manager
+        self.gpio_event_count = gpio_event_count  # Callable returning the total number of GPIO presses
+        self.frame_times = deque(maxlen=frame_window)
+        self.active = False
+        self._frame_event = None
+
+        self.gc_collections = 0
+        self.gc_pauses = deque(maxlen=100)
+        self._gc_start = None
+
+        self._last_gpio_count = 0
+        self._last_gpio_time = 0.0
+        self.gpio_rate = 0.0
+
+    def start(self):
+        if self.active:
+            return
+        self.active = True
+        self.frame_times.clear()
+        self.gc_pauses.clear()
+        self.gc_collections = 0
+        self._last_gpio_count = self.gpio_event_count() if self.gpio_event_count else 0
+        self._last_gpio_time = time.perf_counter()
+        self._frame_event = Clock.schedule_interval(self._on_frame, 0)
+        gc.callbacks.append(self._on_gc)
+
+    def stop(self):
+        if not self.active:
+            return
+        self.active = False
+        if self._frame_event:
+            self._frame_event.cancel()
+            self._frame_event = None
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+
+    def _on_frame(self, dt):
+        self.frame_times.append(dt)
+
+    def _on_gc(self, phase, info):
+        if phase == 'start':
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            self.gc_pauses.append(time.perf_counter() - self._gc_start)
+            self.gc_collections += 1
+            self._gc_start = None
+
+    @staticmethod
+    def rss_mb():
+        """Returns the resident set size in MB (Linux), or 0 if unavailable."""
+        try:
+            with open('/proc/self/statm', 'r') as f:
+                resident_pages = int(f.read().split()[1])
+            return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+        except (OSError, ValueError, IndexError):
+            return 0.0
+
+    def _update_gpio_rate(self):
+        if not self.gpio_event_count:
+            return
+        now = time.perf_counter()
+        count = self.gpio_event_count()
+        elapsed = now - self._last_gpio_time
+        if elapsed > 0:
+            self.gpio_rate = (count - self._last_gpio_count) / elapsed
+        self._last_gpio_count = count
+        self._last_gpio_time = now
+
+    def snapshot(self):
+        """Returns the current statistics as a dict."""
+        frames = sorted(self.frame_times)
+        if frames:
+            mean = sum(frames) / len(frames)
+            fps = 1.0 / mean if mean > 0 else 0.0
+            p50 = frames[len(frames) // 2]
+            p95 = frames[min(len(frames) - 1, int(len(frames) * 0.95))]
+            worst = frames[-1]
+        else:
+            fps = p50 = p95 = worst = 0.0
+
+        self._update_gpio_rate()
+        pauses = list(self.gc_pauses)
+        return {
+            'fps': fps,
+            'frame_p50_ms': p50 * 1000,
+            'frame_p95_ms': p95 * 1000,
+            'frame_max_ms': worst * 1000,
+            'clock_events': len(Clock.get_events()),
+            'widgets': {screen.name: sum(1 for _ in screen.walk()) for screen in self.sm.screens},
+            'gc_collections': self.gc_collections,
+            'gc_counts': gc.get_count(),
+            'gc_pause_max_ms': max(pauses) * 1000 if pauses else 0.0,
+            'gc_pause_last_ms': pauses[-1] * 1000 if pauses else 0.0,
+            'rss_mb': self.rss_mb(),
+            'gpio_rate': self.gpio_rate,
+            'text_cache': text_cache.stats(),
+        }
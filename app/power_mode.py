@@ -0,0 +1,200 @@
+import threading
+import time
+from kivy.clock import Clock
+
+class IdleLedAnimation:
+    """
+    The idle "loading circle" on the LED ring, driven by its own timer thread
+    instead of a Kivy Clock event, so the main loop does not have to wake up
+    for it. Each step only switches the two LEDs that change.
+    """
+    def __init__(self, hw, interval=0.5, off_count=3):
+        self.hw = hw
+        self.interval = interval
+        self.off_count = off_count
+        self.position = 0   # First LED of the off window
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self.position = 0
+        total = len(self.hw.leds)
+        for i in range(total):
+            if i < self.off_count:
+                self.hw.turn_off_led(i)
+            else:
+                self.hw.turn_on_led(i)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='IdleLeds', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        total = len(self.hw.leds)
+        while not self._stop.wait(self.interval):
+            # Move the off window one position clockwise: the LED leaving it
+            # turns on, the LED entering it turns off
+            self.hw.turn_on_led(self.position)
+            self.hw.turn_off_led((self.position + self.off_count) % total)
+            self.position = (self.position + 1) % total
+
+    def stop(self):
+        """Stops the animation (waits for the timer thread, so the LEDs are free afterwards)."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+
+class IdlePowerMode:
+    """
+    Low-power mode of the stand while nobody is playing.
+
+    enter() lowers the frame rate limit of the Kivy clock and pauses the
+    Clock events registered with pause_while_idle(); wake() restores both.
+    Any GPIO press (wake_from_thread(), from the GPIO thread) or touch wakes
+    the stand. While idle the clock waits for the next frame on an event
+    that a GPIO press sets, so a press cuts the long idle frame short and
+    is handled at once.
+    If the stand is still idle-eligible (can_idle) a while after an input
+    wake, it drops back to idle.
+    CPU time (process_time) and wall time are accounted per state.
+    """
+    def __init__(self, idle_fps=10, idle_after=20.0, can_idle=None, enabled=True):
+        self.idle_fps = idle_fps
+        self.active_fps = Clock._max_fps   # graphics/maxfps of the Kivy config
+        self.idle_after = idle_after
+        self.can_idle = can_idle    # Callable: may the stand go back to idle now?
+        self.enabled = enabled
+        self.idle = False
+        self._paused = []           # [(event, resume callback or None)]
+        self._pausable = []
+        self._reidle_event = None
+        self._wake_scheduled = False
+        self._woken = threading.Event()
+        self._clock_idle = None     # The clock's own idle() while ours is installed
+
+        self.wakes = 0
+        self.wake_latencies = []    # Seconds from a GPIO press to the wake on the main thread
+        self._state_started = (time.monotonic(), time.process_time())
+        self.wall = {'active': 0.0, 'idle': 0.0}
+        self.cpu = {'active': 0.0, 'idle': 0.0}
+
+    def pause_while_idle(self, get_event, on_resume=None):
+        """
+        Registers a non-essential Clock event that is cancelled in idle mode
+        and scheduled again on wake (get_event returns the event, or None;
+        on_resume runs once on wake, e.g. to catch up on a skipped poll).
+        """
+        self._pausable.append((get_event, on_resume))
+
+    def _account(self):
+        now = (time.monotonic(), time.process_time())
+        state = 'idle' if self.idle else 'active'
+        self.wall[state] += now[0] - self._state_started[0]
+        self.cpu[state] += now[1] - self._state_started[1]
+        self._state_started = now
+
+    def enter(self):
+        if not self.enabled or self.idle:
+            return
+        self._account()
+        self.idle = True
+        if self._reidle_event:
+            self._reidle_event.cancel()
+            self._reidle_event = None
+        for get_event, on_resume in self._pausable:
+            event = get_event()
+            if event is not None and event.is_triggered:
+                event.cancel()
+                self._paused.append((event, on_resume))
+        self._woken.clear()
+        self._set_max_fps(self.idle_fps)
+        self._clock_idle = Clock.idle
+        Clock.idle = self._idle_frame_wait
+
+    def wake(self, *args):
+        """Back to full frame rate with all paused events running again."""
+        self._wake_scheduled = False
+        if self._reidle_event:
+            self._reidle_event.cancel()
+            self._reidle_event = None
+        if not self.idle:
+            return
+        self._account()
+        self.idle = False
+        self.wakes += 1
+        Clock.idle = self._clock_idle
+        self._clock_idle = None
+        self._set_max_fps(self.active_fps)
+        paused, self._paused = self._paused, []
+        for event, on_resume in paused:
+            event()     # Calling a cancelled ClockEvent schedules it again
+            if on_resume:
+                on_resume(0)
+
+    def wake_from_input(self, *args):
+        """Wakes for a visitor's input; back to idle after idle_after seconds if nothing started."""
+        self.wake()
+        if self.enabled and self.can_idle is not None and self.can_idle():
+            self._reidle_event = Clock.schedule_once(self._reidle, self.idle_after)
+
+    def wake_from_thread(self, pressed_at=None):
+        """Called on the GPIO thread for every press; wakes the main loop if it is idle."""
+        if not self.idle or self._wake_scheduled:
+            return
+        self._wake_scheduled = True
+        self._woken.set()
+        pressed_at = time.perf_counter() if pressed_at is None else pressed_at
+        def wake(dt):
+            self.wake_latencies.append(time.perf_counter() - pressed_at)
+            self.wake_from_input()
+        Clock.schedule_once(wake, 0)
+
+    def _idle_frame_wait(self):
+        """Stands in for Clock.idle() while idle: waits for the next idle frame unless a press comes first."""
+        remaining = 1 / self.idle_fps - (Clock.time() - Clock._last_tick)
+        if remaining > 0 and self._woken.wait(remaining):
+            self._set_max_fps(self.active_fps)   # Woken: the clock's idle() must not sleep the rest
+        return self._clock_idle()
+
+    def on_touch(self, *args):
+        """Window touch handler: wakes the stand and lets the touch through."""
+        self.wake_from_input()
+        return False
+
+    def _reidle(self, dt):
+        self._reidle_event = None
+        if self.can_idle():
+            self.enter()
+
+    @staticmethod
+    def _set_max_fps(fps):
+        # Kivy reads graphics/maxfps from its config only when the clock is
+        # created; the clock's own limit is the one knob that works at runtime
+        Clock._max_fps = float(fps)
+
+    def stop(self):
+        if self._reidle_event:
+            self._reidle_event.cancel()
+            self._reidle_event = None
+        self.wake()
+
+    def stats(self):
+        self._account()
+        latencies = sorted(self.wake_latencies)
+        return {
+            'state': 'idle' if self.idle else 'active',
+            'wakes': self.wakes,
+            'idle_s': round(self.wall['idle'], 1),
+            'active_s': round(self.wall['active'], 1),
+            'idle_cpu_pct': round(100 * self.cpu['idle'] / self.wall['idle'], 1) if self.wall['idle'] else 0.0,
+            'active_cpu_pct': round(100 * self.cpu['active'] / self.wall['active'], 1) if self.wall['active'] else 0.0,
+            'wake_ms_max': round(latencies[-1] * 1000, 1) if latencies else 0.0,
+        }
@@ -0,0 +1,47 @@
+class ScoreRankIndex:
+    """
+    Order-statistics index of scores: a Fenwick (binary indexed) tree with one
+    bucket per integer score. Adding a score and asking how many scores beat
+    it are both O(log max_score), however many scores there are.
+    The tree grows (doubling) when a higher score than it can hold arrives.
+    """
+    def __init__(self, size=1024):
+        self.size = 1
+        while self.size < size:
+            self.size *= 2
+        self.tree = [0] * (self.size + 1)   # 1-based; bucket of score s is s + 1
+        self.total = 0
+
+    def _grow(self, score):
+        while score + 1 > self.size:
+            # For a power-of-two size, only the new last node covers old buckets (all of them)
+            self.tree.extend([0] * self.size)
+            self.size *= 2
+            self.tree[self.size] = self.total
+
+    def add(self, score, count=1):
+        score = max(0, int(score))
+        self._grow(score)
+        i = score + 1
+        while i <= self.size:
+            self.tree[i] += count
+            i += i & -i
+        self.total += count
+
+    def count_up_to(self, score):
+        """Number of scores <= score."""
+        if score < 0:
+            return 0
+        i = min(int(score) + 1, self.size)
+        found = 0
+        while i > 0:
+            found += self.tree[i]
+            i -= i & -i
+        return found
+
+    def count_above(self, score):
+        return self.total - self.count_up_to(score)
+
+    def rank(self, score):
+        """Rank a score has (or would have) among the indexed scores: 1 + the number of higher scores."""
+        return self.count_above(score) + 1
@@ -0,0 +1,326 @@
+import json
+import os
+import time
+from collections import Counter
+import numpy as np
+from app.leaderboard_archive import LeaderboardArchive
+from app.settings import GameSettings, SettingsStore, SCORING_SETTINGS, scoring_version
+
+# Scores of a leaderboard version that could not be re-scored (no raw components)
+UNRESCORED_FILE = "unrescored.json"
+
+
+def compute_scores(agility_ms, quiz_correct, scoring):
+    """
+    Scores of many sessions at once under one scoring function, exactly as
+    the game computes them: GameManager.agility_score() plus the quiz points.
+    agility_ms is NaN for an unfinished agility round (0 agility points).
+    """
+    finished = ~np.isnan(agility_ms)
+    # int() in the game truncates; the times are never negative
+    penalty = np.trunc(np.where(finished, agility_ms, 0.0) * scoring['agility_score_penalty_per_ms']).astype(np.int64)
+    agility = np.where(finished, np.maximum(0, scoring['agility_max_score'] - penalty), 0)
+    return agility + quiz_correct.astype(np.int64) * scoring['quiz_points_per_correct']
+
+
+class ScoreColumns:
+    """
+    The score-related fields of a list of leaderboard entries as arrays.
+    Entries saved before scores kept their raw components have no
+    config_version; they cannot be re-scored (rescorable is False).
+    version_codes maps config versions to small integers, shared between
+    the chunks of one run.
+    """
+    def __init__(self, entries, version_codes):
+        agility_ms, quiz_correct, scores, codes = [], [], [], []
+        for entry in entries:
+            version = entry.get('config_version')
+            ms = entry.get('agility_ms')
+            agility_ms.append(np.nan if ms is None else ms)
+            quiz_correct.append(entry.get('quiz_correct') or 0)
+            scores.append(entry.get('score', 0))
+            codes.append(-1 if version is None else version_codes.setdefault(version, len(version_codes)))
+        self.agility_ms = np.array(agility_ms, dtype=np.float64)
+        self.quiz_correct = np.array(quiz_correct, dtype=np.int64)
+        self.scores = np.array(scores, dtype=np.int64)
+        self.codes = np.array(codes, dtype=np.int32)
+        self.rescorable = self.codes >= 0
+
+    def rescore(self, scoring):
+        """New scores under a scoring function; entries that cannot be re-scored keep their score."""
+        return np.where(self.rescorable, compute_scores(self.agility_ms, self.quiz_correct, scoring), self.scores)
+
+
+def known_scoring_versions(presets):
+    """{config_version: (preset names, scoring)} of the given presets ({name: overrides})."""
+    known = {}
+    for name, values in sorted(presets.items()):
+        scoring = GameSettings.from_dict(values, preset=name).scoring()
+        names, _ = known.setdefault(scoring_version(scoring), ([], scoring))
+        names.append(name)
+    return known
+
+
+def read_hot_scores(leaderboard_file):
+    """Reads the scores of the hot leaderboard file without archiving anything (unlike DataManager)."""
+    try:
+        with open(leaderboard_file, 'r', encoding='utf-8') as f:
+            return json.load(f).get("scores", [])
+    except (FileNotFoundError, json.JSONDecodeError):
+        print(f"Warning: Could not load or parse {leaderboard_file}. No hot scores.")
+        return []
+
+
+class HistoryRescorer:
+    """
+    Re-scores the whole leaderboard history (hot file and archive) under a
+    new scoring function.
+
+    The history is read one archived day at a time; each day's entries become
+    NumPy columns and are re-scored with array operations, so memory holds one
+    day of entries plus a few numbers per score. With out_dir, the re-scored
+    history is written there as a new leaderboard version with the same layout
+    (leaderboard.json and an archive with its manifest); the current files are
+    never modified. Each re-scored entry keeps its original score and config
+    version in 'rescored_from'. Entries that cannot be re-scored are kept out
+    of the version's ranked files (their scores are under the old scoring)
+    and written to its unrescored.json instead.
+    Scores whose config version is a known preset are also recomputed under
+    their own scoring, as a check that the raw components reproduce them.
+    """
+    def __init__(self, scoring, known_versions=None, top_n=15):
+        self.scoring = scoring
+        self.version = scoring_version(scoring)
+        self.known_versions = known_versions or {}
+        self.top_n = top_n
+        self.version_codes = {}
+        self._old = []
+        self._new = []
+        self._rescorable = []
+        self._codes = []
+        self.unrescored = []
+        self.mismatches = 0
+        self.checked = 0
+        self.timings = {'read_s': 0.0, 'compute_s': 0.0, 'write_s': 0.0}
+
+    def rescore_entries(self, entries):
+        """Re-scores one chunk of entries. Returns the new scores (an array in entry order)."""
+        started = time.perf_counter()
+        columns = ScoreColumns(entries, self.version_codes)
+        converted = time.perf_counter()
+        new_scores = columns.rescore(self.scoring)
+        for version, code in self.version_codes.items():
+            if version not in self.known_versions:
+                continue
+            own = columns.codes == code
+            if own.any():
+                _, scoring = self.known_versions[version]
+                recomputed = compute_scores(columns.agility_ms[own], columns.quiz_correct[own], scoring)
+                self.checked += int(own.sum())
+                self.mismatches += int((recomputed != columns.scores[own]).sum())
+        self._old.append(columns.scores)
+        self._new.append(new_scores)
+        self._rescorable.append(columns.rescorable)
+        self._codes.append(columns.codes)
+        self.timings['read_s'] += converted - started
+        self.timings['compute_s'] += time.perf_counter() - converted
+        return new_scores
+
+    def rescored_entries(self, entries, new_scores):
+        """
+        Copies of the entries with their new score and config version. Entries
+        that cannot be re-scored are left out and set aside in self.unrescored.
+        """
+        rescored = []
+        for entry, score in zip(entries, new_scores.tolist()):
+            if entry.get('config_version') is None:
+                self.unrescored.append(entry)
+                continue
+            original = entry.get('rescored_from') or {'score': entry.get('score', 0),
+                                                      'config_version': entry['config_version']}
+            rescored.append(dict(entry, score=score, config_version=self.version, rescored_from=original))
+        return rescored
+
+    def _rescored_days(self, archive, with_entries):
+        """
+        Re-scores the archive one day at a time; yields (day, re-scored entries or None).
+        With entries, a day without any re-scorable entry is not yielded.
+        """
+        for day in archive.days():
+            started = time.perf_counter()
+            entries = list(archive.iter_day(day))
+            self.timings['read_s'] += time.perf_counter() - started
+            new_scores = self.rescore_entries(entries)
+            if not with_entries:
+                yield day, None
+                continue
+            rescored = self.rescored_entries(entries, new_scores)
+            if rescored:
+                yield day, rescored
+
+    def run(self, leaderboard_file, archive, out_dir=None, compress_after_days=7):
+        """Re-scores every archived day and the hot scores, optionally writing them to out_dir."""
+        started = time.perf_counter()
+        days = self._rescored_days(archive, with_entries=bool(out_dir))
+        if out_dir:
+            out_archive = LeaderboardArchive(os.path.join(out_dir, 'archive'),
+                                             compress_after_days=compress_after_days, top_n=self.top_n)
+            out_archive.archive_days(days)   # Days past the compression age are written gzipped
+        else:
+            for _ in days:
+                pass
+
+        read_started = time.perf_counter()
+        entries = read_hot_scores(leaderboard_file)
+        self.timings['read_s'] += time.perf_counter() - read_started
+        new_scores = self.rescore_entries(entries)
+        if out_dir:
+            hot_file = os.path.join(out_dir, os.path.basename(leaderboard_file))
+            _write_scores(hot_file, self.rescored_entries(entries, new_scores))
+            if self.unrescored:
+                # Not ranked by the stand: only kept so the version holds the whole history
+                _write_scores(os.path.join(out_dir, UNRESCORED_FILE), self.unrescored)
+        self.timings['write_s'] = time.perf_counter() - started - self.timings['read_s'] - self.timings['compute_s']
+        return self.report()
+
+    def report(self):
+        old = np.concatenate(self._old) if self._old else np.zeros(0, dtype=np.int64)
+        new = np.concatenate(self._new) if self._new else np.zeros(0, dtype=np.int64)
+        rescorable = np.concatenate(self._rescorable) if self._rescorable else np.zeros(0, dtype=bool)
+        codes = np.concatenate(self._codes) if self._codes else np.zeros(0, dtype=np.int32)
+        names = {code: version for version, code in self.version_codes.items()}
+        counts = Counter(codes.tolist())
+        versions = {}
+        for code, count in counts.most_common():
+            version = names.get(code, 'none')
+            versions[version] = {'scores': count, 'presets': self.known_versions.get(version, ([], None))[0]}
+
+        report = {
+            'version': self.version,
+            'scoring': self.scoring,
+            'scores': int(len(old)),
+            'rescored': int(rescorable.sum()),
+            'not_rescorable': int((~rescorable).sum()),
+            'versions': versions,
+            'checked': self.checked,
+            'mismatches': self.mismatches,
+            'timings': {name: round(seconds, 3) for name, seconds in self.timings.items()},
+        }
+        if rescorable.any():
+            change = new[rescorable] - old[rescorable]
+            report['mean_score'] = [round(float(old[rescorable].mean()), 1), round(float(new[rescorable].mean()), 1)]
+            report['max_change'] = [int(change.min()), int(change.max())]
+            report['rank_correlation'] = round(rank_correlation(old[rescorable], new[rescorable]), 4)
+        if len(old):
+            # Stable sorts: ties keep the earlier score ahead, as on the leaderboard.
+            # Scores that cannot be re-scored are not ranked in the new version.
+            old_top = set(np.argsort(-old, kind='stable')[:self.top_n].tolist())
+            new_order = np.argsort(-new, kind='stable')
+            new_top = set(new_order[rescorable[new_order]][:self.top_n].tolist())
+            report['top_n_kept'] = f"{len(old_top & new_top)}/{len(old_top)}"
+        return report
+
+
+def _write_scores(path, entries):
+    temp_file = path + ".tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump({"scores": entries}, f, indent=4)
+    os.replace(temp_file, path)
+
+
+def rank_correlation(a, b):
+    """Spearman rank correlation of two score arrays (ties ranked by position)."""
+    if len(a) < 2:
+        return 1.0
+    ranks_a = np.argsort(np.argsort(a, kind='stable'), kind='stable')
+    ranks_b = np.argsort(np.argsort(b, kind='stable'), kind='stable')
+    if ranks_a.std() == 0 or ranks_b.std() == 0:
+        return 1.0
+    return float(np.corrcoef(ranks_a, ranks_b)[0, 1])
+
+
+def benchmark(rows, scoring, seed=0):
+    """Times compute_scores() on synthetic sessions. Returns (seconds, rows per second)."""
+    rng = np.random.default_rng(seed)
+    agility_ms = rng.uniform(4000, 30000, rows)
+    agility_ms[rng.random(rows) < 0.02] = np.nan   # Some unfinished rounds
+    quiz_correct = rng.integers(0, 6, rows)
+    started = time.perf_counter()
+    compute_scores(agility_ms, quiz_correct, scoring)
+    seconds = time.perf_counter() - started
+    return seconds, rows / seconds if seconds else float('inf')
+
+
+def parse_scoring_overrides(pairs):
+    """Parses NAME=VALUE pairs from the command line into scoring settings."""
+    overrides = {}
+    for pair in pairs:
+        name, _, value = pair.partition('=')
+        name = name.strip().lower()
+        if name not in SCORING_SETTINGS:
+            raise ValueError(f"Unknown scoring setting '{name.upper()}'. "
+                             f"Choose from: {', '.join(s.upper() for s in SCORING_SETTINGS)}")
+        overrides[name] = json.loads(value)
+    return overrides
+
+
+if __name__ == '__main__':
+    # Re-score the whole leaderboard history under a new scoring function.
+    # Report only (what-if), starting from the active preset or another one:
+    # python -m app.rescoring AGILITY_SCORE_PENALTY_PER_MS=0.8
+    # python -m app.rescoring --preset tournament
+    # Write the re-scored history as a new leaderboard version:
+    # python -m app.rescoring --preset tournament --write
+    # Time the vectorized scoring alone on synthetic sessions:
+    # python -m app.rescoring --benchmark 5000000
+    import gc
+    import sys
+    import config
+    args = sys.argv[1:]
+    store = SettingsStore(config.SETTINGS_FILE)
+    preset = store.current.preset
+    if '--preset' in args:
+        preset = args.pop(args.index('--preset') + 1)
+        args.remove('--preset')
+        if preset not in store.presets:
+            sys.exit(f"Unknown preset '{preset}'. Available: {', '.join(sorted(store.presets))}.")
+    rows = 0
+    if '--benchmark' in args:
+        rows = int(args.pop(args.index('--benchmark') + 1))
+        args.remove('--benchmark')
+    write = '--write' in args
+    pairs = [arg for arg in args if arg != '--write']
+    settings = GameSettings.from_dict(dict(store.presets[preset], **parse_scoring_overrides(pairs)), preset=preset)
+    scoring = settings.scoring()
+
+    if rows:
+        seconds, rate = benchmark(rows, scoring)
+        print(f"Scored {rows:,} synthetic sessions in {seconds * 1000:.0f} ms ({rate / 1e6:.1f} M/s).")
+        sys.exit(0)
+
+    known = known_scoring_versions(store.presets)
+    rescorer = HistoryRescorer(scoring, known_versions=known, top_n=config.LEADERBOARD_TOP_N)
+    out_dir = None
+    if write:
+        out_dir = os.path.join(config.LEADERBOARD_VERSIONS_DIR, rescorer.version)
+        if os.path.exists(out_dir):
+            sys.exit(f"Leaderboard version {out_dir} already exists (versions are never overwritten).")
+        os.makedirs(out_dir)
+    archive = LeaderboardArchive(config.LEADERBOARD_ARCHIVE_DIR,
+                                 compress_after_days=config.LEADERBOARD_COMPRESS_AFTER_DAYS,
+                                 top_n=config.LEADERBOARD_TOP_N)
+    # Entries hold no reference cycles; GC passes over millions of fresh dicts only cost time
+    gc.disable()
+    report = rescorer.run(config.LEADERBOARD_FILE, archive, out_dir=out_dir,
+                          compress_after_days=config.LEADERBOARD_COMPRESS_AFTER_DAYS)
+    print(f"Re-scoring under '{preset}' {scoring} (config version {rescorer.version}):")
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if report['mismatches']:
+        print(f"Warning: {report['mismatches']} scores differ from their own scoring settings.")
+    if out_dir:
+        print(f"\nNew leaderboard version written to {out_dir}. To use it, set in config.py:")
+        print(f"  LEADERBOARD_FILE = \"{os.path.join(out_dir, os.path.basename(config.LEADERBOARD_FILE))}\"")
+        print(f"  LEADERBOARD_ARCHIVE_DIR = \"{os.path.join(out_dir, 'archive')}\"")
+        if report['not_rescorable']:
+            print(f"{report['not_rescorable']} scores without raw components are not ranked in this version; "
+                  f"they are kept in {os.path.join(out_dir, UNRESCORED_FILE)}.")
@@ -0,0 +1,99 @@
+import datetime
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+class SamplingProfiler:
+    """
+    On-demand sampling profiler for a running stand.
+
+    start() samples the stacks of all threads (Kivy main loop, GPIO callback
+    threads, ...) every interval for a number of seconds, then writes them in
+    the collapsed-stack format ("thread;outer;...;inner count") read by
+    flamegraph.pl and speedscope. Nothing runs until it is started.
+    """
+    def __init__(self, output_dir="data/profiles", interval=0.005, duration=10.0):
+        self.output_dir = output_dir
+        self.interval = interval
+        self.duration = duration
+        self._thread = None
+        self._lock = threading.Lock()
+        self.last_output = None
+
+    @property
+    def active(self):
+        return self._thread is not None
+
+    def start(self, duration=None, blocking=True):
+        """
+        Starts a profiling run in the background. Returns False if one is
+        already running (or, with blocking=False, is being started right now).
+        """
+        if not self._lock.acquire(blocking=blocking):
+            return False
+        try:
+            if self._thread is not None:
+                return False
+            self._thread = threading.Thread(target=self._run, args=(duration or self.duration,),
+                                            name='SamplingProfiler', daemon=True)
+            self._thread.start()
+        finally:
+            self._lock.release()
+        print(f"Profiler: sampling all threads for {duration or self.duration:.1f}s...")
+        return True
+
+    def on_signal(self, signum, frame):
+        """Signal handler (SIGUSR1): starts a profiling run."""
+        # Handlers run on the main thread, possibly interrupting start() from the 'f' key
+        # while it holds the lock: waiting for it would deadlock. Not deferred to the Kivy
+        # clock either, so a stalled main loop can still be profiled.
+        self.start(blocking=False)
+
+    @staticmethod
+    def _frame_label(frame):
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(';', ',')
+
+    def _sample(self, stacks, own_id, names):
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(self._frame_label(frame))
+                frame = frame.f_back
+            labels.append(names.get(thread_id, f'thread-{thread_id}'))
+            stacks[';'.join(reversed(labels))] += 1
+
+    def _run(self, duration):
+        stacks = Counter()
+        own_id = threading.get_ident()
+        samples = 0
+        started = time.perf_counter()
+        deadline = started + duration
+        try:
+            while time.perf_counter() < deadline:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                self._sample(stacks, own_id, names)
+                samples += 1
+                time.sleep(self.interval)
+            elapsed = time.perf_counter() - started
+            self.last_output = self._write(stacks)
+            print(f"Profiler: {samples} samples in {elapsed:.1f}s "
+                  f"({samples / elapsed:.0f} Hz) written to {self.last_output}")
+        except Exception as e:
+            print(f"Profiler: run failed: {e}")
+        finally:
+            with self._lock:
+                self._thread = None
+
+    def _write(self, stacks):
+        os.makedirs(self.output_dir, exist_ok=True)
+        name = datetime.datetime.now().strftime('profile-%Y%m%d-%H%M%S.collapsed')
+        path = os.path.join(self.output_dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
@@ -0,0 +1,200 @@
+import datetime
+import json
+import os
+import time
+
+# Phases paced by the stand rather than by the visitor. Time spent in them
+# (and in screen transitions) is dead time for throughput.
+DEAD_PHASES = ('countdown', 'quiz_intro', 'quiz_feedback', 'leaderboard')
+
+# Config settings that directly set the length of a phase (or of every transition)
+TIMING_SETTINGS = ('COUNTDOWN_DURATION', 'QUIZ_FEEDBACK_DURATION', 'SCREEN_TRANSITION_DURATION',
+                   'LEADERBOARD_TIMEOUT', 'AGILITY_BUTTONS_COUNT', 'QUIZ_ROUNDS_COUNT')
+
+
+class SessionRecorder:
+    """
+    Records how long each visitor session spends in each phase of the game.
+
+    A session starts at the first mark() after the welcome screen and ends at
+    end(); every mark() closes the previous phase. Finished sessions are
+    appended as one JSON line to the session log, together with the timing
+    settings they ran with, so the analyzer can replay them under other settings.
+    """
+    def __init__(self, log_path, settings):
+        self.log_path = log_path
+        self.settings = dict(settings)  # Timing settings the sessions run with
+        self.session = None
+        self._phase = None
+        self._phase_start = 0.0
+
+    def mark(self, phase, now=None):
+        """Starts a new phase (and a new session if none is active)."""
+        now = time.perf_counter() if now is None else now
+        if self.session is None:
+            self.session = {
+                'started_at': datetime.datetime.now().isoformat(),
+                'mode': 'single',
+                'players': 1,
+                'phases': [],
+                'transitions': 0,
+                'timed_out': None,
+                'settings': self.settings,
+            }
+        else:
+            self._close_phase(now)
+        self._phase = phase
+        self._phase_start = now
+
+    def set_mode(self, mode, players):
+        if self.session is not None:
+            self.session['mode'] = mode
+            self.session['players'] = players
+
+    def count_transition(self):
+        if self.session is not None:
+            self.session['transitions'] += 1
+
+    def timeout(self):
+        """Records that the current phase was ended by its timeout, not by the visitor."""
+        if self.session is not None:
+            self.session['timed_out'] = self._phase
+
+    def end(self, now=None):
+        """Closes the active session and appends it to the session log."""
+        if self.session is None:
+            return None
+        now = time.perf_counter() if now is None else now
+        self._close_phase(now)
+        session, self.session = self.session, None
+        phases = [name for name, _ in session['phases']]
+        session['completed'] = 'leaderboard' in phases
+        session['duration'] = round(sum(seconds for _, seconds in session['phases']), 3)
+        try:
+            os.makedirs(os.path.dirname(self.log_path) or '.', exist_ok=True)
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(session, ensure_ascii=False) + '\n')
+        except OSError as e:
+            print(f"Error writing session log to {self.log_path}: {e}")
+        return session
+
+    def _close_phase(self, now):
+        if self._phase is not None:
+            self.session['phases'].append([self._phase, round(now - self._phase_start, 3)])
+            self._phase = None
+
+
+def load_sessions(log_path):
+    """Reads every recorded session from the session log (skipping damaged lines)."""
+    sessions = []
+    try:
+        with open(log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    sessions.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return sessions
+
+
+def session_duration(session, settings=None):
+    """
+    Duration of a session, optionally re-timed under other timing settings.
+    Stand-paced phases take the new value; visitor-paced phases are scaled
+    by the change in agility buttons and quiz rounds.
+    """
+    # Sessions logged before the countdown was a setting ran the fixed 2.3 s countdown
+    old = dict({'COUNTDOWN_DURATION': 2.3}, **session.get('settings', {}))
+    new = dict(old, **(settings or {}))
+
+    def ratio(key):
+        return new[key] / old[key] if old.get(key) else 1.0
+
+    total = 0.0
+    for name, seconds in session['phases']:
+        if name == 'countdown':
+            seconds += new['COUNTDOWN_DURATION'] - old['COUNTDOWN_DURATION']
+        elif name == 'agility':
+            seconds *= ratio('AGILITY_BUTTONS_COUNT')
+        elif name in ('quiz_question', 'quiz_feedback'):
+            if name == 'quiz_feedback' and 'QUIZ_FEEDBACK_DURATION' in old:
+                seconds += new['QUIZ_FEEDBACK_DURATION'] - old['QUIZ_FEEDBACK_DURATION']
+            seconds *= ratio('QUIZ_ROUNDS_COUNT')
+        elif name == 'leaderboard' and session.get('timed_out') == 'leaderboard' and 'LEADERBOARD_TIMEOUT' in old:
+            seconds += new['LEADERBOARD_TIMEOUT'] - old['LEADERBOARD_TIMEOUT']
+        total += max(0.0, seconds)
+    if 'SCREEN_TRANSITION_DURATION' in old:
+        # Transitions overlap the phases, so only the change in their length counts
+        delta = new['SCREEN_TRANSITION_DURATION'] - old['SCREEN_TRANSITION_DURATION']
+        total += session.get('transitions', 0) * delta
+    return total
+
+
+def analyze(sessions, settings=None):
+    """
+    Returns throughput statistics of the recorded sessions: visitors per hour
+    back to back, mean time per phase and the share of dead time.
+    With settings, every session is first re-timed under those settings.
+    """
+    if not sessions:
+        return {'sessions': 0}
+    durations = [session_duration(s, settings) for s in sessions]
+    total_time = sum(durations)
+    visitors = sum(s.get('players', 1) for s in sessions)
+
+    phase_totals = {}
+    phase_counts = {}
+    for session in sessions:
+        for name, seconds in session['phases']:
+            phase_totals[name] = phase_totals.get(name, 0.0) + seconds
+            phase_counts[name] = phase_counts.get(name, 0) + 1
+    recorded_total = sum(phase_totals.values())
+    dead_time = sum(phase_totals.get(name, 0.0) for name in DEAD_PHASES)
+    transition_time = sum(s.get('transitions', 0) * s.get('settings', {}).get('SCREEN_TRANSITION_DURATION', 0.0)
+                          for s in sessions)
+
+    return {
+        'sessions': len(sessions),
+        'visitors': visitors,
+        'completed': sum(1 for s in sessions if s.get('completed')),
+        'mean_session_s': round(total_time / len(sessions), 2),
+        'visitors_per_hour': round(visitors * 3600 / total_time, 1) if total_time else 0.0,
+        'dead_time_share': round(dead_time / recorded_total, 3) if recorded_total else 0.0,
+        'transition_time_s': round(transition_time / len(sessions), 2),
+        'mean_phase_s': {name: round(phase_totals[name] / phase_counts[name], 2) for name in phase_totals},
+        'leaderboard_timeouts': sum(1 for s in sessions if s.get('timed_out') == 'leaderboard'),
+    }
+
+
+def parse_overrides(pairs):
+    """Parses NAME=VALUE pairs from the command line into timing settings."""
+    overrides = {}
+    for pair in pairs:
+        name, _, value = pair.partition('=')
+        name = name.strip().upper()
+        if name not in TIMING_SETTINGS:
+            raise ValueError(f"Unknown timing setting '{name}'. Choose from: {', '.join(TIMING_SETTINGS)}")
+        overrides[name] = float(value)
+    return overrides
+
+
+if __name__ == '__main__':
+    # Throughput report of the recorded sessions, with an optional what-if:
+    # python -m app.session_analyzer QUIZ_FEEDBACK_DURATION=1.5 LEADERBOARD_TIMEOUT=8
+    import sys
+    from config import SESSION_LOG_FILE
+    sessions = load_sessions(SESSION_LOG_FILE)
+    if not sessions:
+        print(f"No sessions recorded in {SESSION_LOG_FILE}.")
+        sys.exit(0)
+    current = analyze(sessions)
+    print("Recorded sessions:")
+    print(json.dumps(current, indent=2, ensure_ascii=False))
+    if len(sys.argv) > 1:
+        overrides = parse_overrides(sys.argv[1:])
+        predicted = analyze(sessions, overrides)
+        print(f"\nWhat-if {overrides}:")
+        print(f"  mean session: {current['mean_session_s']}s -> {predicted['mean_session_s']}s")
+        print(f"  visitors per hour: {current['visitors_per_hour']} -> {predicted['visitors_per_hour']}")
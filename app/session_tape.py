@@ -0,0 +1,276 @@
+import dataclasses
+import datetime
+import json
+import os
+import time
+from collections import deque
+from app.agility_sequence import new_seed
+
+# Game manager methods called by the touch screen and the keyboard hotkeys.
+# These (plus GPIO button presses) are all the inputs a tape can contain.
+TAPE_INPUTS = ('show_instructions', 'show_versus_instructions', 'proceed_from_instructions',
+               'check_answer_by_id', 'virtual_key_press', 'apply_name_suggestion',
+               'submit_score', 'skip_agility_game')
+
+# Fields of a saved score that a replay must reproduce (the timestamp never matches)
+SCORE_FIELDS = ('name', 'score', 'mode', 'preset', 'agility_seed')
+
+
+class SessionTape:
+    """
+    Records every external input of a running stand into a tape file.
+
+    One tape (JSON lines) is written per run of the app: GPIO presses, the
+    touch and keyboard inputs that reach the game manager, the seed and
+    settings of each session, sync points where the game waits for the
+    visitor, the scores saved and, on exit, the final state. The file is
+    opened (and old tapes pruned) when the tape is created. Entries are
+    buffered and written through defer, so during an agility round they land
+    when the critical section ends and otherwise right away, flushed, so a
+    crash keeps everything up to it. helper/replay_session.py plays a tape back.
+    """
+    def __init__(self, tape_dir="data/tapes", enabled=True, defer=None, max_files=200, max_age_days=30):
+        self.tape_dir = tape_dir
+        self.enabled = enabled
+        self.defer = defer or (lambda func: func())
+        self.max_files = max_files
+        self.max_age_days = max_age_days
+        self.origin = time.perf_counter()
+        self.recorded_at = datetime.datetime.now()
+        self.path = None
+        self._file = None
+        self._pending = []
+        if self.enabled:
+            self._open()
+
+    def _open(self):
+        try:
+            os.makedirs(self.tape_dir, exist_ok=True)
+            self.prune()
+            self.path = os.path.join(self.tape_dir, self.recorded_at.strftime('tape-%Y%m%d-%H%M%S.jsonl'))
+            self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(json.dumps({'type': 'header', 'recorded_at': self.recorded_at.isoformat()}) + '\n')
+            self._file.flush()
+        except OSError as e:
+            print(f"Error opening session tape, recording disabled: {e}")
+            self.enabled = False
+
+    def prune(self):
+        """Deletes the oldest tapes beyond max_files and the tapes older than max_age_days."""
+        tapes = sorted(name for name in os.listdir(self.tape_dir)
+                       if name.startswith('tape-') and name.endswith('.jsonl'))
+        cutoff = (self.recorded_at - datetime.timedelta(days=self.max_age_days)).strftime('tape-%Y%m%d-%H%M%S')
+        # The tape about to be opened counts towards max_files
+        excess = len(tapes) - max(self.max_files - 1, 0)
+        for i, name in enumerate(tapes):
+            if i < excess or name < cutoff:
+                try:
+                    os.remove(os.path.join(self.tape_dir, name))
+                except OSError as e:
+                    print(f"Warning: Could not remove old session tape {name}: {e}")
+
+    def _write(self, entry):
+        if not self.enabled:
+            return
+        self._pending.append(entry)
+        if len(self._pending) == 1:
+            self.defer(self.flush)
+
+    def flush(self):
+        """Writes the buffered entries to the tape file."""
+        pending, self._pending = self._pending, []
+        if not pending or self._file is None:
+            return
+        try:
+            self._file.write(''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in pending))
+            self._file.flush()
+        except OSError as e:
+            print(f"Error writing session tape, recording stopped: {e}")
+            self.enabled = False
+
+    def _t(self, now=None):
+        return round((time.perf_counter() if now is None else now) - self.origin, 6)
+
+    def record(self, name, *args):
+        """Records one touch/keyboard input (a TAPE_INPUTS call with its arguments)."""
+        self._write({'t': self._t(), 'type': 'input', 'name': name, 'args': list(args)})
+
+    def record_button(self, index, pressed_at):
+        """Records a GPIO button press at the time the GPIO thread saw it."""
+        self._write({'t': self._t(pressed_at), 'type': 'button', 'index': index})
+
+    def session_seed(self, settings):
+        """Returns the RNG seed of a new session and records it with the session's settings."""
+        seed = new_seed()
+        self._write({'t': self._t(), 'type': 'session', 'seed': seed, 'settings': dataclasses.asdict(settings)})
+        return seed
+
+    def sync(self, name, now=None):
+        """Records a point where the game starts waiting for the visitor (replays re-align here)."""
+        self._write({'t': self._t(now), 'type': 'sync', 'name': name})
+
+    def scores_saved(self, entries):
+        self._write({'t': self._t(), 'type': 'scores', 'entries': [score_key(entry) for entry in entries]})
+
+    def close(self, final_state):
+        """Records the final state of the game (screen, score) and closes the tape."""
+        self._write(dict({'t': self._t(), 'type': 'end'}, **final_state))
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.enabled = False  # Closed for good (the app may clean up more than once)
+
+
+def score_key(entry):
+    return {field: entry.get(field) for field in SCORE_FIELDS}
+
+
+def load_tape(path):
+    """Reads a tape and returns its entries (a damaged last line from a crash is skipped)."""
+    entries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return entries
+
+
+class VirtualClock:
+    """
+    Time source for replays: advances a fixed step per frame instead of
+    following the wall clock, optionally throttled to a maximum speed.
+    Installed as Kivy's Clock.time, so timers and animations follow it.
+    """
+    def __init__(self, start, step=0.05, speed=100.0):
+        self.current = start
+        self.step = step
+        self.speed = speed
+        self._real_last = time.perf_counter()
+
+    def now(self):
+        return self.current
+
+    def advance(self):
+        """Moves time forward by one step (sleeping if that would exceed the speed limit)."""
+        if self.speed:
+            wait = self.step / self.speed - (time.perf_counter() - self._real_last)
+            if wait > 0:
+                time.sleep(wait)
+        self._real_last = time.perf_counter()
+        self.current += self.step
+
+
+class TapeReplayer:
+    """
+    Feeds a recorded tape back into a game manager under a virtual clock.
+
+    Stands in for the game manager's SessionTape (so nothing is recorded
+    again): sessions get the recorded seeds and settings, and at each sync
+    point the tape's time line is re-aligned to the moment the game reached
+    it, so reaction times (and agility scores) are reproduced exactly.
+    Call step() once per frame; finished is set when the tape is played.
+    """
+    def __init__(self, entries, clock, sync_timeout=60.0):
+        self.entries = deque(entry for entry in entries if entry.get('type') != 'header')
+        self.sessions = deque(entry for entry in self.entries if entry['type'] == 'session')
+        self.expected_scores = [score for entry in self.entries if entry['type'] == 'scores'
+                                for score in entry['entries']]
+        self.end_state = next((entry for entry in self.entries if entry['type'] == 'end'), None)
+        self.clock = clock
+        self.sync_timeout = sync_timeout
+        self.offset = clock.now()   # Tape time 0 = start of the replay
+        self.game_syncs = deque()
+        self.waiting_since = None
+        self.inputs_replayed = 0
+        self.finished = False
+        self.error = None
+
+    # --- SessionTape interface, called by the game manager ---
+    def record(self, name, *args):
+        pass
+
+    def record_button(self, index, pressed_at):
+        pass
+
+    def session_seed(self, settings):
+        return self.sessions.popleft()['seed'] if self.sessions else new_seed()
+
+    def next_settings(self, default):
+        """Settings of the next recorded session (used in place of the settings store)."""
+        if not self.sessions:
+            return default
+        return type(default)(**self.sessions[0]['settings'])
+
+    def sync(self, name, now=None):
+        self.game_syncs.append((name, self.clock.now() if now is None else now))
+
+    def scores_saved(self, entries):
+        pass
+
+    def close(self, final_state):
+        pass
+
+    # --- Playback ---
+    def step(self, game_manager):
+        """Plays every tape entry that is due by now. Returns False once the tape is done."""
+        now = self.clock.now()
+        while self.entries and not self.error:
+            entry = self.entries[0]
+            kind = entry['type']
+            if kind == 'sync':
+                if not self._align(entry, now):
+                    return True
+            elif kind in ('input', 'button'):
+                due = entry['t'] + self.offset
+                if due > now:
+                    return True
+                self.clock.current = max(self.clock.current, due)
+                self._dispatch(game_manager, entry, due)
+            elif kind == 'end' and entry['t'] + self.offset > now:
+                return True
+            self.entries.popleft()
+        self.finished = True
+        return False
+
+    def _align(self, entry, now):
+        """Re-aligns the tape to a sync point of the game. Returns False while still waiting for it."""
+        if not self.game_syncs:
+            self.waiting_since = self.waiting_since or now
+            if now - self.waiting_since > self.sync_timeout:
+                self.error = f"game never reached '{entry['name']}' (tape time {entry['t']:.3f}s)"
+            return False
+        name, reached_at = self.game_syncs.popleft()
+        if name != entry['name']:
+            self.error = f"game reached '{name}' where the tape has '{entry['name']}' (tape time {entry['t']:.3f}s)"
+            return False
+        self.offset = reached_at - entry['t']
+        self.waiting_since = None
+        return True
+
+    def _dispatch(self, game_manager, entry, due):
+        self.inputs_replayed += 1
+        if entry['type'] == 'button':
+            game_manager.on_button_press(entry['index'], pressed_at=due)
+        elif entry['name'] in TAPE_INPUTS:
+            getattr(game_manager, entry['name'])(*entry['args'])
+        else:
+            self.error = f"unknown input '{entry['name']}' on the tape"
+
+    def compare(self, final_state, saved_scores):
+        """Returns the mismatches between the recorded and the replayed outcome."""
+        mismatches = []
+        if self.error:
+            mismatches.append(self.error)
+        if self.end_state is None:
+            mismatches.append("tape has no end record (the stand did not exit cleanly); outcome not checked")
+            return mismatches
+        for key in ('screen', 'score'):
+            if final_state.get(key) != self.end_state.get(key):
+                mismatches.append(f"final {key}: recorded {self.end_state.get(key)!r}, replayed {final_state.get(key)!r}")
+        replayed = [score_key(entry) for entry in saved_scores]
+        if replayed != self.expected_scores:
+            mismatches.append(f"saved scores: recorded {self.expected_scores}, replayed {replayed}")
+        return mismatches
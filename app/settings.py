@@ -0,0 +1,233 @@
+import dataclasses
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+import config
+
+# Settings that decide a score: scores are only comparable if these were equal
+SCORING_SETTINGS = ('agility_max_score', 'agility_score_penalty_per_ms', 'quiz_points_per_correct')
+
+
+def scoring_version(scoring):
+    """Short stable id of a scoring function ({name: value} of SCORING_SETTINGS), stored with every score."""
+    values = {name: float(scoring[name]) for name in SCORING_SETTINGS}
+    return hashlib.sha1(json.dumps(values, sort_keys=True).encode('utf-8')).hexdigest()[:8]
+
+
+@dataclass(frozen=True)
+class GameSettings:
+    """
+    Read-only snapshot of the settings a game session runs with.
+    Defaults come from config.py; presets override some of them.
+    Values are validated on creation, so a snapshot is always usable.
+    """
+    preset: str = 'default'
+    agility_buttons_count: int = config.AGILITY_BUTTONS_COUNT
+    agility_max_score: int = config.AGILITY_MAX_SCORE
+    agility_score_penalty_per_ms: float = config.AGILITY_SCORE_PENALTY_PER_MS
+    agility_min_ring_distance: int = config.AGILITY_MIN_RING_DISTANCE
+    countdown_duration: float = config.COUNTDOWN_DURATION
+    quiz_rounds_count: int = config.QUIZ_ROUNDS_COUNT
+    quiz_points_per_correct: int = config.QUIZ_POINTS_PER_CORRECT
+    quiz_feedback_duration: float = config.QUIZ_FEEDBACK_DURATION
+    screen_transition_duration: float = config.SCREEN_TRANSITION_DURATION
+    leaderboard_timeout: float = config.LEADERBOARD_TIMEOUT
+    versus_time_limit: float = config.VERSUS_TIME_LIMIT
+
+    # Allowed range of every numeric setting (inclusive)
+    RANGES = {
+        'agility_buttons_count': (1, 50),
+        'agility_max_score': (1, 1000000),
+        'agility_score_penalty_per_ms': (0, 100),
+        'agility_min_ring_distance': (1, 6),
+        'countdown_duration': (0.5, 10.0),
+        'quiz_rounds_count': (0, 20),
+        'quiz_points_per_correct': (0, 100000),
+        'quiz_feedback_duration': (0.2, 10.0),
+        'screen_transition_duration': (0.0, 2.0),
+        'leaderboard_timeout': (3.0, 300.0),
+        'versus_time_limit': (5.0, 300.0),
+    }
+
+    def __post_init__(self):
+        for field in dataclasses.fields(self):
+            value = getattr(self, field.name)
+            if field.type is int and not (isinstance(value, int) and not isinstance(value, bool)):
+                raise ValueError(f"Setting '{field.name}' must be an integer, got {value!r}.")
+            if field.type is float and (isinstance(value, bool) or not isinstance(value, (int, float))):
+                raise ValueError(f"Setting '{field.name}' must be a number, got {value!r}.")
+            if field.name in self.RANGES:
+                low, high = self.RANGES[field.name]
+                if not low <= value <= high:
+                    raise ValueError(f"Setting '{field.name}' = {value} is outside {low}..{high}.")
+
+    @classmethod
+    def from_dict(cls, values, preset='default'):
+        """Creates validated settings from a dict of overrides (unknown names are rejected)."""
+        names = {field.name for field in dataclasses.fields(cls)}
+        unknown = set(values) - names
+        if unknown:
+            raise ValueError(f"Unknown settings: {', '.join(sorted(unknown))}.")
+        return cls(**dict(values, preset=preset))
+
+    def session_timings(self):
+        """Timing settings in the form the session analyzer records them."""
+        return {
+            'COUNTDOWN_DURATION': self.countdown_duration,
+            'QUIZ_FEEDBACK_DURATION': self.quiz_feedback_duration,
+            'SCREEN_TRANSITION_DURATION': self.screen_transition_duration,
+            'LEADERBOARD_TIMEOUT': self.leaderboard_timeout,
+            'AGILITY_BUTTONS_COUNT': self.agility_buttons_count,
+            'QUIZ_ROUNDS_COUNT': self.quiz_rounds_count,
+        }
+
+    def scoring(self):
+        """The settings that decide a score."""
+        return {name: getattr(self, name) for name in SCORING_SETTINGS}
+
+    def scoring_version(self):
+        return scoring_version(self.scoring())
+
+
+# Built-in presets (formerly the copy-paste examples in helper/config_examples.py)
+PRESETS = {
+    'default': {},
+    'quick': {
+        'agility_buttons_count': 5,
+        'agility_max_score': 10000,
+        'agility_score_penalty_per_ms': 2,
+        'quiz_rounds_count': 2,
+        'quiz_points_per_correct': 750,
+        'quiz_feedback_duration': 1.5,
+        'leaderboard_timeout': 8.0,
+    },
+    'challenge': {
+        'agility_buttons_count': 15,
+        'agility_max_score': 30000,
+        'agility_score_penalty_per_ms': 0.5,
+        'quiz_rounds_count': 5,
+        'quiz_points_per_correct': 400,
+    },
+    'kids': {
+        'agility_buttons_count': 3,
+        'agility_max_score': 5000,
+        'agility_score_penalty_per_ms': 0.1,
+        'quiz_rounds_count': 2,
+        'quiz_points_per_correct': 1000,
+    },
+    'tournament': {
+        'agility_buttons_count': 12,
+        'agility_max_score': 25000,
+        'agility_score_penalty_per_ms': 1.5,
+        'quiz_rounds_count': 4,
+        'quiz_points_per_correct': 625,
+    },
+}
+
+
+class SettingsStore:
+    """
+    Loads the settings file and hands out read-only snapshots.
+
+    The file (data/settings.json) selects the active preset and may define
+    extra presets or override built-in ones:
+        {"active_preset": "quick", "presets": {"peak": {"quiz_rounds_count": 2}}}
+    A changed file is validated as a whole; if anything is invalid the current
+    settings stay in use. A new snapshot only becomes current when a session
+    starts (begin_session), so a running game never changes its settings.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.presets = {name: dict(values) for name, values in PRESETS.items()}
+        self.current = GameSettings()
+        self.pending = None
+        self._mtime = None
+        self.reload()
+        if self.pending:
+            self.current, self.pending = self.pending, None
+
+    def _file_mtime(self):
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def reload(self):
+        """Reads and validates the settings file. Returns True if new settings are pending."""
+        self._mtime = self._file_mtime()
+        if self._mtime is None:
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            presets = {name: dict(values) for name, values in PRESETS.items()}
+            presets.update({name: dict(values) for name, values in data.get('presets', {}).items()})
+            active = data.get('active_preset', 'default')
+            if active not in presets:
+                raise ValueError(f"Unknown preset '{active}'. Available: {', '.join(sorted(presets))}.")
+            # Validate every preset now, so switching later can never fail
+            snapshots = {name: GameSettings.from_dict(values, preset=name) for name, values in presets.items()}
+        except (OSError, json.JSONDecodeError, ValueError, TypeError, AttributeError) as e:
+            print(f"Error loading settings from {self.path}, keeping preset '{self.current.preset}': {e}")
+            return False
+        self.presets = presets
+        if snapshots[active] == self.current:
+            self.pending = None
+            return False
+        self.pending = snapshots[active]
+        print(f"Settings preset '{active}' loaded; it applies from the next session.")
+        return True
+
+    def reload_if_changed(self):
+        if self._file_mtime() != self._mtime:
+            return self.reload()
+        return False
+
+    def use_preset(self, name):
+        """Selects a preset for the next session."""
+        if name not in self.presets:
+            raise ValueError(f"Unknown preset '{name}'. Available: {', '.join(sorted(self.presets))}.")
+        snapshot = GameSettings.from_dict(self.presets[name], preset=name)
+        self.pending = None if snapshot == self.current else snapshot
+
+    def begin_session(self):
+        """Makes pending settings current (between sessions) and returns the snapshot to play with."""
+        if self.pending:
+            print(f"Switching settings preset '{self.current.preset}' -> '{self.pending.preset}'.")
+            self.current, self.pending = self.pending, None
+        return self.current
+
+
+def save_active_preset(path, name):
+    """Writes the active preset into the settings file (atomically), keeping custom presets."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        data = {}
+    presets = dict(PRESETS, **data.get('presets', {}))
+    if name not in presets:
+        raise ValueError(f"Unknown preset '{name}'. Available: {', '.join(sorted(presets))}.")
+    GameSettings.from_dict(presets[name], preset=name)
+    data['active_preset'] = name
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+if __name__ == '__main__':
+    # Switch the running stand to another preset (applies from its next session):
+    # python -m app.settings quick
+    # Without an argument, lists the presets with their settings.
+    import sys
+    if len(sys.argv) > 1:
+        save_active_preset(config.SETTINGS_FILE, sys.argv[1])
+        print(f"Active preset set to '{sys.argv[1]}' in {config.SETTINGS_FILE}.")
+    else:
+        store = SettingsStore(config.SETTINGS_FILE)
+        for name, values in sorted(store.presets.items()):
+            marker = '*' if name == store.current.preset else ' '
+            print(f"{marker} {name}: {dataclasses.asdict(GameSettings.from_dict(values, preset=name))}")
@@ -0,0 +1,96 @@
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.uix.boxlayout import BoxLayout
+from kivy.properties import StringProperty, NumericProperty, BooleanProperty, ColorProperty
+from app.ui.text_cache import text_cache
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+class CachedTextureMixin:
+    """
+    Label mixin that reuses identical text textures from the shared text cache.
+
+    The cache key is every font property of the label plus its disabled state,
+    so two labels only share a texture when they would render the same pixels.
+    After a texture is cached it is detached from the core label, which would
+    otherwise draw the next text into the same texture object.
+    """
+    def _cache_key(self):
+        return (self.disabled,) + tuple(_freeze(getattr(self, name)) for name in self._font_properties)
+
+    def texture_update(self, *largs):
+        if self.markup or not self.text:
+            return super().texture_update(*largs)
+        key = self._cache_key()
+        texture = text_cache.get(key)
+        if texture is not None:
+            self.texture = texture
+            self.texture_size = list(texture.size)
+            return
+        super().texture_update(*largs)
+        texture = self.texture
+        if texture is not None and texture.width > 1 and texture.height > 1:
+            texture.bind()  # Fill it now, while the core label still holds this text
+            text_cache.put(key, texture)
+            self._label.texture = None
+
+
+class CachedLabel(CachedTextureMixin, Label):
+    pass
+
+
+class CachedButton(CachedTextureMixin, Button):
+    pass
+
+
+class DigitDisplay(BoxLayout):
+    """
+    Large numeric display (chronometer) drawn one character per label.
+    Each character texture ('0'-'9', ':') is rendered once and then comes
+    from the text cache, so a running chronometer renders no text per frame.
+    """
+    text = StringProperty('')
+    font_name = StringProperty('Roboto')
+    font_size = NumericProperty('15sp')
+    bold = BooleanProperty(False)
+    color = ColorProperty((1, 1, 1, 1))
+    digit_width = NumericProperty(0.6)    # Slot width of a digit, in font sizes
+    separator_width = NumericProperty(0.3)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.orientation = 'horizontal'
+        self.bind(size=self._center, font_size=self._rebuild, bold=self._rebuild,
+                  color=self._rebuild, font_name=self._rebuild)
+
+    def _slot_width(self, char):
+        return self.font_size * (self.digit_width if char.isdigit() else self.separator_width)
+
+    def _rebuild(self, *args):
+        self.clear_widgets()
+        self.on_text(self, self.text)
+
+    def on_text(self, instance, text):
+        labels = list(reversed(self.children))
+        if len(labels) != len(text):
+            self.clear_widgets()
+            labels = []
+            for char in text:
+                label = CachedLabel(font_name=self.font_name, font_size=self.font_size, bold=self.bold,
+                                    color=self.color, halign='center', valign='middle', size_hint_x=None)
+                self.add_widget(label)
+                labels.append(label)
+        for label, char in zip(labels, text):
+            label.text = char
+            label.width = self._slot_width(char)
+        self._center()
+
+    def _center(self, *args):
+        content = sum(self._slot_width(char) for char in self.text)
+        self.padding = [max(0, (self.width - content) / 2), 0]
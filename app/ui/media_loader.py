@@ -0,0 +1,117 @@
+import os
+import queue
+import threading
+from collections import OrderedDict
+from kivy.clock import Clock
+from kivy.core.image import ImageLoader
+
+class MediaLoader:
+    """
+    Asynchronous image loader for quiz media, with a bounded LRU texture cache.
+
+    prefetch() queues image files for a worker thread that reads and decodes
+    them; each decoded image is uploaded as a texture on the main thread (one
+    Clock callback per image) and cached, LRU-evicted by estimated RGBA bytes.
+    get() never waits: it returns the texture if it is ready, otherwise None,
+    and calls the optional callback once the texture arrives.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.textures = OrderedDict()   # path -> texture, least recently used first
+        self.resident_bytes = 0
+        self._pending = set()           # Paths queued or being decoded
+        self._failed = set()            # Paths that could not be loaded (not retried)
+        self._callbacks = {}            # path -> [callback(path, texture)]
+        self._queue = queue.Queue()
+        self._thread = None
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.failures = 0
+        self.evictions = 0
+
+    @staticmethod
+    def texture_bytes(texture):
+        return texture.width * texture.height * 4
+
+    def prefetch(self, paths):
+        """Queues image files for background decoding (already cached or queued ones are skipped)."""
+        for path in paths:
+            if path and path not in self.textures and path not in self._pending and path not in self._failed:
+                self._pending.add(path)
+                self._queue.put(path)
+        if self._pending and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='MediaLoader', daemon=True)
+            self._thread.start()
+
+    def get(self, path, callback=None):
+        """Returns the texture of an image if it is loaded. Never blocks."""
+        texture = self.textures.get(path)
+        if texture is not None:
+            self.hits += 1
+            self.textures.move_to_end(path)
+            return texture
+        self.misses += 1
+        if callback is not None:
+            self._callbacks.setdefault(path, []).append(callback)
+        self.prefetch([path])
+        return None
+
+    def _run(self):
+        while True:
+            path = self._queue.get()
+            if path is None:
+                return
+            image = None
+            if not os.path.isfile(path):
+                print(f"Warning: Quiz media {path} not found.")
+            else:
+                try:
+                    image = ImageLoader.load(path, nocache=True)
+                except Exception as e:
+                    print(f"Warning: Could not load quiz media {path}: {e}")
+            # Textures can only be created on the main thread
+            Clock.schedule_once(lambda dt, path=path, image=image: self._upload(path, image), 0)
+
+    def _upload(self, path, image):
+        self._pending.discard(path)
+        callbacks = self._callbacks.pop(path, [])
+        texture = image.texture if image is not None else None
+        if texture is None:
+            self.failures += 1
+            self._failed.add(path)
+            return
+        self.loads += 1
+        self._put(path, texture)
+        for callback in callbacks:
+            callback(path, texture)
+
+    def _put(self, path, texture):
+        size = self.texture_bytes(texture)
+        if size > self.max_bytes:
+            return
+        self.textures[path] = texture
+        self.resident_bytes += size
+        while self.resident_bytes > self.max_bytes:
+            _, evicted = self.textures.popitem(last=False)
+            self.resident_bytes -= self.texture_bytes(evicted)
+            self.evictions += 1
+
+    def stop(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread = None
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.textures),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'loads': self.loads,
+            'failures': self.failures,
+            'evictions': self.evictions,
+            'resident_kb': round(self.resident_bytes / 1024),
+            'budget_kb': round(self.max_bytes / 1024),
+        }
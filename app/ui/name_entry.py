@@ -0,0 +1,47 @@
+from kivy.uix.boxlayout import BoxLayout
+from kivy.properties import StringProperty, NumericProperty, ListProperty, ObjectProperty
+
+class NameEntry(BoxLayout):
+    """
+    Name entry of the score screen: the typed name, driven by the virtual
+    keyboard, plus one-tap completions from the names entered today.
+
+    The text is normalized (uppercase, max_length) and the suggestions are
+    refreshed in on_text, the component's only text handler, so nothing
+    needs to be bound again for each game.
+    """
+    text = StringProperty('')
+    max_length = NumericProperty(30)
+    suggestions = ListProperty(['', '', ''])
+    trie = ObjectProperty(None, allownone=True)   # NameTrie with today's names
+
+    def on_text(self, instance, text):
+        normalized = text.upper()[:self.max_length]
+        if normalized != text:
+            self.text = normalized  # Fires on_text again with the clean text
+            return
+        self.refresh_suggestions()
+
+    def refresh_suggestions(self):
+        found = self.trie.suggestions(self.text, limit=len(self.suggestions)) if self.trie else []
+        self.suggestions = found + [''] * (len(self.suggestions) - len(found))
+
+    def press_key(self, key_value):
+        """Applies one virtual keyboard key (character, 'SPACE' or 'BACKSPACE'). Returns False if ignored."""
+        if key_value == 'BACKSPACE':
+            self.text = self.text[:-1]
+        elif len(self.text) >= self.max_length:
+            return False
+        elif key_value == 'SPACE':
+            self.text += ' '
+        else:
+            self.text += key_value
+        return True
+
+    def apply_suggestion(self, name):
+        if name:
+            self.text = name
+
+    def clear(self):
+        self.text = ''
+        self.refresh_suggestions()
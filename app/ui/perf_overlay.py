@@ -0,0 +1,62 @@
+from kivy.uix.label import Label
+from kivy.core.window import Window
+from kivy.clock import Clock
+
+class PerfOverlay(Label):
+    """
+    On-screen performance overlay, toggled with a hotkey.
+    While hidden it is detached from the window and its PerfMonitor is stopped.
+    """
+    def __init__(self, monitor, refresh_interval=0.5, **kwargs):
+        super().__init__(**kwargs)
+        self.monitor = monitor
+        self.refresh_interval = refresh_interval
+        self.visible = False
+        self._refresh_event = None
+        self.bind(size=self._stick_to_top)
+
+    def toggle(self):
+        if self.visible:
+            self.hide()
+        else:
+            self.show()
+
+    def show(self):
+        if self.visible:
+            return
+        self.visible = True
+        self.monitor.start()
+        Window.add_widget(self)
+        self._refresh_event = Clock.schedule_interval(self.refresh, self.refresh_interval)
+        self.refresh(0)
+
+    def hide(self):
+        if not self.visible:
+            return
+        self.visible = False
+        if self._refresh_event:
+            self._refresh_event.cancel()
+            self._refresh_event = None
+        Window.remove_widget(self)
+        self.monitor.stop()
+
+    def refresh(self, dt):
+        """Updates the overlay text from a fresh monitor snapshot."""
+        stats = self.monitor.snapshot()
+        widgets = '  '.join(f'{name}:{count}' for name, count in stats['widgets'].items())
+        gen0, gen1, gen2 = stats['gc_counts']
+        text = stats['text_cache']
+        self.text = '\n'.join([
+            f"FPS {stats['fps']:.1f}   frame p50 {stats['frame_p50_ms']:.1f} ms  "
+            f"p95 {stats['frame_p95_ms']:.1f} ms  max {stats['frame_max_ms']:.1f} ms",
+            f"Clock events {stats['clock_events']}   RSS {stats['rss_mb']:.1f} MB   "
+            f"GPIO {stats['gpio_rate']:.1f} presses/s",
+            f"GC {stats['gc_collections']} collections  last {stats['gc_pause_last_ms']:.2f} ms  "
+            f"max {stats['gc_pause_max_ms']:.2f} ms  gen {gen0}/{gen1}/{gen2}",
+            f"Text cache {text['entries']} textures  {text['resident_kb']}/{text['budget_kb']} KB  "
+            f"hit rate {text['hit_rate'] * 100:.0f}%  evictions {text['evictions']}",
+            f"Widgets  {widgets}",
+        ])
+
+    def _stick_to_top(self, *args):
+        self.pos = (0, Window.height - self.height)
@@ -0,0 +1,91 @@
+from kivy.clock import Clock
+from kivy.core.text import Label as CoreLabel
+
+class TexturePrefetcher:
+    """
+    Renders the text textures of upcoming label texts ahead of time.
+
+    prefetch() renders one (label, text) pair per frame with the label's
+    current font settings, or at the text_size the label will have when the
+    text is shown. apply() then sets the text and, if the label's settings
+    still match what was rendered, swaps in the ready texture instead of
+    rendering it in that frame. On any mismatch (or markup labels) it falls
+    back to a normal text assignment.
+    """
+    def __init__(self):
+        self._queue = []
+        self._ready = {}       # label -> (text, options, core label)
+        self._event = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _options(widget, text, disabled, text_size=None):
+        """Core label options the widget would render text with (copied, not live lists)."""
+        options = {}
+        for name in widget._font_properties:
+            value = getattr(widget, name)
+            if isinstance(value, (list, tuple)):
+                value = list(value)
+            elif isinstance(value, dict):
+                value = dict(value)
+            options[name] = value
+        options['text'] = text
+        if text_size is not None:
+            options['text_size'] = list(text_size)
+        options['usersize'] = list(options['text_size'])
+        if disabled:
+            options['color'] = list(widget.disabled_color)
+            options['outline_color'] = list(widget.disabled_outline_color)
+        return options
+
+    def prefetch(self, items):
+        """Queues (label, text, disabled[, text_size]) items to render over the next frames."""
+        self.clear()
+        self._queue = [item for item in items if item[1].strip() and not item[0].markup]
+        if self._queue:
+            self._event = Clock.schedule_interval(self._render_next, 0)
+
+    def _render_next(self, dt):
+        if not self._queue:
+            self._event = None
+            return False
+        widget, text, disabled, *text_size = self._queue.pop(0)
+        options = self._options(widget, text, disabled, *text_size)
+        core = CoreLabel(**options)
+        core.refresh()
+        if core.texture is not None:
+            self._ready[widget] = (text, options, core)
+
+    def apply(self, widget, text):
+        """Sets a label's text, using the prefetched texture when it is still valid."""
+        entry = self._ready.pop(widget, None)
+        if entry is None or entry[0] != text or not self._same(entry[1], self._options(widget, text, widget.disabled)):
+            self.misses += 1
+            widget.text = text
+            return False
+        core = entry[2]
+        widget.text = text
+        widget._trigger_texture.cancel()  # Nothing left to render
+        widget._label = core
+        widget.texture = core.texture
+        widget.texture_size = list(core.texture.size)
+        widget.is_shortened = core.is_shortened
+        self.hits += 1
+        return True
+
+    @staticmethod
+    def _same(rendered, current):
+        """Compares core label options; a text_size within half a pixel wraps the same."""
+        size, current_size = rendered['usersize'], current['usersize']
+        if any((a is None) != (b is None) or (a is not None and abs(a - b) > 0.5)
+               for a, b in zip(size, current_size)):
+            return False
+        return dict(rendered, text_size=None, usersize=None) == dict(current, text_size=None, usersize=None)
+
+    def clear(self):
+        if self._event:
+            self._event.cancel()
+            self._event = None
+        self._queue = []
+        self._ready = {}
@@ -0,0 +1,156 @@
+import time
+import tracemalloc
+from collections import OrderedDict
+from kivy.clock import Clock
+from kivy.uix.screenmanager import ScreenManager
+
+class LazyScreenManager(ScreenManager):
+    """
+    ScreenManager whose screens are built on first use.
+
+    register() takes a screen class (or factory) per name instead of a
+    screen. The screen is built the first time get_screen() asks for it,
+    which includes switching to it with `current`. prepare() builds screens
+    ahead of use, one per frame. Built screens form an LRU cache bounded by
+    a widget-count budget. release_cold() drops every unpinned screen that
+    is not on display; it is meant for when the stand is idle. A dropped
+    screen is built again on its next use.
+
+    The first build of each screen is traced with tracemalloc to measure the
+    Python memory the screen retains, which also makes that build slower.
+    Build times, widget counts and retained memory are kept per screen.
+    """
+    __events__ = ('on_screen_built', 'on_screen_released')
+
+    def __init__(self, widget_budget=0, pinned=(), **kwargs):
+        super().__init__(**kwargs)
+        self.widget_budget = widget_budget   # 0 = no limit
+        self.pinned = set(pinned)            # Never released
+        self.factories = {}
+        self.built = OrderedDict()           # name -> screen, least recently used first
+        self.records = {}                    # name -> build statistics
+        self.releases = 0
+        self._prepare_queue = []
+        self._prepare_event = None
+
+    def register(self, name, factory):
+        """Registers a screen to be built on first use: factory(name=name) returns the screen."""
+        self.factories[name] = factory
+        self.records[name] = {'builds': 0, 'build_ms': 0.0, 'widgets': 0, 'retained_kb': None}
+
+    def is_built(self, name):
+        return name in self.built
+
+    def has_screen(self, name):
+        return name in self.factories or super().has_screen(name)
+
+    def get_screen(self, name):
+        screen = self.built.get(name)
+        if screen is not None:
+            self.built.move_to_end(name)
+            return screen
+        if name in self.factories:
+            return self._build(name)
+        return super().get_screen(name)
+
+    def _build(self, name):
+        record = self.records[name]
+        trace = record['retained_kb'] is None and not tracemalloc.is_tracing()
+        if trace:
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        screen = self.factories[name](name=name)
+        record['build_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        if trace:
+            record['retained_kb'] = round((tracemalloc.get_traced_memory()[0] - before) / 1024)
+            tracemalloc.stop()
+        record['builds'] += 1
+        record['widgets'] = self.count_widgets(screen)
+        self.built[name] = screen
+        self.add_widget(screen)
+        print(f"DEBUG: Built screen '{name}' in {record['build_ms']:.1f} ms ({record['widgets']} widgets)")
+        self.dispatch('on_screen_built', screen)
+        self._enforce_budget(keep=name)
+        return screen
+
+    @staticmethod
+    def count_widgets(screen):
+        return sum(1 for _ in screen.walk(restrict=True))
+
+    def prepare(self, names):
+        """Builds the given screens ahead of use, one per frame."""
+        self._prepare_queue = [name for name in names if name not in self.built]
+        if self._prepare_queue and not self._prepare_event:
+            self._prepare_event = Clock.schedule_interval(self._prepare_next, 0)
+
+    def _prepare_next(self, dt):
+        while self._prepare_queue:
+            name = self._prepare_queue.pop(0)
+            if name not in self.built:
+                self.get_screen(name)
+                return
+        self._prepare_event = None
+        return False
+
+    def _releasable(self, name):
+        """Whether a screen may be dropped now (not pinned, not on display, not wanted soon)."""
+        screen = self.built[name]
+        if name in self.pinned or name in self._prepare_queue or screen is self.current_screen:
+            return False
+        if self.transition.is_active and screen in (self.transition.screen_in, self.transition.screen_out):
+            return False
+        return True
+
+    def _enforce_budget(self, keep=None):
+        """Drops least recently used screens while the built screens hold more widgets than the budget."""
+        if not self.widget_budget:
+            return
+        counts = {name: self.count_widgets(screen) for name, screen in self.built.items()}
+        total = sum(counts.values())
+        for name in list(self.built):
+            if total <= self.widget_budget:
+                break
+            if name != keep and self._releasable(name):
+                self.release(name)
+                total -= counts[name]
+
+    def release(self, name):
+        """Drops a built screen (it is built again on its next use)."""
+        screen = self.built.pop(name, None)
+        if screen is None:
+            return
+        self.remove_widget(screen)
+        # A finished transition still holds its two screens (and does not accept None)
+        if self.transition.screen_in is screen:
+            self.transition.screen_in = self.current_screen
+        if self.transition.screen_out is screen:
+            self.transition.screen_out = self.current_screen
+        release_resources = getattr(screen, 'release_resources', None)
+        if release_resources:
+            release_resources()
+        self.releases += 1
+        print(f"DEBUG: Released screen '{name}'")
+        self.dispatch('on_screen_released', name)
+
+    def release_cold(self):
+        """Drops every screen that is not pinned and not on display. Returns the names released."""
+        released = [name for name in list(self.built) if self._releasable(name)]
+        for name in released:
+            self.release(name)
+        return released
+
+    def on_screen_built(self, screen):
+        pass
+
+    def on_screen_released(self, name):
+        pass
+
+    def stats(self):
+        return {
+            'built': list(self.built),
+            'widgets': sum(self.count_widgets(screen) for screen in self.built.values()),
+            'budget': self.widget_budget,
+            'releases': self.releases,
+            'screens': self.records,
+        }
@@ -0,0 +1,133 @@
+import time
+from collections import deque
+from kivy.clock import Clock
+from kivy.uix.label import Label
+from kivy.uix.layout import Layout
+
+class ScreenWarmer:
+    """
+    Keeps screen changes off the transition's frames.
+
+    warm_all() lays out every screen at the window size, renders its label
+    textures and draws it once off-screen so its textures are on the GPU,
+    one screen per frame while the stand is idle after startup.
+    before_transition() finishes the pending layout and text rendering of the
+    next screen (the content GameManager just put on it) before the fade
+    starts, instead of inside its first frames.
+    The frame times of every transition are measured, also when warming is disabled.
+    """
+    def __init__(self, screen_manager, enabled=True, history=50):
+        self.sm = screen_manager
+        self.enabled = enabled
+        self.warmed = set()
+        self.transitions = deque(maxlen=history)
+        self._warm_queue = []
+        self._warm_event = None
+        self._frame_event = None
+        self._current = None
+        self.sm.transition.bind(on_complete=self._on_transition_complete)
+
+    def warm_all(self):
+        """Warms every screen that is not warm yet, one per frame."""
+        if not self.enabled:
+            return
+        self._warm_queue = [screen for screen in self.sm.screens if screen.name not in self.warmed]
+        if self._warm_queue and not self._warm_event:
+            self._warm_event = Clock.schedule_interval(self._warm_next, 0)
+
+    def _warm_next(self, dt):
+        if not self._warm_queue:
+            self._warm_event = None
+            return False
+        screen = self._warm_queue.pop(0)
+        started = time.perf_counter()
+        self.prepare(screen, force=True)
+        self._upload(screen)
+        self.warmed.add(screen.name)
+        print(f"DEBUG: Warmed screen '{screen.name}' in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    def forget(self, screen_name):
+        """Called when a screen is released: a rebuilt screen has to be warmed again."""
+        self.warmed.discard(screen_name)
+
+    def prepare(self, screen, force=False):
+        """
+        Runs the screen's pending layouts and label renders now.
+        With force, every layout and label is processed (first warm-up at the window size).
+        """
+        if screen.size != self.sm.size:
+            screen.size = self.sm.size
+            screen.pos = self.sm.pos
+            force = True
+        for widget in screen.walk(restrict=True):
+            if isinstance(widget, Layout):
+                self._run_trigger(widget, '_trigger_layout', widget.do_layout, force)
+            if isinstance(widget, Label):
+                self._run_trigger(widget, '_trigger_texture', widget.texture_update, force)
+
+    @staticmethod
+    def _run_trigger(widget, trigger_name, update, force):
+        """Runs a widget's pending (or forced) update now and cancels the scheduled one."""
+        trigger = getattr(widget, trigger_name, None)
+        if trigger is None or force or trigger.is_triggered:
+            if trigger is not None:
+                trigger.cancel()
+            update()
+
+    def _upload(self, screen):
+        """Draws the screen once into an offscreen buffer so its textures get uploaded."""
+        if screen is self.sm.current_screen:
+            return
+        try:
+            screen.export_as_image()
+        except Exception as e:
+            print(f"Warning: Could not pre-render screen '{screen.name}': {e}")
+
+    def before_transition(self, screen_name):
+        """Prepares the next screen and starts measuring the transition frames."""
+        if screen_name == self.sm.current:
+            return
+        started = time.perf_counter()
+        if self.enabled:
+            self.prepare(self.sm.get_screen(screen_name))
+        if self._frame_event:
+            self._frame_event.cancel()
+        self._current = {
+            'to': screen_name,
+            'prepare_ms': (time.perf_counter() - started) * 1000,
+            'frames': [],
+            'started': time.perf_counter(),
+        }
+        self._frame_event = Clock.schedule_interval(self._on_frame, 0)
+
+    def _on_frame(self, dt):
+        if self._current is not None:
+            self._current['frames'].append(dt)
+
+    def _on_transition_complete(self, *args):
+        if self._frame_event:
+            self._frame_event.cancel()
+            self._frame_event = None
+        record, self._current = self._current, None
+        if record is None:
+            return
+        frames = record.pop('frames')
+        record['duration_ms'] = (time.perf_counter() - record.pop('started')) * 1000
+        record['frames'] = len(frames)
+        record['max_frame_ms'] = max(frames) * 1000 if frames else 0.0
+        self.transitions.append(record)
+
+    def stats(self):
+        """Returns frame statistics of the recent transitions."""
+        if not self.transitions:
+            return {'transitions': 0}
+        records = list(self.transitions)
+        worst = max(records, key=lambda r: r['max_frame_ms'])
+        return {
+            'transitions': len(records),
+            'warmed_screens': len(self.warmed),
+            'prepare_ms_mean': round(sum(r['prepare_ms'] for r in records) / len(records), 2),
+            'frames_mean': round(sum(r['frames'] for r in records) / len(records), 1),
+            'max_frame_ms': round(worst['max_frame_ms'], 2),
+            'worst_transition_to': worst['to'],
+        }
@@ -1,8 +1,14 @@
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.label import Label
 from kivy.uix.button import Button
-from kivy.properties import StringProperty, ColorProperty
+from kivy.properties import StringProperty, ColorProperty, BooleanProperty
+from app.ui.prerender import TexturePrefetcher
+from app.ui.media_loader import MediaLoader
+from app.ui.cached_label import CachedLabel
+# Widget classes used only in screens.kv: importing them registers them with the kv Factory
+from app.ui.name_entry import NameEntry  # noqa: F401
+from app.ui.cached_label import CachedButton, DigitDisplay  # noqa: F401
+from config import QUIZ_MEDIA_CACHE_MB
 
 # Create a custom widget for a single leaderboard entry
 class LeaderboardEntry(BoxLayout):
@@ -27,6 +33,9 @@ class InstructionsScreen(Screen):
 class AgilityGameScreen(Screen):
     pass
 
+class VersusGameScreen(Screen):
+    pass
+
 # Função auxiliar para identificar botões corretamente
 def get_button_by_id(screen, button_widget):
     """Identifica qual botão foi clicado baseado no widget"""
@@ -59,12 +68,67 @@ def get_button_by_position(screen, button_widget):
             return screen.ids.option_d  # Inferior direito
 
 class QuizGameScreen(Screen):
+    # The image column is shown for questions with an image, whether or not it has loaded yet
+    has_media = BooleanProperty(False)
+    MEDIA_WIDTH_HINT = 0.4   # size_hint_x of the image column (the question text has 1)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # Textures of the next question are rendered during the feedback window
+        self.prefetcher = TexturePrefetcher()
+        # Question images are decoded in the background when the session's questions are picked
+        self.media = MediaLoader(int(QUIZ_MEDIA_CACHE_MB * 1024 * 1024))
+        self.current_media = None
+
+    def release_resources(self):
+        """Called when the screen is released from the screen cache: stops the media loader thread."""
+        self.media.stop()
+
+    def prefetch_media(self, questions):
+        """Starts loading the images of all the session's questions."""
+        self.media.prefetch([question.get('image') for question in questions])
+
+    def show_media(self, path, texture=None):
+        """Shows a question image, or hides the image area (path None or image not loaded yet)."""
+        if path != self.current_media:
+            return  # Loaded too late: another question is on screen
+        self.ids.question_image.texture = texture
+
+    def question_text_size(self, has_media):
+        """text_size of the question label once the image column is shown (or hidden)."""
+        # The label and the image column share the row's stretchable width
+        # (a hidden column has no size hint, but keeps its last width)
+        width = self.ids.question_label.width
+        if self.has_media:
+            width += self.ids.question_image.width
+        if has_media:
+            width /= 1 + self.MEDIA_WIDTH_HINT
+        return [width, None]
+
+    def prefetch_question(self, question_data):
+        """Renders the question and option textures ahead of display_question, one per frame."""
+        answer_buttons = [self.ids.option_a, self.ids.option_b, self.ids.option_c, self.ids.option_d]
+        # Rendered at the width the label will have for this question, not the current one
+        text_size = self.question_text_size(bool(question_data.get('image')))
+        items = [(self.ids.question_label, question_data['question'], False, text_size)]
+        items += [(button, option, False) for button, option in zip(answer_buttons, question_data['options'])]
+        self.prefetcher.prefetch(items)
+
     def display_question(self, question_data):
         """
         Populates the screen widgets for a new round.
         Buttons are set to the new default light gray color.
+        Prefetched textures are swapped in instead of being rendered now.
         """
-        self.ids.question_label.text = question_data['question']
+        # The image column follows the question, so the label is laid out at its final
+        # width now and an image that arrives later does not reflow it
+        self.current_media = question_data.get('image')
+        self.has_media = bool(self.current_media)
+        self.ids.question_box.do_layout()
+        self.prefetcher.apply(self.ids.question_label, question_data['question'])
+        # Only a ready texture is shown; an image still loading appears when it arrives
+        self.show_media(self.current_media,
+                        self.media.get(self.current_media, self.show_media) if self.current_media else None)
         
         options = question_data['options']
         answer_buttons = [self.ids.option_a, self.ids.option_b, self.ids.option_c, self.ids.option_d]
@@ -76,8 +140,8 @@ class QuizGameScreen(Screen):
         print(f"Resposta correta: {question_data['correct_answer']}")
         
         for i, button in enumerate(answer_buttons):
-            button.text = options[i]
             button.disabled = False
+            self.prefetcher.apply(button, options[i])
             # --- NEW DEFAULT STATE: Light Gray ---
             # This color is defined in screens.kv as color_light_gray
             button.button_bg_color = (216/255, 206/255, 205/255, 1)
@@ -123,31 +187,44 @@ class ScoreScreen(Screen):
     pass
 
 class LeaderboardScreen(Screen):
-    def update_leaderboard(self, scores, player_name=None):
-        """Clears and rebuilds the leaderboard display with improved visual design."""
+    # Subtitle shown for each leaderboard view
+    VIEW_TITLES = {
+        'hour': 'Esta Hora',
+        'day': 'Hoje',
+        'week': 'Esta Semana',
+        'event': 'Evento',
+        'all': 'Geral',
+    }
+
+    def update_leaderboard(self, scores, player_entries=(), view='day', mode='single'):
+        """
+        Clears and rebuilds the leaderboard display with improved visual design.
+        The scores come already ranked (best first) from the leaderboard index;
+        the rows of player_entries (the scores just submitted) are highlighted.
+        """
+        self.ids.view_label.text = self.VIEW_TITLES.get(view, '')
+        if mode == 'versus':
+            self.ids.view_label.text += ' - Modo 2 Jogadores'
         grid = self.ids.leaderboard_grid
         grid.clear_widgets()
-
-        # Sort scores descending
-        sorted_scores = sorted(scores, key=lambda x: x['score'], reverse=True)
         
         # Add header with professional styling - ALL IN PORTUGUESE
         header_color = (0/255, 64/255, 119/255, 1)  # color_primary_blue
-        grid.add_widget(Label(
+        grid.add_widget(CachedLabel(
             text='POSIÇÃO',
             bold=True,
             font_size='32sp',
             color=header_color,
             font_name='Roboto'
         ))
-        grid.add_widget(Label(
+        grid.add_widget(CachedLabel(
             text='NOME',
             bold=True,
             font_size='32sp',
             color=header_color,
             font_name='Roboto'
         ))
-        grid.add_widget(Label(
+        grid.add_widget(CachedLabel(
             text='PONTUAÇÃO',
             bold=True,
             font_size='32sp',
@@ -156,8 +233,8 @@ class LeaderboardScreen(Screen):
         ))
 
         # Add top scores with alternating colors for better readability
-        for i, entry in enumerate(sorted_scores[:15]):
-            is_player = player_name and entry.get('name') == player_name
+        for i, entry in enumerate(scores):
+            is_player = any(entry is submitted for submitted in player_entries)
             
             # Color scheme: player highlighted in green, others in blue tones
             if is_player:
@@ -171,7 +248,7 @@ class LeaderboardScreen(Screen):
             
             # Rank label
             rank_text = f"#{i + 1}" if i < 3 else str(i + 1)
-            rank_label = Label(
+            rank_label = CachedLabel(
                 text=rank_text,
                 color=text_color,
                 bold=font_weight,
@@ -180,7 +257,7 @@ class LeaderboardScreen(Screen):
             )
             
             # Name label
-            name_label = Label(
+            name_label = CachedLabel(
                 text=entry.get('name', 'N/A'),
                 color=text_color,
                 bold=font_weight,
@@ -189,7 +266,7 @@ class LeaderboardScreen(Screen):
             )
             
             # Score label
-            score_label = Label(
+            score_label = CachedLabel(
                 text=str(entry.get('score', 0)),
                 color=text_color,
                 bold=font_weight,
@@ -0,0 +1,63 @@
+from collections import OrderedDict
+from config import TEXT_CACHE_BUDGET_MB
+
+class TextTextureCache:
+    """
+    Bounded LRU cache of rendered text textures, shared by every CachedLabel.
+    Keys describe everything that affects the pixels (text, font, size,
+    color, alignment, disabled state, ...); memory is estimated as RGBA bytes.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.textures = OrderedDict()   # key -> texture, least recently used first
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def texture_bytes(texture):
+        return texture.width * texture.height * 4
+
+    def get(self, key):
+        texture = self.textures.get(key)
+        if texture is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.textures.move_to_end(key)
+        return texture
+
+    def put(self, key, texture):
+        size = self.texture_bytes(texture)
+        if size > self.max_bytes:
+            return
+        previous = self.textures.pop(key, None)
+        if previous is not None:
+            self.resident_bytes -= self.texture_bytes(previous)
+        self.textures[key] = texture
+        self.resident_bytes += size
+        while self.resident_bytes > self.max_bytes:
+            _, evicted = self.textures.popitem(last=False)
+            self.resident_bytes -= self.texture_bytes(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        self.textures.clear()
+        self.resident_bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.textures),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions,
+            'resident_kb': round(self.resident_bytes / 1024),
+            'budget_kb': round(self.max_bytes / 1024),
+        }
+
+
+# Shared by all screens
+text_cache = TextTextureCache(int(TEXT_CACHE_BUDGET_MB * 1024 * 1024))
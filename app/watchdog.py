@@ -0,0 +1,147 @@
+import datetime
+import os
+import socket
+import sys
+import threading
+import time
+import traceback
+
+def notify(message, socket_path=None):
+    """
+    Sends a state message to systemd (sd_notify protocol) over NOTIFY_SOCKET.
+    Returns False when not running under systemd or the socket is unreachable.
+    """
+    socket_path = socket_path or os.environ.get('NOTIFY_SOCKET')
+    if not socket_path:
+        return False
+    if socket_path.startswith('@'):
+        socket_path = '\0' + socket_path[1:]  # Abstract namespace socket
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.connect(socket_path)
+            sock.sendall(message.encode('utf-8'))
+        return True
+    except OSError:
+        return False
+
+
+def dump_thread_stacks():
+    """Returns the current stack of every thread as text."""
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    lines = []
+    for thread_id, frame in sys._current_frames().items():
+        lines.append(f"--- Thread {names.get(thread_id, '?')} ({thread_id}) ---")
+        lines.extend(line.rstrip('\n') for line in traceback.format_stack(frame))
+    return '\n'.join(lines)
+
+
+class MainLoopWatchdog:
+    """
+    Watches the Kivy main loop from a separate thread.
+
+    beat() is scheduled on the main loop. While beats keep arriving the
+    watchdog pings systemd (WATCHDOG=1). When the main loop stops beating for
+    stall_threshold seconds all thread stacks are written to the stall log;
+    after restart_after seconds it escalates (by default the process exits
+    with an error so systemd restarts it). Pings stop during a stall, so
+    systemd's WatchdogSec also restarts a process that cannot escalate itself.
+    The duration of every stall that recovers is recorded.
+    """
+    def __init__(self, stall_threshold=2.0, restart_after=15.0, interval=None,
+                 stall_log="data/stalls.log", notify_socket=None, on_escalate=None):
+        self.stall_threshold = stall_threshold
+        self.restart_after = restart_after
+        self.notify_socket = notify_socket
+        self.stall_log = stall_log
+        self.on_escalate = on_escalate or self._exit_for_restart
+        if interval is None:
+            # Ping at half the systemd watchdog period, and often enough to notice stalls
+            watchdog_usec = int(os.environ.get('WATCHDOG_USEC', 0) or 0)
+            interval = min(stall_threshold / 2, watchdog_usec / 2e6) if watchdog_usec else stall_threshold / 2
+        self.interval = interval
+
+        self._last_beat = time.monotonic()
+        self._stall_started = None
+        self._dumped = False
+        self._escalated = False
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.stalls = []          # Durations (s) of recovered stalls
+        self.pings = 0
+
+    def beat(self, dt=None):
+        """Main-loop heartbeat (schedule on the Kivy Clock)."""
+        self._last_beat = time.monotonic()
+
+    def start(self):
+        if self._thread:
+            return
+        self._last_beat = time.monotonic()
+        notify('READY=1', self.notify_socket)
+        self._thread = threading.Thread(target=self._run, name='MainLoopWatchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self._thread:
+            return
+        self._stop.set()
+        self._thread.join(timeout=self.interval * 2)
+        self._thread = None
+        notify('STOPPING=1', self.notify_socket)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def check(self, now=None):
+        """One watchdog step: ping when healthy, dump and escalate when stalled."""
+        now = time.monotonic() if now is None else now
+        age = now - self._last_beat
+
+        if age < self.stall_threshold:
+            if self._stall_started is not None:
+                duration = self._last_beat - self._stall_started
+                self.stalls.append(duration)
+                print(f"Watchdog: main loop recovered after a {duration:.2f}s stall.")
+                notify('STATUS=Running', self.notify_socket)
+                self._stall_started = None
+                self._dumped = False
+            if notify('WATCHDOG=1', self.notify_socket):
+                self.pings += 1
+            return
+
+        if self._stall_started is None:
+            self._stall_started = self._last_beat
+        if not self._dumped:
+            self._dumped = True
+            notify(f'STATUS=Main loop stalled for {age:.1f}s', self.notify_socket)
+            self._write_stall_dump(age)
+        if age >= self.restart_after and not self._escalated:
+            self._escalated = True
+            print(f"Watchdog: main loop stalled for {age:.1f}s, escalating to a restart.")
+            self.on_escalate()
+
+    def _write_stall_dump(self, age):
+        report = (f"=== {datetime.datetime.now().isoformat()} main loop stalled for {age:.2f}s ===\n"
+                  f"{dump_thread_stacks()}\n")
+        print(report, file=sys.stderr)
+        try:
+            os.makedirs(os.path.dirname(self.stall_log) or '.', exist_ok=True)
+            with open(self.stall_log, 'a', encoding='utf-8') as f:
+                f.write(report)
+        except OSError as e:
+            print(f"Watchdog: could not write stall log {self.stall_log}: {e}", file=sys.stderr)
+
+    def _exit_for_restart(self):
+        notify('STATUS=Restarting after main loop stall', self.notify_socket)
+        sys.stderr.flush()
+        os._exit(1)  # Restart=on-failure brings the stand back
+
+    def stats(self):
+        return {
+            'stalls': len(self.stalls),
+            'longest_stall_s': round(max(self.stalls), 2) if self.stalls else 0.0,
+            'total_stall_s': round(sum(self.stalls), 2),
+            'pings': self.pings,
+        }
@@ -1,4 +1,5 @@
 # Central Configuration File
+import os
 
 # 1. GPIO Pin Mapping (BCM numbering)
 # These must be filled with the actual BCM pin numbers you will use.
@@ -13,6 +14,7 @@ RELAY_PINS  = [7, 8, 21, 25, 24, 23, 20, 16, 12, 18, 15, 14]
 AGILITY_BUTTONS_COUNT = 8          # Number of buttons to press in agility game
 AGILITY_MAX_SCORE = 20000          # Maximum score for agility (points deducted by time)
 AGILITY_SCORE_PENALTY_PER_MS = 1   # Points deducted per millisecond
+AGILITY_MIN_RING_DISTANCE = 3      # Min positions between consecutive targets on the button ring
 
 # Quiz Game Settings
 QUIZ_ROUNDS_COUNT = 4              # Number of quiz questions per game
@@ -21,8 +23,138 @@ QUIZ_POINTS_PER_CORRECT = 500      # Points awarded for each correct answer
 # 3. Game Timings (in seconds)
 INSTRUCTIONS_DURATION = 5.0
 COUNTDOWN_SECONDS = 3.0
+COUNTDOWN_DURATION = 2.3           # From the '3' of the 3-2-1 countdown to the start of the agility round
 QUIZ_TIME_LIMIT = 15.0
+QUIZ_FEEDBACK_DURATION = 2.5       # Time to read the answer feedback before the next question
+SCREEN_TRANSITION_DURATION = 0.4   # Fade between screens
+LEADERBOARD_TIMEOUT = 15.0         # Leaderboard shown this long before returning to the welcome screen
+SCREEN_WARMING_ENABLED = True      # Pre-render screens at startup and prepare each screen before its transition
 
 # 4. File Paths
 LEADERBOARD_FILE = "data/leaderboard.json"
 QUESTIONS_FILE = "data/questions.json"
+
+
+# 5. GPIO Backend
+# 'gpiozero' drives the real pins on the Raspberry Pi.
+# 'mock' runs the game on any machine with in-memory buttons and LEDs.
+# 'replay' plays the button trace in GPIO_TRACE_FILE into the game.
+# The STAND_GPIO_BACKEND environment variable overrides this setting.
+GPIO_BACKEND = os.environ.get("STAND_GPIO_BACKEND", "gpiozero")
+GPIO_TRACE_FILE = "data/button_trace.json"
+GPIO_REPLAY_SPEED = 1.0            # 1.0 = real time, 10.0 = ten times faster
+GPIO_RECORD_TRACE = False          # Record real presses to GPIO_TRACE_FILE on exit
+
+# 6. GPIO Event Queue
+# Button presses are queued by the GPIO thread and handled once per frame
+# on the Kivy main thread.
+HW_EVENT_QUEUE_SIZE = 64           # Presses beyond this are dropped (and counted)
+HW_EVENT_DRAIN_BUDGET_MS = 4.0     # Max handler time per frame before deferring to the next frame
+HW_EVENT_LATENCY_BUDGET_MS = 50.0  # Press-to-handling time counted as a late event
+
+# 7. Leaderboard Views
+EVENT_NAME = "default"             # Scores are tagged with this name for the "event" view
+LEADERBOARD_TOP_N = 15             # Entries shown per view
+# Views shown in rotation on the leaderboard screen: 'hour', 'day', 'week', 'event', 'all'
+LEADERBOARD_VIEWS = ['day', 'hour', 'week', 'event', 'all']
+LEADERBOARD_VIEW_ROTATION_SECONDS = 5.0
+LEADERBOARD_BEST_PER_PLAYER = True # Each view lists a player (name) once, with their best score
+
+# 8. Leaderboard Archive
+# data/leaderboard.json only holds today's scores. Finished days are moved
+# into one immutable file per day and gzipped after a few days.
+LEADERBOARD_ARCHIVE_DIR = "data/archive"
+LEADERBOARD_COMPRESS_AFTER_DAYS = 7
+
+# 9. Audio
+AUDIO_MEMORY_BUDGET_MB = 8         # Decoded sounds kept in memory (pinned sounds always stay)
+AUDIO_PINNED_SOUNDS = ['start', 'correct', 'wrong']  # Latency-critical cues (countdown, answers), never evicted
+AUDIO_SOUND_PACK = None            # Folder under assets/sounds/packs/ that overrides the default sounds
+
+# 10. Latency-Critical Agility Rounds
+# During an agility round the cyclic GC is frozen/disabled and background
+# work and log output are deferred until the round ends.
+CRITICAL_SECTION_ENABLED = True
+CRITICAL_SECTION_NICE_BOOST = 0    # Lower the nice value by this much during rounds (needs CAP_SYS_NICE); 0 = off
+
+# 11. Two-Player Mode
+# Head-to-head agility duel: Jogador 1 uses the first half of the buttons,
+# Jogador 2 the second half. No quiz; both names are entered on the score screen.
+VERSUS_MODE_ENABLED = True
+VERSUS_TIME_LIMIT = 45.0           # Seconds before an unfinished versus round is ended (unfinished = 0 points)
+
+# 12. Session Analytics
+# Every visitor session is logged with the time spent in each phase.
+# Report and what-if: python -m app.session_analyzer QUIZ_FEEDBACK_DURATION=1.5
+SESSION_LOG_FILE = "data/sessions.jsonl"
+
+# 13. Settings Presets
+# The game settings above are the 'default' preset. data/settings.json picks
+# the active preset (quick, challenge, kids, tournament or custom ones) and is
+# re-read while running; a new preset applies from the next session.
+# Switch with: python -m app.settings quick
+SETTINGS_FILE = "data/settings.json"
+SETTINGS_POLL_SECONDS = 5.0
+
+# 14. Main-Loop Watchdog
+# A watchdog thread checks that the Kivy main loop keeps running and pings
+# systemd (see helper/systemd.txt: Type=notify, WatchdogSec). On a stall the
+# stacks of all threads go to WATCHDOG_STALL_LOG; a long stall restarts the app.
+WATCHDOG_ENABLED = True
+WATCHDOG_STALL_SECONDS = 2.0       # Main loop silent this long = stall (stacks are dumped)
+WATCHDOG_RESTART_SECONDS = 15.0    # Stall this long = exit so systemd restarts the stand
+WATCHDOG_STALL_LOG = "data/stalls.log"
+
+# 15. Sampling Profiler
+# Started on demand with `kill -USR1 <pid>` or the 'f' key; samples every
+# thread and writes a collapsed-stack file (flamegraph.pl / speedscope).
+PROFILER_OUTPUT_DIR = "data/profiles"
+PROFILER_INTERVAL_MS = 5           # Sampling period
+PROFILER_DURATION_SECONDS = 10.0   # Length of one profiling run
+
+# 16. Text Texture Cache
+# Rendered text textures (leaderboard, keyboard keys, chronometer digits) are
+# shared between labels with identical text and style, LRU-evicted.
+TEXT_CACHE_BUDGET_MB = 16
+
+# 17. Session Tapes
+# Every external input (GPIO presses, touch and keyboard inputs) and the seed
+# of each session is recorded, one tape file per run of the app. A tape is
+# replayed (fast, virtual clock) with: python -m helper.replay_session <tape>
+# The STAND_SESSION_TAPE environment variable ("0") turns recording off (used by replays).
+SESSION_TAPE_ENABLED = os.environ.get("STAND_SESSION_TAPE", "1") != "0"
+SESSION_TAPE_DIR = "data/tapes"
+SESSION_TAPE_MAX_FILES = 200       # Oldest tapes beyond this are deleted at startup
+SESSION_TAPE_MAX_AGE_DAYS = 30     # Tapes older than this are deleted at startup
+
+# 18. Quiz Media
+# Questions may show an image: "image": "assets/quiz/logo.png" in questions.json.
+# Images are decoded in the background as soon as a session's questions are
+# picked and kept in an LRU cache of decoded textures.
+QUIZ_MEDIA_CACHE_MB = 32
+
+# 19. Idle Power Mode
+# While the idle LED animation runs on the welcome screen the frame rate is
+# lowered and background polling paused. Any button press or touch wakes the
+# stand at once; without a new session it goes back to idle after a while.
+POWER_IDLE_ENABLED = True
+POWER_IDLE_FPS = 10                # Frame rate limit while idle (first touch is seen within one idle frame)
+POWER_IDLE_AFTER_WAKE_SECONDS = 20.0
+
+# 20. Screen Cache
+# Screens are built on first use (the next session's screens while its
+# instructions are shown) and kept up to a total widget count, least
+# recently used first. After a while in idle mode all unpinned screens are
+# released (the score keyboard and the leaderboard grid are the heavy ones).
+SCREEN_CACHE_WIDGET_BUDGET = 250   # Widgets of all built screens together (a full set is ~190); 0 = no limit
+SCREEN_PINNED = ['welcome', 'instructions']  # Built at startup and never released
+SCREEN_RELEASE_IDLE_SECONDS = 300.0
+
+# 21. Score Versions
+# Every score keeps its raw components (agility_ms, quiz_correct) and the
+# config_version of the scoring settings it was played with. After a change of
+# AGILITY_MAX_SCORE, AGILITY_SCORE_PENALTY_PER_MS or QUIZ_POINTS_PER_CORRECT,
+# the whole history is re-scored into a new leaderboard version with:
+# python -m app.rescoring --preset tournament --write
+# Point LEADERBOARD_FILE and LEADERBOARD_ARCHIVE_DIR at the new version to use it.
+LEADERBOARD_VERSIONS_DIR = "data/versions"
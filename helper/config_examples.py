@@ -1,5 +1,5 @@
 # Configuration Examples for Interactive Stand Game
-# Copy desired configuration to config.py
+# Available as presets - see "How to Use" below
 
 # ========================================
 # EXAMPLE 1: Default Configuration (Current)
@@ -70,10 +70,14 @@ QUIZ_POINTS_PER_CORRECT = 625      # Balanced scoring (2500 max quiz score)
 # How to Use These Examples:
 # ========================================
 """
-1. Choose the configuration that fits your event
-2. Copy the desired values to config.py
-3. Restart the application
-4. The game will automatically use the new settings
+These examples are built in as presets (app/settings.py): default, quick,
+challenge, kids and tournament. No copy or restart is needed:
+
+1. Choose the preset that fits your event
+2. Run: python -m app.settings <preset>   (or set "active_preset" in data/settings.json)
+3. The running game picks it up and applies it from the next session
+
+Custom presets can be added under "presets" in data/settings.json.
 
 Note: Make sure you have enough questions in data/questions.json 
 for the QUIZ_ROUNDS_COUNT you choose.
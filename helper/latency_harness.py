@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+End-to-end input latency harness
+Runs the real GameApp with gpiozero's mock pin factory, injects button edges
+(from a separate thread, like the gpiozero callback thread) and touch taps,
+and timestamps the matching state changes:
+  agility presses - remaining label text, LED off, audio cue, next frame
+  quiz answers    - feedback text, audio cue, next frame
+  keyboard taps   - name entry text, next frame
+Prints latency percentiles and exits with an error if a p95 is over budget
+or if any input did not produce all its signals in time.
+
+Usage: python -m helper.latency_harness [--mock-gl] [--budget-ms 50]
+On a machine without a display run it under a virtual one: xvfb-run -a python -m helper.latency_harness
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Must be set before Kivy and the app are imported
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ['GPIOZERO_PIN_FACTORY'] = 'mock'
+os.environ['STAND_GPIO_BACKEND'] = 'gpiozero'
+os.environ['STAND_SESSION_TAPE'] = '0'   # Harness runs are not recorded into the stand's tapes
+if '--mock-gl' in sys.argv:
+    os.environ['KIVY_GL_BACKEND'] = 'mock'
+
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.tests.common import UTMotionEvent
+from app.__main__ import GameApp
+from config import HW_EVENT_LATENCY_BUDGET_MS
+
+SIGNAL_TIMEOUT = 2.0   # Seconds to wait for all signals of one input
+
+class Probe:
+    """Collects the time from one injected input to each expected signal."""
+    def __init__(self):
+        self.results = {}       # (category, signal) -> [latency seconds]
+        self.timeouts = {}      # (category, signal) -> inputs that never produced the signal
+        self._pending = None
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._frame_wanted = False
+        Window.bind(on_flip=self._on_flip)
+
+    def expect(self, category, signals, started=None):
+        with self._lock:
+            self._done.clear()
+            self._pending = {
+                'category': category,
+                'started': started if started is not None else time.perf_counter(),
+                'waiting': set(signals),
+            }
+
+    def hit(self, signal):
+        now = time.perf_counter()
+        with self._lock:
+            pending = self._pending
+            if pending is None or signal not in pending['waiting']:
+                return
+            pending['waiting'].discard(signal)
+            self.results.setdefault((pending['category'], signal), []).append(now - pending['started'])
+            if signal == 'state':
+                self._frame_wanted = True
+            if not pending['waiting']:
+                self._pending = None
+                self._done.set()
+
+    def _on_flip(self, *args):
+        if self._frame_wanted:
+            self._frame_wanted = False
+            self.hit('frame')
+
+    def wait(self):
+        """Waits for the pending input's signals. Returns False on timeout."""
+        if self._done.wait(SIGNAL_TIMEOUT):
+            return True
+        with self._lock:
+            if self._pending:
+                category = self._pending['category']
+                print(f"   ⚠️ {category}: no {sorted(self._pending['waiting'])} within {SIGNAL_TIMEOUT}s")
+                for signal in self._pending['waiting']:
+                    self.timeouts[(category, signal)] = self.timeouts.get((category, signal), 0) + 1
+            self._pending = None
+        return False
+
+
+class LatencyHarness:
+    def __init__(self, app, budget_ms):
+        self.app = app
+        self.budget_ms = budget_ms
+        self.gm = app.game_manager
+        self.probe = Probe()
+        self.passed = False
+        self._instrument()
+
+    def _instrument(self):
+        """Wraps the output paths of the game to report signals to the probe."""
+        gm = self.gm
+        gm.sessions.log_path = os.devnull  # Harness sessions are not visitors
+
+        turn_off_led = gm.hw.turn_off_led
+        def probed_turn_off_led(index):
+            turn_off_led(index)
+            self.probe.hit('led')
+        gm.hw.turn_off_led = probed_turn_off_led
+
+        play = gm.am.play
+        def probed_play(sound_key):
+            self.probe.hit('audio')
+            play(sound_key)
+        gm.am.play = probed_play
+
+        state = lambda *args: self.probe.hit('state')
+        gm.sm.get_screen('agility_game').ids.remaining_label.bind(text=state)
+        gm.sm.get_screen('quiz_game').ids.question_label.bind(text=state)
+        gm.sm.get_screen('score').ids.name_entry.bind(text=state)
+
+    # --- Helpers ---
+    def on_main_thread(self, func, *args):
+        """Runs func on the Kivy main thread and waits for it to finish."""
+        done = threading.Event()
+        result = []
+        def run(dt):
+            try:
+                result.append(func(*args))
+            finally:
+                done.set()
+        Clock.schedule_once(run, 0)
+        done.wait(10)
+        return result[0] if result else None
+
+    def wait_until(self, condition, timeout=15.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.on_main_thread(condition):
+                return True
+            time.sleep(0.05)
+        return False
+
+    def tap(self, widget, category, signals):
+        """Dispatches a touch on a widget (main thread) and starts the probe right before it."""
+        x, y = widget.to_window(*widget.center)
+        touch = UTMotionEvent('harness', id(widget), {'x': 0, 'y': 0})
+        # Current, previous and origin positions: widgets with a local frame transform all three
+        touch.x, touch.y = touch.px, touch.py = touch.ox, touch.oy = x, y
+        touch.pos = (x, y)
+        root = self.app.root
+        self.probe.expect(category, signals)
+        root.dispatch('on_touch_down', touch)
+        for weak in touch.grab_list[:]:
+            grabbed = weak()
+            if grabbed is not None:
+                touch.grab_current = grabbed
+                grabbed.dispatch('on_touch_up', touch)
+        touch.grab_current = None
+        root.dispatch('on_touch_up', touch)
+
+    # --- Scenario ---
+    def run(self):
+        try:
+            self.run_agility()
+            self.run_quiz()
+            self.run_keyboard()
+            self.passed = self.report()
+        except Exception as e:
+            print(f"❌ Harness failed: {e}")
+        finally:
+            Clock.schedule_once(lambda dt: self.app.stop(), 0)
+
+    def run_agility(self):
+        gm = self.gm
+        print("🎯 Agility presses (GPIO edges from a separate thread)...")
+        self.on_main_thread(gm.show_instructions)
+        self.on_main_thread(gm.proceed_from_instructions)
+        if not self.wait_until(lambda: gm.agility_in_progress):
+            raise RuntimeError("agility round did not start")
+        while self.on_main_thread(lambda: gm.agility_in_progress):
+            target = self.on_main_thread(lambda: gm.lanes[0].target)
+            pin = gm.hw.buttons[target].pin
+            self.probe.expect('agility', ('state', 'led', 'audio', 'frame'))
+            pin.drive_low()    # Edge seen by gpiozero -> when_pressed on this thread
+            self.probe.wait()
+            pin.drive_high()
+            time.sleep(0.35)   # Longer than the agility debounce
+
+    def run_quiz(self):
+        gm = self.gm
+        print("❓ Quiz answers (touch taps)...")
+        if not self.wait_until(lambda: gm.instruction_state == 'quiz' and gm.sm.current == 'instructions'):
+            raise RuntimeError("quiz instructions did not appear")
+        self.on_main_thread(gm.proceed_from_instructions)
+        for _ in range(gm.settings.quiz_rounds_count):
+            if not self.wait_until(lambda: gm.quiz_in_progress or gm.sm.current == 'score'):
+                break
+            if gm.sm.current == 'score':
+                break  # Not enough questions for a quiz
+            screen = gm.sm.get_screen('quiz_game')
+            self.on_main_thread(self.tap, screen.ids.option_a, 'quiz', ('state', 'audio', 'frame'))
+            self.probe.wait()
+
+    def run_keyboard(self):
+        gm = self.gm
+        print("⌨️ Keyboard taps (touch taps)...")
+        # Touches are not dispatched to a screen while it is still sliding in
+        if not self.wait_until(lambda: gm.sm.current == 'score' and not gm.sm.transition.is_active):
+            raise RuntimeError("score screen did not appear")
+        screen = gm.sm.get_screen('score')
+        keys = {widget.text: widget for widget in screen.walk()
+                if type(widget).__name__ == 'VirtualKeyButton'}
+        for char in 'HARNESS':
+            self.on_main_thread(self.tap, keys[char], 'keyboard', ('state', 'frame'))
+            self.probe.wait()
+            time.sleep(0.2)    # Longer than the keyboard debounce
+
+    def report(self):
+        print(f"\n📊 Input latency (ms), budget p95 < {self.budget_ms:.0f} ms")
+        print(f"   {'input':10} {'signal':7} {'n':>4} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7} {'lost':>5}")
+        ok = True
+        timeouts = self.probe.timeouts
+        for category, signal in sorted(set(self.probe.results) | set(timeouts)):
+            # An input that never produced the signal counts as a sample over any budget
+            lost = timeouts.get((category, signal), 0)
+            values = sorted(v * 1000 for v in self.probe.results.get((category, signal), []))
+            values += [float('inf')] * lost
+            pick = lambda q: values[min(len(values) - 1, int(len(values) * q))]
+            p95 = pick(0.95)
+            within = p95 < self.budget_ms and not lost
+            ok = ok and within
+            print(f"   {category:10} {signal:7} {len(values):4d} {pick(0.5):7.1f} {p95:7.1f} "
+                  f"{pick(0.99):7.1f} {values[-1]:7.1f} {lost:5d} {'✅' if within else '❌'}")
+        if timeouts:
+            print(f"   ❌ {sum(timeouts.values())} signals timed out after {SIGNAL_TIMEOUT}s")
+        if not self.probe.results:
+            print("   No samples collected.")
+            ok = False
+        return ok
+
+
+class HarnessApp(GameApp):
+    def __init__(self, budget_ms, **kwargs):
+        super().__init__(**kwargs)
+        self.budget_ms = budget_ms
+        self.harness = None
+
+    def on_start(self):
+        super().on_start()
+        self.harness = LatencyHarness(self, self.budget_ms)
+        threading.Thread(target=self.harness.run, name='LatencyHarness', daemon=True).start()
+
+
+def main():
+    budget_ms = HW_EVENT_LATENCY_BUDGET_MS
+    if '--budget-ms' in sys.argv:
+        budget_ms = float(sys.argv[sys.argv.index('--budget-ms') + 1])
+    app = HarnessApp(budget_ms)
+    app.run()
+    return app.harness is not None and app.harness.passed
+
+if __name__ == '__main__':
+    raise SystemExit(0 if main() else 1)
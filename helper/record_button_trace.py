@@ -0,0 +1,33 @@
+import sys
+import time
+from signal import pause
+from app.hardware_io import HardwareController
+from app.gpio_backends import TraceRecorder
+
+# Records real button presses into a trace file that the 'replay' GPIO
+# backend can play back on any machine.
+# Usage: python -m helper.record_button_trace [output_file]
+
+def main():
+    output_file = sys.argv[1] if len(sys.argv) > 1 else "data/button_trace.json"
+    controller = None
+    recorder = TraceRecorder()
+
+    def handle_button_press(button_index):
+        recorder.record(button_index)
+        print(f"--- Button {button_index} pressed at {time.perf_counter() - recorder.start_time:.3f}s ---")
+
+    print("Recording button presses. Press Ctrl+C to stop and save.")
+    try:
+        controller = HardwareController()
+        controller.set_button_callback(handle_button_press)
+        pause()
+    except KeyboardInterrupt:
+        print("\nExit signal received.")
+    finally:
+        recorder.save(output_file)
+        if controller is not None:
+            controller.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Session tape replayer
+Plays a tape recorded by the stand (data/tapes/, see app/session_tape.py) back
+through the real GameApp under a virtual clock, then checks that the final
+screen, the final score and the saved scores match the recording.
+Nothing is written to the stand's data: scores go to a temporary leaderboard.
+
+Usage: python -m helper.replay_session <tape.jsonl> [--speed 100] [--step 0.05] [--mock-gl]
+On a machine without a display run it under a virtual one: xvfb-run -a python -m helper.replay_session ...
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# Must be set before Kivy and the app are imported
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ['STAND_GPIO_BACKEND'] = 'mock'
+os.environ['STAND_SESSION_TAPE'] = '0'   # The replay must not record (or prune) tapes itself
+if '--mock-gl' in sys.argv:
+    os.environ['KIVY_GL_BACKEND'] = 'mock'
+
+# Scores go to a temporary leaderboard and archive: loading the stand's own files
+# would archive finished days and rewrite them
+import config
+replay_data_dir = tempfile.mkdtemp(prefix='replay-')
+config.LEADERBOARD_FILE = os.path.join(replay_data_dir, 'leaderboard.json')
+config.LEADERBOARD_ARCHIVE_DIR = os.path.join(replay_data_dir, 'archive')
+
+from kivy.config import Config
+Config.set('graphics', 'maxfps', '0')   # Frames are paced by the virtual clock, not the display
+from kivy.clock import Clock
+from app.__main__ import GameApp
+from app.session_tape import load_tape, TapeReplayer, VirtualClock
+
+class ReplayApp(GameApp):
+    def __init__(self, entries, speed, step, **kwargs):
+        super().__init__(**kwargs)
+        self.entries = entries
+        self.speed = speed
+        self.step = step
+        self.replayer = None
+        self.mismatches = None
+
+    def build(self):
+        root = super().build()
+        gm = self.game_manager
+
+        # Keep the replay away from the stand's data and background jobs
+        gm.sessions.log_path = os.devnull
+        gm.settings_poll_event.cancel()
+        gm.leaderboard_rollover_event.cancel()
+        gm.power.enabled = False   # No frame rate throttling under the virtual clock
+
+        # Virtual time for Kivy (timers, animations) and for the game itself
+        self.clock = VirtualClock(Clock.time(), step=self.step, speed=self.speed)
+        Clock.time = self.clock.now
+        gm.now = self.clock.now
+
+        self.replayer = TapeReplayer(self.entries, self.clock)
+        gm.tape = self.replayer
+        gm.settings_store.begin_session = lambda: self.replayer.next_settings(gm.settings)
+        return root
+
+    def on_start(self):
+        super().on_start()
+        self.virtual_start = self.clock.now()
+        self.real_start = time.perf_counter()
+        Clock.schedule_interval(self.replay_frame, 0)
+
+    def replay_frame(self, dt):
+        if self.replayer.step(self.game_manager) and not self.replayer.error:
+            self.clock.advance()
+            return
+        self.finish()
+        return False
+
+    def finish(self):
+        gm = self.game_manager
+        final_state = {'screen': gm.sm.current, 'score': gm.score}
+        self.mismatches = self.replayer.compare(final_state, gm.dm.load_leaderboard())
+        virtual = self.clock.now() - self.virtual_start
+        real = time.perf_counter() - self.real_start
+        print(f"\n▶️ Replayed {self.replayer.inputs_replayed} inputs: {virtual:.1f}s of stand time "
+              f"in {real:.1f}s (x{virtual / real if real else 0:.0f})")
+        print(f"   Final state: {final_state}")
+        for mismatch in self.mismatches:
+            print(f"   ❌ {mismatch}")
+        if not self.mismatches:
+            print("   ✅ Final screen, score and saved scores match the recording")
+        self.stop()
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if arg != '--mock-gl']
+    if not args:
+        print(__doc__)
+        return False
+    speed, step = 100.0, 0.05
+    if '--speed' in args:
+        speed = float(args[args.index('--speed') + 1])
+    if '--step' in args:
+        step = float(args[args.index('--step') + 1])
+    entries = load_tape(args[0])
+    print(f"Tape {args[0]}: {len(entries)} entries")
+    app = ReplayApp(entries, speed, step)
+    app.run()
+    return app.mismatches == []
+
+if __name__ == '__main__':
+    raise SystemExit(0 if main() else 1)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script for the main-loop watchdog (app/watchdog.py)
+Runs against a local stand-in for the systemd notify socket, without the GUI
+Usage: python -m helper.test_watchdog
+"""
+
+import os
+import socket
+import tempfile
+import threading
+import time
+from app.watchdog import MainLoopWatchdog
+
+def main():
+    temp_dir = tempfile.mkdtemp()
+    socket_path = os.path.join(temp_dir, 'notify.sock')
+    stall_log = os.path.join(temp_dir, 'stalls.log')
+
+    # Stand-in for systemd: a datagram socket that collects every notify message
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    server.bind(socket_path)
+    server.settimeout(0.1)
+    messages = []
+    listening = threading.Event()
+    listening.set()
+
+    def listen():
+        while listening.is_set():
+            try:
+                messages.append(server.recv(1024).decode('utf-8'))
+            except socket.timeout:
+                continue
+
+    listener = threading.Thread(target=listen, daemon=True)
+    listener.start()
+
+    escalations = []
+    watchdog = MainLoopWatchdog(stall_threshold=0.5, restart_after=1.5, interval=0.1,
+                                stall_log=stall_log, notify_socket=socket_path,
+                                on_escalate=lambda: escalations.append(time.monotonic()))
+    watchdog.start()
+
+    print("🫀 Healthy main loop for 1s...")
+    for _ in range(10):
+        watchdog.beat()
+        time.sleep(0.1)
+    pings_healthy = messages.count('WATCHDOG=1')
+
+    print("🧊 Simulating a 2s main-loop stall...")
+    time.sleep(0.6)  # Past the stall threshold
+    pings_at_stall = messages.count('WATCHDOG=1')
+    time.sleep(1.4)
+    pings_during_stall = messages.count('WATCHDOG=1') - pings_at_stall
+
+    print("🫀 Main loop recovers...")
+    for _ in range(5):
+        watchdog.beat()
+        time.sleep(0.1)
+
+    watchdog.stop()
+    time.sleep(0.2)
+    listening.clear()
+    listener.join()
+    server.close()
+
+    results = {
+        'READY=1 sent': messages[:1] == ['READY=1'],
+        'pings while healthy': pings_healthy >= 5,
+        'no pings during stall': pings_during_stall == 0,
+        'stack dump written': os.path.exists(stall_log) and 'MainLoopWatchdog' in open(stall_log).read(),
+        'escalated once': len(escalations) == 1,
+        'stall recorded': len(watchdog.stalls) == 1 and watchdog.stalls[0] >= 2.0,
+        'STOPPING=1 sent': messages[-1:] == ['STOPPING=1'],
+    }
+    for name, passed in results.items():
+        print(f"   {'✅' if passed else '❌'} {name}")
+    print(f"Watchdog stats: {watchdog.stats()}")
+    return all(results.values())
+
+if __name__ == '__main__':
+    raise SystemExit(0 if main() else 1)